@@ -0,0 +1,377 @@
+"""Throughput/memory benchmarks of the signal and data hot paths at production scale.
+
+    python -m benchmarks.hot_paths                 # compare against benchmarks/baseline.json
+    python -m benchmarks.hot_paths --update        # re-record the baseline
+    python -m benchmarks.hot_paths --only clusters_batch,run_cycle --scale 0.1
+
+Scale: 10k wallets x 3 positions over 200 coins, 1000-level books, and OI
+history at the 6h retention ``record_open_interest`` keeps (21.6k 1s
+readings per coin — the steady state of a 48h 1s replay). Each benchmark
+reports ops/sec (fastest of several timed batches) and the tracemalloc peak
+of one op; the run fails (exit 1) when throughput drops or peak memory grows
+beyond the tolerances relative to the baseline. Throughput baselines are
+machine-specific: re-record with ``--update`` when the reference host changes.
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from src.data import open_interest
+from src.data.orderbook import find_depth_clusters
+from src.data.position_diff import PositionDiffEngine
+from src.execution.correlation_gate import CorrelationGate
+from src.execution.paper_executor import PaperExecutor
+from src.models import PositionBatch
+from src.signals.liquidation_map import LiquidationHeatmap, build_liquidation_clusters, evaluate_liquidation_signal
+from src.signals.pull_field import pull_signals
+from src.signals.signal_aggregator import aggregate_signals
+from src.strategies import Strategy
+from src.utils import clock
+from src.utils.logger import configure_logging
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+WALLETS = 10_000
+COINS = 200
+POSITIONS_PER_WALLET = 3
+BOOK_LEVELS = 1000
+OI_HISTORY_SECONDS = 6 * 3600
+
+
+class World:
+    """Deterministic synthetic market at a given scale (1.0 = production)."""
+
+    def __init__(self, scale: float = 1.0, seed: int = 7):
+        rng = random.Random(seed)
+        self.coins = ["BTC", "ETH"] + [f"C{i:03d}" for i in range(max(POSITIONS_PER_WALLET + 1, int(COINS * scale)) - 2)]
+        self.prices = {c: (100_000.0 if c == "BTC" else 3000.0 if c == "ETH" else rng.uniform(0.1, 500))
+                       for c in self.coins}
+        self.wallets = [f"0x{i:040x}" for i in range(max(1, int(WALLETS * scale)))]
+        self.states = {}
+        for i, wallet in enumerate(self.wallets):
+            held = ["BTC"] + rng.sample(self.coins[1:], POSITIONS_PER_WALLET - 1)
+            self.states[wallet] = {"assetPositions": [
+                {"position": self._position(rng, coin)} for coin in held
+            ]}
+        self.book_levels = max(10, int(BOOK_LEVELS * scale))
+        self.books = {c: self._book(rng, self.prices[c]) for c in self.coins}
+        self.oi_history_seconds = max(600, int(OI_HISTORY_SECONDS * scale))
+
+    def _position(self, rng: random.Random, coin: str) -> dict:
+        price = self.prices[coin]
+        long = rng.random() < 0.5
+        leverage = rng.choice((3, 5, 10, 20, 25, 40))
+        entry = price * rng.uniform(0.95, 1.05)
+        liq = entry * (1 - 0.9 / leverage) if long else entry * (1 + 0.9 / leverage)
+        size = rng.lognormvariate(0, 1.5) * 50_000 / price * (1 if long else -1)
+        return {
+            "coin": coin, "szi": str(size), "entryPx": str(entry), "liquidationPx": str(liq),
+            "leverage": {"type": "cross", "value": leverage}, "unrealizedPnl": "0",
+            "marginUsed": str(abs(size) * entry / leverage),
+        }
+
+    def _book(self, rng: random.Random, mid: float) -> dict:
+        tick = mid * 0.0001
+        bids = [{"px": str(mid - tick * (i + 1)), "sz": str(rng.expovariate(1) * 1000 / mid)}
+                for i in range(self.book_levels)]
+        asks = [{"px": str(mid + tick * (i + 1)), "sz": str(rng.expovariate(1) * 1000 / mid)}
+                for i in range(self.book_levels)]
+        return {"levels": [bids, asks]}
+
+    def position_dicts(self, coin: str) -> list[dict]:
+        out = []
+        for wallet, state in self.states.items():
+            for ap in state["assetPositions"]:
+                p = ap["position"]
+                if p["coin"] == coin:
+                    out.append({"coin": coin, "size": float(p["szi"]), "entry_price": float(p["entryPx"]),
+                                "liquidation_price": float(p["liquidationPx"]),
+                                "leverage": float(p["leverage"]["value"]),
+                                "margin_used": float(p["marginUsed"]), "wallet": wallet})
+        return out
+
+    def parsed_book(self, coin: str) -> dict:
+        bids, asks = self.books[coin]["levels"]
+        return {"bids": [(float(b["px"]), float(b["sz"])) for b in bids],
+                "asks": [(float(a["px"]), float(a["sz"])) for a in asks]}
+
+
+class OfflineClient:
+    """HyperliquidClient stand-in serving a World from memory."""
+
+    def __init__(self, world: World):
+        self.world = world
+        self.oi_drift = 1.0
+
+    def get_all_mids(self):
+        return {c: str(p) for c, p in self.world.prices.items()}
+
+    def get_meta_and_contexts(self):
+        self.oi_drift *= 1.01
+        universe = [{"name": c} for c in self.world.coins]
+        ctxs = [{"funding": "0.0009" if i % 3 == 0 else "0.00001", "openInterest": str(1e6 * self.oi_drift)}
+                for i in range(len(self.world.coins))]
+        return [{"universe": universe}, ctxs]
+
+    def get_clearinghouse_state(self, wallet: str):
+        return self.world.states[wallet]
+
+    def get_l2_book(self, coin: str):
+        return self.world.books[coin]
+
+    def _post(self, payload: dict):
+        return []
+
+
+def _cycle_config(world: World) -> dict:
+    return {
+        "mode": "paper",
+        "coins": world.coins,
+        "total_capital_usd": 10_000,
+        "whale_wallets": world.wallets,
+        "signals": {"funding_rate_threshold": 0.0005, "oi_delta_threshold": 0.5,
+                    "liquidation_proximity": 1.5, "min_confidence": 0.6},
+        "execution": {"position_size_pct": 1, "max_positions": 1000, "take_profit_pct": 2.0,
+                      "stop_loss_pct": 1.0, "timeout_minutes": 30, "slippage_budget_bps": 10},
+    }
+
+
+# --- benchmarks: name -> setup(world) returning the zero-arg op to time ---
+
+def bench_clusters_records(world: World):
+    positions = world.position_dicts("BTC")
+    price = world.prices["BTC"]
+    return lambda: build_liquidation_clusters(positions, price)
+
+
+def bench_clusters_batch(world: World):
+    batch = PositionBatch.from_records("BTC", world.position_dicts("BTC"))
+    price = world.prices["BTC"]
+    return lambda: build_liquidation_clusters(batch, price)
+
+
+def bench_liquidation_signal(world: World):
+    price = world.prices["BTC"]
+    clusters = build_liquidation_clusters(PositionBatch.from_records("BTC", world.position_dicts("BTC")), price)
+    return lambda: evaluate_liquidation_signal(clusters, price, 1.5, 100_000)
+
+
+def bench_pull_field(world: World):
+    """Pull field across the whole universe in one pass."""
+    clusters = {c: build_liquidation_clusters(PositionBatch.from_records(c, world.position_dicts(c)),
+                                              world.prices[c]) for c in world.coins}
+    return lambda: pull_signals(clusters, world.prices, 100_000)
+
+
+def bench_aggregate(world: World):
+    rng = random.Random(1)
+    funding = {c: {"rate": 0.001, "direction": rng.choice(("long", "short")), "strength": rng.random()}
+               for c in world.coins}
+    oi = {c: {"oi_delta": 8.0, "price_delta": -1.0, "direction": rng.choice(("long", "short")),
+              "strength": rng.random()} for c in world.coins}
+    liq = {c: {"direction": rng.choice(("long", "short")), "cluster_price": world.prices[c] * 1.01,
+               "strength": rng.random()} for c in world.coins}
+    return lambda: aggregate_signals(funding, oi, liq, 0.3)
+
+
+def bench_depth_clusters(world: World):
+    book = world.parsed_book("BTC")
+    return lambda: find_depth_clusters(book)
+
+
+def bench_oi_delta(world: World):
+    """One steady-state tick: record a reading into a full window, then read the 4h delta."""
+    start = 1_700_000_000.0
+    n = world.oi_history_seconds
+    open_interest.clear_history()
+    open_interest._oi_history["BTC"] = [(start + i, 1e6 + i) for i in range(n)]
+    vclock = clock.VirtualClock(start + n)
+    clock.set_clock(vclock)
+
+    def op():
+        vclock.advance(1)
+        open_interest.record_open_interest({"BTC": 1e6})
+        return open_interest.get_oi_delta("BTC")
+    return op
+
+
+def bench_correlation(world: World):
+    """One cycle of the correlation gate: covariance update over the universe plus a capped decision."""
+    rng = random.Random(2)
+    gate = CorrelationGate(min_observations=1)
+    prices = dict(world.prices)
+    held = {c: rng.choice((-1, 1)) * 100.0 for c in world.coins[:10]}
+
+    def op():
+        for c in prices:
+            prices[c] *= 1 + rng.gauss(0, 0.001)
+        gate.update(prices)
+        return gate.cap(world.coins[-1], "long", 100.0, held, 500.0)
+    op()
+    return op
+
+
+def bench_run_cycle(world: World):
+    import main
+
+    open_interest.clear_history()
+    clock.set_clock()
+    config = _cycle_config(world)
+    client = OfflineClient(world)
+    tracker = PositionDiffEngine()
+    heatmap = LiquidationHeatmap()
+    tracker.subscribe(heatmap.on_events)
+    strategy = Strategy("default", config, PaperExecutor(state_path=None))
+
+    def op():
+        strategy.executor.open_trades.clear()
+        main.run_cycle(client, config, [strategy], None, None, tracker, heatmap)
+    op()  # first cycle seeds the position table and OI history
+    return op
+
+
+BENCHMARKS = {
+    "clusters_records": bench_clusters_records,
+    "clusters_batch": bench_clusters_batch,
+    "liquidation_signal": bench_liquidation_signal,
+    "pull_field": bench_pull_field,
+    "aggregate_signals": bench_aggregate,
+    "depth_clusters": bench_depth_clusters,
+    "oi_delta": bench_oi_delta,
+    "correlation": bench_correlation,
+    "run_cycle": bench_run_cycle,
+}
+
+
+def measure(op, min_batch_seconds: float = 0.1, batches: int = 7) -> dict:
+    # GC off while timing (as timeit does) so collection pauses do not add noise
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        ops_per_sec = _throughput(op, min_batch_seconds, batches)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    op()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ops_per_sec": ops_per_sec, "peak_kb": peak / 1024}
+
+
+def _throughput(op, min_batch_seconds: float, batches: int) -> float:
+    # Calibrate a batch size that runs for at least min_batch_seconds
+    n = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(n):
+            op()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_batch_seconds or n >= 1 << 20:
+            break
+        n *= 2 if elapsed <= 0 else max(2, min(10, int(min_batch_seconds / elapsed) + 1))
+    best = elapsed
+    for _ in range(batches - 1):
+        started = time.perf_counter()
+        for _ in range(n):
+            op()
+        best = min(best, time.perf_counter() - started)
+    return n / best
+
+
+def run(names: list[str] | None = None, scale: float = 1.0, baseline: dict | None = None,
+        tolerance: float = 0.25, retries: int = 2, min_batch_seconds: float = 0.1) -> dict[str, dict]:
+    """Measure ``names`` (default all). A throughput drop against ``baseline``
+    is re-measured up to ``retries`` times and the best run kept, so one noisy
+    batch on a shared host does not fail the suite."""
+    configure_logging(level="WARNING")
+    world = World(scale)
+    baseline = baseline or {}
+    results = {}
+    try:
+        for name in names or BENCHMARKS:
+            op = BENCHMARKS[name](world)
+            result = measure(op, min_batch_seconds)
+            floor = baseline.get(name, {}).get("ops_per_sec", 0) * (1 - tolerance)
+            for _ in range(retries):
+                if result["ops_per_sec"] >= floor:
+                    break
+                retry = measure(op, min_batch_seconds)
+                result["ops_per_sec"] = max(result["ops_per_sec"], retry["ops_per_sec"])
+            results[name] = result
+    finally:
+        clock.set_clock()
+        open_interest.clear_history()
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], tolerance: float = 0.25,
+            mem_tolerance: float = 0.25) -> list[str]:
+    """Regression messages; empty when every benchmark is within tolerance."""
+    failures = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if r["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            failures.append(f"{name}: {r['ops_per_sec']:.4g} ops/s vs baseline {base['ops_per_sec']:.4g} "
+                            f"(-{(1 - r['ops_per_sec'] / base['ops_per_sec']) * 100:.0f}%)")
+        # Small absolute slack so tiny allocations do not flap
+        if r["peak_kb"] > base["peak_kb"] * (1 + mem_tolerance) + 16:
+            failures.append(f"{name}: peak {r['peak_kb']:.0f}KB vs baseline {base['peak_kb']:.0f}KB")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path benchmarks with baseline regression check")
+    parser.add_argument("--only", default="", help="comma-separated benchmark names")
+    parser.add_argument("--scale", type=float, default=1.0, help="fraction of production scale")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput drop")
+    parser.add_argument("--mem-tolerance", type=float, default=0.25, help="allowed peak memory growth")
+    parser.add_argument("--retries", type=int, default=2, help="re-measure a slow benchmark this many times")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update", action="store_true", help="record results as the new baseline")
+    args = parser.parse_args()
+
+    names = [n for n in args.only.split(",") if n] or None
+    unknown = set(names or ()) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(sorted(unknown))}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as fh:
+            stored = json.load(fh)
+        if stored.get("scale") == args.scale:
+            baseline = stored["results"]
+        elif not args.update:
+            print(f"baseline recorded at scale {stored.get('scale')}; not comparing")
+    results = run(names, args.scale, None if args.update else baseline, args.tolerance, args.retries)
+
+    for name, r in results.items():
+        base = baseline.get(name)
+        rel = f"  ({r['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%})" if base else ""
+        print(f"{name:<20} {r['ops_per_sec']:>12.4g} ops/s  peak {r['peak_kb']:>9.0f}KB{rel}")
+
+    if args.update:
+        merged = {**baseline, **results}
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump({"scale": args.scale, "results": merged}, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"baseline written to {args.baseline}")
+        return
+
+    failures = compare(results, baseline, args.tolerance, args.mem_tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
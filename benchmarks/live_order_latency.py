@@ -0,0 +1,63 @@
+"""Signal-to-ack latency of LiveExecutor against the local mock exchange.
+
+    python -m benchmarks.live_order_latency [n_orders]
+
+Uses real EIP-712 signing when eth_account/msgpack are installed, otherwise a
+stub signer (network + serialization only).
+"""
+import statistics
+import sys
+import time
+
+from src.execution.live_executor import LiveExecutor
+from src.models import Decision
+from src.utils.logger import configure_logging
+from tests.mock_exchange import MockExchange
+
+EXE_CFG = {"take_profit_pct": 2.0, "stop_loss_pct": 1.0, "timeout_minutes": 30}
+
+
+class _StubSigner:
+    address = "0x000000000000000000000000000000000000dead"
+
+    def sign(self, action, nonce):
+        return {"r": "0x0", "s": "0x0", "v": 27}
+
+
+def _signer():
+    try:
+        from src.execution.signing import Signer
+        return Signer("0x" + "11" * 32), "eip712"
+    except RuntimeError:
+        return _StubSigner(), "stub"
+
+
+def run(n_orders: int = 200) -> dict:
+    configure_logging(level="WARNING")
+    signer, kind = _signer()
+    with MockExchange({"ETH": 3000.0}) as ex:
+        executor = LiveExecutor(base_url=ex.url, signer=signer, position_poll_seconds=3600)
+        executor.warm_up()
+        latencies = []
+        for i in range(n_orders):
+            executor.update_prices({"ETH": 3000.0})
+            decision = Decision(coin="ETH", direction="long" if i % 2 else "short",
+                                confidence=0.8, signals={}, target_price=None)
+            started = time.perf_counter()
+            executor.execute_trade(decision, 300.0, EXE_CFG)
+            latencies.append((time.perf_counter() - started) * 1000)
+        executor.shutdown()
+
+    latencies.sort()
+    return {
+        "signer": kind,
+        "orders": n_orders,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))],
+        "max_ms": latencies[-1],
+    }
+
+
+if __name__ == "__main__":
+    result = run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
+    print(" ".join(f"{k}={v:.3f}" if isinstance(v, float) else f"{k}={v}" for k, v in result.items()))
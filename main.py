@@ -1,78 +1,150 @@
+import os
 import sys
+import json
 import time
 import signal as sig
+from pathlib import Path
 
 from src.config import load_config
-from src.utils.logger import setup_logger
+from src.utils import clock, metrics
+from src.utils.profiler import CycleProfiler
+from src.utils.logger import configure_logging, setup_logger
 from src.data.hyperliquid_client import HyperliquidClient
 from src.data.funding import fetch_funding_rates
-from src.data.open_interest import fetch_open_interest, get_oi_delta
-from src.data.orderbook import fetch_orderbook, find_depth_clusters
+from src.data.open_interest import fetch_open_interest, get_oi_delta, record_open_interest
+from src.data.orderbook import BookDepth, fetch_orderbook, find_depth_clusters
 from src.data.whale_tracker import scan_whale_wallets
-from src.signals.funding_signal import evaluate_funding_signal
-from src.signals.oi_divergence import evaluate_oi_signal
-from src.signals.liquidation_map import build_liquidation_clusters, evaluate_liquidation_signal
-from src.signals.signal_aggregator import aggregate_signals
+from src.data.wallet_registry import WalletRegistry
+from src.data.position_diff import PositionDiffEngine
+from src.data.margin_model import MarginModel
+from src.data.whale_activity import ActivityIngestor, EventStore
+from src.data.degraded import DegradedSources
+from src.data.trades_feed import ReplayStream, TradesStream
+from src.data.venues.aggregator import (
+    VenueAggregator, aggregate_funding, aggregate_open_interest, create_adapters,
+)
+from src.signals.cascade_detector import CascadeDetector
+from src.signals.liquidation_map import LiquidationHeatmap
 from src.execution.alert_executor import AlertExecutor
 from src.execution.paper_executor import PaperExecutor
+from src.execution.fill_model import FillSimulator
+from src.execution.correlation_gate import CorrelationGate
 from src.execution.live_executor import LiveExecutor
+from src.workers.shard_pool import ShardPool
+from src.backtest.recorder import SnapshotRecorder
+from src.strategies import MarketSnapshot, Strategy, strategy_configs
 
 logger = setup_logger("main")
 
-# Price history for OI divergence calculation
-_price_history: dict[str, list[tuple[float, float]]] = {}
 _running = True
+_persisted_wallet_refresh = 0.0
 
+WALLET_REFRESH_STATE_PATH = "/home/openclaw/.openclaw/workspace/liquidation-hunter/data/paper_state.json"
+# Book depth kept for sizing: no slippage budget reaches past this distance from the touch
+SIZING_DEPTH_BAND_PCT = 2.0
 
-def get_price_delta(coin: str, current_price: float, lookback_hours: float = 4.0) -> float | None:
-    now = time.time()
-    if coin not in _price_history:
-        _price_history[coin] = []
-    _price_history[coin].append((now, current_price))
 
-    # Keep 6 hours
-    cutoff = now - 6 * 3600
-    _price_history[coin] = [(t, p) for t, p in _price_history[coin] if t > cutoff]
-
-    history = _price_history[coin]
-    if len(history) < 2:
-        return None
-
-    lookback_cutoff = now - lookback_hours * 3600
-    old = [p for t, p in history if t <= lookback_cutoff + 300]
-    if not old:
-        old = [history[0][1]]
-
-    old_price = old[0]
-    if old_price == 0:
-        return None
-    return ((current_price - old_price) / old_price) * 100
-
-
-def create_executor(config: dict):
+def create_executor(config: dict, client: HyperliquidClient = None):
     mode = config.get("mode", "alert")
     if mode == "paper":
         logger.info("Mode: PAPER TRADING")
-        return PaperExecutor()
+        fills_cfg = config["execution"].get("paper_fills", {})
+        fill_model = None
+        if fills_cfg.get("enabled"):
+            fill_model = FillSimulator(
+                book_source=(lambda coin: fetch_orderbook(client, coin)) if client else None,
+                latency_ms=fills_cfg.get("latency_ms", 250),
+                taker_fee_bps=fills_cfg.get("taker_fee_bps", 4.5),
+                book_max_age_seconds=fills_cfg.get("book_max_age_seconds", 5),
+            )
+        return PaperExecutor(
+            state_path=config["execution"].get("state_path", "data/paper_state.json"),
+            fill_model=fill_model,
+        )
     elif mode == "live":
         logger.info("Mode: LIVE TRADING")
-        return LiveExecutor()
+        live_cfg = config["execution"].get("live", {})
+        executor = LiveExecutor(
+            private_key=os.environ.get(live_cfg.get("private_key_env", "HL_PRIVATE_KEY")),
+            base_url=live_cfg.get("base_url", "https://api.hyperliquid.xyz"),
+            account_address=live_cfg.get("account_address") or None,
+            slippage_pct=live_cfg.get("slippage_pct", 0.5),
+            position_poll_seconds=live_cfg.get("position_poll_seconds", 2.0),
+            mainnet=live_cfg.get("mainnet", True),
+            state_path=live_cfg.get("state_path", "data/live_state.json"),
+        )
+        if executor.signer is not None:
+            executor.warm_up()
+            executor.reconcile(config["execution"])
+        return executor
     else:
         logger.info("Mode: ALERT ONLY")
         return AlertExecutor()
 
 
-def run_cycle(client: HyperliquidClient, config: dict, executor):
-    coins = config["coins"]
-    sig_cfg = config["signals"]
-    exe_cfg = config["execution"]
-    capital = config["total_capital_usd"]
+def create_wallet_registry(config: dict) -> WalletRegistry:
+    src_cfg = config.get("wallet_sources", {})
+    return WalletRegistry(
+        static_wallets=config.get("whale_wallets", []),
+        file_path=src_cfg.get("file_path"),
+        url=src_cfg.get("url"),
+        reload_minutes=src_cfg.get("reload_minutes", 10),
+        max_wallets=src_cfg.get("max_wallets", 0),
+    )
 
-    # 1. Fetch current prices
+
+def create_cascade_stream(config: dict, coins: list[str], detector: CascadeDetector):
+    """Trades source feeding ``detector``: the replay file if set, else the live stream."""
+    cfg = config["cascade"]
+    if cfg["replay_path"]:
+        return ReplayStream(cfg["replay_path"], detector.on_trades, cfg["replay_speed"])
+    return TradesStream(coins, detector.on_trades, cfg["ws_url"])
+
+
+def _persist_wallet_refresh(refreshed_at: float):
+    """Persist the last wallet refresh timestamp for Crabwalk."""
+    global _persisted_wallet_refresh
+    if not refreshed_at or refreshed_at == _persisted_wallet_refresh:
+        return
+    _persisted_wallet_refresh = refreshed_at
     try:
-        mids = client.get_all_mids()
-    except Exception as e:
-        logger.error(f"Failed to fetch prices: {e}")
+        p = Path(WALLET_REFRESH_STATE_PATH)
+        data = json.loads(p.read_text()) if p.exists() else {}
+        data["last_wallet_refresh"] = refreshed_at
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_text(json.dumps(data, indent=2))
+    except Exception:
+        pass
+
+
+def run_cycle(
+    client: HyperliquidClient,
+    config: dict,
+    strategies: list[Strategy],
+    pool: ShardPool | None = None,
+    registry: WalletRegistry | None = None,
+    tracker: PositionDiffEngine | None = None,
+    heatmap: LiquidationHeatmap | None = None,
+    venues: VenueAggregator | None = None,
+    recorder: SnapshotRecorder | None = None,
+    degraded: DegradedSources | None = None,
+    margin: MarginModel | None = None,
+    activity: ActivityIngestor | None = None,
+    correlation: CorrelationGate | None = None,
+):
+    """Fetch market data once and step every strategy on it.
+
+    Fetches go through ``degraded`` (circuit breaker + last good data per
+    source); without one, a failed source simply yields no data this cycle.
+    """
+    coins = list(dict.fromkeys(c for s in strategies for c in s.coins))
+    degraded = degraded or DegradedSources()
+
+    # 1. Fetch current prices
+    with metrics.stage("prices"):
+        mids, prices_age = degraded.fetch("prices", client.get_all_mids)
+    if mids is None:
+        logger.error("No usable prices, skipping cycle")
         return
 
     current_prices = {}
@@ -80,213 +152,141 @@ def run_cycle(client: HyperliquidClient, config: dict, executor):
         price = mids.get(coin)
         if price:
             current_prices[coin] = float(price)
-    logger.info(f"Prices: {current_prices}")
+    logger.info("Prices: %s", current_prices)
 
-    # 2. Check open trades first
-    closed = executor.check_open_trades(current_prices)
-    if closed:
-        for t in closed:
-            logger.info(f"Closed: {t['coin']} {t.get('exit_reason', '')} PnL={t.get('pnl_pct', 0):+.2f}%")
+    # 2. Check open trades first (not against stale prices: TP/SL would fire on old marks)
+    if prices_age:
+        logger.warning("Prices are %.0fs old, skipping exit checks", prices_age)
+    else:
+        with metrics.stage("exits"):
+            for strategy in strategies:
+                strategy.check_exits({c: p for c, p in current_prices.items() if c in strategy.coins})
 
     # 3. Check position limits
-    open_positions = executor.get_open_positions()
-    max_positions = exe_cfg.get("max_positions", 3)
-    if len(open_positions) >= max_positions:
-        logger.info(f"Max positions reached ({len(open_positions)}/{max_positions}), skipping signals")
+    active = [s for s in strategies if not s.at_capacity()]
+    if not active and recorder is None:
         return
-
-    # 4. Fetch funding rates
-    try:
-        funding_rates = fetch_funding_rates(client, coins)
-    except Exception as e:
-        logger.error(f"Failed to fetch funding: {e}")
-        funding_rates = {}
-
-    # 5. Fetch open interest
-    try:
-        fetch_open_interest(client, coins)
-    except Exception as e:
-        logger.error(f"Failed to fetch OI: {e}")
-
-    # 6. Calculate deltas
-    oi_deltas = {}
-    price_deltas = {}
-    for coin in coins:
-        oi_deltas[coin] = get_oi_delta(coin)
-        price = current_prices.get(coin, 0)
-        price_deltas[coin] = get_price_delta(coin, price) if price else None
-
-    # 7. Scan whale wallets for liquidation map
+    # (with a recorder, keep gathering market inputs so backtests see every cycle)
+
+    # 4-5. Funding rates and open interest
+    if venues is not None:
+        # All configured venues concurrently; funding per hour, OI in USD
+        with metrics.stage("venues"):
+            snapshots, venues_age = degraded.fetch("venues", _fetch_venues, venues, coins)
+        snapshots = snapshots or {}
+        funding_rates = aggregate_funding(snapshots)
+        # OI history is kept in coin units so deltas are not inflated by price moves
+        oi_usd = aggregate_open_interest(snapshots)
+        oi_coins = {c: oi / current_prices[c] for c, oi in oi_usd.items() if current_prices.get(c)}
+        if venues_age == 0:
+            record_open_interest(oi_coins)
+    else:
+        # fetch_open_interest records fresh readings into the OI history itself
+        with metrics.stage("funding"):
+            funding_rates, _ = degraded.fetch("funding", fetch_funding_rates, client, coins)
+        with metrics.stage("open_interest"):
+            oi_coins, _ = degraded.fetch("oi", fetch_open_interest, client, coins)
+        funding_rates = funding_rates or {}
+        oi_coins = oi_coins or {}
+
+    # 6. Scan whale wallets for liquidation map
     whale_wallets = config.get("whale_wallets", [])
-    # auto-reload from file/url
-    src_cfg = config.get("wallet_sources", {})
-    try:
-        reload_minutes = src_cfg.get("reload_minutes", 10)
-        if not hasattr(run_cycle, "_last_wallet_reload"):
-            run_cycle._last_wallet_reload = 0
-            run_cycle._wallets_cache = []
-        if time.time() - run_cycle._last_wallet_reload > reload_minutes * 60:
-            wallets = []
-            file_path = src_cfg.get("file_path")
-            if file_path:
-                try:
-                    with open(file_path, "r") as f:
-                        wallets += [l.strip() for l in f.readlines() if l.strip()]
-                except Exception:
-                    pass
-            url = src_cfg.get("url")
-            if url:
-                try:
-                    import requests
-                    r = requests.get(url, timeout=10)
-                    if r.ok:
-                        wallets += [l.strip() for l in r.text.splitlines() if l.strip()]
-                except Exception:
-                    pass
-            # merge + dedupe + fallback to config list
-            merged = list(dict.fromkeys((whale_wallets or []) + wallets))
-            run_cycle._wallets_cache = merged
-            run_cycle._last_wallet_reload = time.time()
-            logger.info(f"Wallet list refreshed: {len(merged)} wallets")
-            # persist refresh timestamp for Crabwalk
-            try:
-                import json
-                from pathlib import Path
-                p = Path("/home/openclaw/.openclaw/workspace/liquidation-hunter/data/paper_state.json")
-                if p.exists():
-                    data = json.loads(p.read_text())
-                else:
-                    data = {}
-                data["last_wallet_refresh"] = run_cycle._last_wallet_reload
-                p.parent.mkdir(parents=True, exist_ok=True)
-                p.write_text(json.dumps(data, indent=2))
-            except Exception:
-                pass
-        whale_wallets = run_cycle._wallets_cache or whale_wallets
-    except Exception:
-        pass
+    if registry is not None:
+        whale_wallets = registry.get_wallets() or whale_wallets
+        _persist_wallet_refresh(registry.last_reload)
 
-    liq_signals = {}
+    whale_positions = {}
     if whale_wallets:
-        whale_positions = scan_whale_wallets(client, whale_wallets, coins)
-        for coin in coins:
-            positions = whale_positions.get(coin, [])
-            price = current_prices.get(coin, 0)
-            if positions and price:
-                clusters = build_liquidation_clusters(positions, price)
-                sig_result = evaluate_liquidation_signal(
-                    clusters,
-                    price,
-                    sig_cfg["liquidation_proximity"],
-                    sig_cfg.get("volume_baseline_usd", 100_000),
-                )
-                if sig_result:
-                    liq_signals[coin] = sig_result
-
-    # 8. Evaluate signals
-    # Dynamic thresholds (rolling history)
-    if not hasattr(run_cycle, "_fund_hist"):
-        run_cycle._fund_hist = {}
-        run_cycle._oi_hist = {}
-    for coin, rate in funding_rates.items():
-        run_cycle._fund_hist.setdefault(coin, []).append(rate)
-        run_cycle._fund_hist[coin] = run_cycle._fund_hist[coin][-sig_cfg.get("dynamic_funding_window", 96):]
-    for coin, od in oi_deltas.items():
-        if od is not None:
-            run_cycle._oi_hist.setdefault(coin, []).append(od)
-            run_cycle._oi_hist[coin] = run_cycle._oi_hist[coin][-sig_cfg.get("dynamic_oi_window", 96):]
-
-    def dynamic_threshold(hist: list[float], base: float) -> float:
-        if len(hist) < 5:
-            return base
-        avg = sum(abs(x) for x in hist) / len(hist)
-        return max(base, avg * 1.5)
-
-    fund_thr = {}
-    oi_thr = {}
-    for coin in coins:
-        fund_thr[coin] = dynamic_threshold(run_cycle._fund_hist.get(coin, []), sig_cfg["funding_rate_threshold"])
-        oi_thr[coin] = dynamic_threshold(run_cycle._oi_hist.get(coin, []), sig_cfg["oi_delta_threshold"])
-
-    funding_sigs = evaluate_funding_signal(funding_rates, 0)  # we'll filter by per-coin threshold below
-    funding_sigs = {c: s for c, s in funding_sigs.items() if abs(s["rate"]) >= fund_thr.get(c, sig_cfg["funding_rate_threshold"])}
-    oi_sigs = evaluate_oi_signal(oi_deltas, price_deltas, 0)
-    oi_sigs = {c: s for c, s in oi_sigs.items() if abs(s["oi_delta"]) >= oi_thr.get(c, sig_cfg["oi_delta_threshold"])}
-
-    # 9. Aggregate
-    decisions = aggregate_signals(
-        funding_sigs, oi_sigs, liq_signals, sig_cfg["min_confidence"]
+        with metrics.stage("whale_scan"):
+            whale_positions, _ = degraded.fetch(
+                "whales", scan_whale_wallets, client, whale_wallets, coins, registry, tracker,
+            )
+        whale_positions = whale_positions or {}
+        if activity is not None:
+            with metrics.stage("whale_activity"):
+                activity.ingest(whale_wallets)
+    if tracker is not None:
+        # Last known state keeps wallets whose fetch failed this cycle
+        tracker.prune(whale_wallets)
+        if margin is not None:
+            # Cross-margin liquidation prices follow the marks between scans
+            margin.update(mids)
+        whale_positions = tracker.table.positions_by_coin(coins)
+
+    if recorder is not None:
+        recorder.record_cycle(current_prices, funding_rates, oi_coins, whale_positions)
+
+    # 7-10. Deltas, thresholds, signals and execution, per strategy
+    oi_deltas = {coin: get_oi_delta(coin) for coin in coins}
+    if correlation is not None and not prices_age:
+        # Fresh prices only: a repeated last-known snapshot would read as a zero return
+        correlation.update(current_prices)
+    market = MarketSnapshot(
+        current_prices, funding_rates, oi_deltas, whale_positions, client, degraded.staleness(),
+        fetch_book=lambda coin: degraded.fetch(f"book:{coin}", _fetch_book, client, coin)[0],
+        correlation=correlation,
     )
-
-    if not decisions:
-        logger.info("No trade signals this cycle")
-        return
-
-    # 10. Execute trades
-    position_size = capital * exe_cfg["position_size_pct"] / 100
-    slots_available = max_positions - len(open_positions)
-
-    for decision in decisions[:slots_available]:
-        # Skip if we already have a position in this coin
-        existing_coins = {p.get("coin") for p in open_positions}
-        if decision["coin"] in existing_coins:
-            logger.info(f"Already positioned in {decision['coin']}, skipping")
+    if market.staleness:
+        logger.info("Degraded inputs, signal strength x %s", {k: round(v, 2) for k, v in market.staleness.items()})
+    for strategy in active:
+        with metrics.stage("signals" if strategy.name == "default" else f"signals:{strategy.name}"):
+            strategy.step(market, heatmap, pool)
+
+
+def _fetch_book(client: HyperliquidClient, coin: str) -> dict:
+    # Last good data is kept per coin: hold the walls and near-touch depth arrays, not the whole book
+    book = fetch_orderbook(client, coin)
+    return {
+        "walls": find_depth_clusters(book),
+        "depth": BookDepth.from_book(coin, book, clock.now(), band_pct=SIZING_DEPTH_BAND_PCT),
+    }
+
+
+def _fetch_venues(venues: VenueAggregator, coins: list[str]) -> dict:
+    snapshots = venues.fetch(coins)
+    if not snapshots:
+        raise RuntimeError("every venue failed")
+    return snapshots
+
+
+def sleep_with_exit_ticks(client: HyperliquidClient, strategies: list[Strategy], interval: float,
+                          tick_seconds: float, recorder: SnapshotRecorder | None = None,
+                          margin: MarginModel | None = None, cascades: CascadeDetector | None = None):
+    """Sleep until the next cycle, feeding fresh mids (one fetch for all
+    strategies) to the executors' exit engines every ``tick_seconds`` while
+    any holds open trades (or always, for every coin, while recording or
+    keeping tracked liquidation prices current through ``margin``).
+    Cascades flagged by the trades stream are acted on every second."""
+    deadline = time.monotonic() + interval
+    step = tick_seconds if tick_seconds > 0 else 1
+    while _running:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        time.sleep(min(step, remaining))
+        if cascades is not None:
+            for event in cascades.drain():
+                for strategy in strategies:
+                    strategy.on_cascade(event)
+        if tick_seconds <= 0:
+            continue
+        held = {p.get("coin") for s in strategies for p in s.executor.get_open_positions()}
+        tracking = margin is not None and len(margin.table) > 0
+        if not held and recorder is None and not tracking:
             continue
-
-        # Order book wall confirmation
-        wall = wall_confirm.get(decision["coin"], {}) if 'wall_confirm' in locals() else {}
-        min_wall = sig_cfg.get("min_wall_notional", 0)
-        if min_wall:
-            if decision["direction"] == "long":
-                ask = wall.get("ask")
-                if not ask or ask[2] < min_wall:
-                    logger.info(f"{decision['coin']} skipped: no strong ask wall >= ${min_wall}")
-                    continue
-            else:
-                bid = wall.get("bid")
-                if not bid or bid[2] < min_wall:
-                    logger.info(f"{decision['coin']} skipped: no strong bid wall >= ${min_wall}")
-                    continue
-
-        # ATR/volatility filter (simple proxy using 1h candles)
-        min_atr = sig_cfg.get("min_atr_pct", 0)
-        if min_atr:
-            try:
-                # use 24h candle snapshot (1h interval)
-                candles = client._post({"type": "candleSnapshot", "req": {"coin": decision["coin"], "interval": "1h", "startTime": int(time.time() - 26*3600)*1000, "endTime": int(time.time())*1000}})
-                highs = [float(c["h"]) for c in candles]
-                lows = [float(c["l"]) for c in candles]
-                if highs and lows:
-                    atr = sum((h-l) for h,l in zip(highs, lows)) / len(highs)
-                    atr_pct = atr / current_prices.get(decision["coin"], 1) * 100
-                    if atr_pct < min_atr:
-                        logger.info(f"{decision['coin']} skipped: ATR {atr_pct:.2f}% < {min_atr}%")
-                        continue
-            except Exception:
-                pass
-
-        # Confidence-based sizing
-        trade_capital = position_size
-        if exe_cfg.get("size_by_confidence"):
-            conf = decision.get("confidence", 0.5)
-            min_pct = exe_cfg.get("min_size_pct", 10)
-            max_pct = exe_cfg.get("max_size_pct", 30)
-            scaled = min_pct + (max_pct - min_pct) * conf
-            trade_capital = capital * scaled / 100
-
-        executor.execute_trade(decision, trade_capital, exe_cfg)
-
-    # 11. Order book wall confirmation (used as filter)
-    wall_confirm = {}
-    for coin in coins:
         try:
-            book = fetch_orderbook(client, coin)
-            walls = find_depth_clusters(book)
-            best_bid = walls["bid_walls"][0] if walls["bid_walls"] else None
-            best_ask = walls["ask_walls"][0] if walls["ask_walls"] else None
-            wall_confirm[coin] = {"bid": best_bid, "ask": best_ask}
-        except Exception:
-            pass
+            mids = client.get_all_mids()
+        except Exception as e:
+            logger.warning("Exit tick price fetch failed: %s", e)
+            continue
+        if recorder is not None:
+            coins = dict.fromkeys(c for s in strategies for c in s.coins)
+            recorder.record_tick({c: float(mids[c]) for c in coins if mids.get(c)})
+        if tracking:
+            margin.update(mids)
+        prices = {c: float(mids[c]) for c in held if mids.get(c)}
+        for strategy in strategies:
+            strategy.on_price_tick(prices)
 
 
 def shutdown(signum, frame):
@@ -302,30 +302,121 @@ def main():
 
     config_path = sys.argv[1] if len(sys.argv) > 1 else None
     config = load_config(config_path)
+    log_cfg = config["logging"]
+    configure_logging(
+        level=log_cfg["level"],
+        fmt=log_cfg["format"],
+        rate_limits=log_cfg.get("rate_limits"),
+        sampling=log_cfg.get("sampling"),
+    )
 
-    logger.info(f"Liquidation Hunter starting — mode={config['mode']} coins={config['coins']}")
-    logger.info(f"Capital: ${config['total_capital_usd']} | Position size: {config['execution']['position_size_pct']}%")
+    logger.info("Liquidation Hunter starting — mode=%s coins=%s", config["mode"], config["coins"])
+    logger.info(
+        "Capital: $%s | Position size: %s%%",
+        config["total_capital_usd"], config["execution"]["position_size_pct"],
+    )
 
-    client = HyperliquidClient()
-    executor = create_executor(config)
+    client_cfg = config["client"]
+    client = HyperliquidClient(
+        config["info_url"],
+        max_retries=client_cfg["max_retries"],
+        backoff_seconds=client_cfg["backoff_seconds"],
+        hedge=client_cfg["hedge"],
+        hedge_quantile=client_cfg["hedge_quantile"],
+        min_timeout=client_cfg["min_timeout"],
+        max_timeout=client_cfg["max_timeout"],
+    )
+    cycle_deadline = client_cfg["cycle_deadline_seconds"]
+    strategies = [Strategy(name, cfg, create_executor(cfg, client)) for name, cfg in strategy_configs(config)]
+    if len(strategies) > 1:
+        logger.info("Strategies: %s", ", ".join(s.name for s in strategies))
     interval = config["poll_interval_seconds"]
+    workers = config.get("workers", 0)
+    pool = ShardPool(workers) if workers > 1 else None
+    registry = create_wallet_registry(config)
+    registry.start()
+    tracker = PositionDiffEngine()
+    heatmap = LiquidationHeatmap()
+    tracker.subscribe(heatmap.on_events)
+    margin = MarginModel(tracker)
+    corr_cfg = config["correlation"]
+    correlation = CorrelationGate(corr_cfg["halflife_cycles"], corr_cfg["min_observations"])
+    activity_cfg = config["activity"]
+    activity = None
+    if activity_cfg["enabled"]:
+        activity = ActivityIngestor(
+            client, EventStore(activity_cfg["path"]), activity_cfg["weight_per_cycle"], activity_cfg["lookback_hours"],
+        )
+    coins = list(dict.fromkeys(c for s in strategies for c in s.coins))
+    cascade_cfg = config["cascade"]
+    cascades = stream = None
+    if cascade_cfg["enabled"]:
+        cascades = CascadeDetector(**{k: cascade_cfg[k] for k in (
+            "window_seconds", "min_trades", "imbalance", "velocity_pct", "rate_multiplier", "baseline_seconds",
+            "cluster_band_pct", "cooldown_seconds", "max_trades",
+        )})
+        stream = create_cascade_stream(config, coins, cascades).start()
+    venues = VenueAggregator(create_adapters(config["venues"], client))
+    record_path = config.get("backtest", {}).get("record_path")
+    recorder = SnapshotRecorder(record_path) if record_path else None
+    degraded = DegradedSources(config["degraded"])
+    metrics_cfg = config["metrics"]
+    if metrics_cfg["enabled"]:
+        metrics.enable()
+        if metrics_cfg["port"]:
+            metrics.serve(metrics_cfg["port"], metrics_cfg["host"])
+            logger.info("Metrics on http://%s:%s/metrics", metrics_cfg["host"], metrics_cfg["port"])
+    prof_cfg = config["profiling"]
+    profiler = CycleProfiler(prof_cfg["out_dir"], prof_cfg["cycles"], prof_cfg["trigger_file"] or None)
+    if profiler.install_signal():
+        logger.info("Profiling: kill -USR1 %d or touch %s", os.getpid(), prof_cfg["trigger_file"])
 
     cycle = 0
     while _running:
         cycle += 1
-        logger.info(f"--- Cycle {cycle} ---")
+        logger.info("--- Cycle %d ---", cycle)
+        started = time.monotonic()
         try:
-            run_cycle(client, config, executor)
+            with profiler.cycle(cycle), client.cycle_deadline(cycle_deadline):
+                run_cycle(
+                    client, config, strategies, pool, registry, tracker, heatmap, venues, recorder, degraded, margin,
+                    activity, correlation,
+                )
         except Exception as e:
-            logger.error(f"Cycle error: {e}", exc_info=True)
+            logger.error("Cycle error: %s", e, exc_info=True)
+        if cascades is not None:
+            for coin in coins:
+                cascades.set_clusters(coin, heatmap.levels(coin))
+        if metrics.enabled():
+            elapsed = time.monotonic() - started
+            metrics.observe("cycle_seconds", elapsed)
+            if elapsed > interval:
+                metrics.inc("cycle_overruns_total")
+                logger.warning("Cycle %d took %.1fs (> %ss interval)", cycle, elapsed, interval)
+            if metrics_cfg["summary_every"] and cycle % metrics_cfg["summary_every"] == 0:
+                logger.info("Metrics: %s", metrics.registry.summary())
 
         if _running:
-            logger.info(f"Sleeping {interval}s...")
-            for _ in range(interval):
-                if not _running:
-                    break
-                time.sleep(1)
-
+            logger.info("Sleeping %ss...", interval)
+            sleep_with_exit_ticks(
+                client, strategies, interval, config["execution"]["exit_tick_seconds"], recorder, margin,
+                cascades,
+            )
+
+    registry.stop()
+    venues.shutdown()
+    if stream is not None:
+        stream.stop()
+    if recorder is not None:
+        recorder.close()
+    if activity is not None:
+        activity.store.close()
+    for strategy in strategies:
+        strategy.executor.shutdown()
+    if pool is not None:
+        pool.shutdown()
+    client.close()
+    metrics.stop_server()
     logger.info("Liquidation Hunter stopped")
 
 
@@ -0,0 +1,114 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.models import POSITION_DTYPE, PositionBatch
+
+KIND_CYCLE, KIND_TICK = 0.0, 1.0
+_WIDTH = len(POSITION_DTYPE.names)
+
+
+class SharedDataset:
+    """A recorded snapshot series packed into one float64 shared-memory block.
+
+    Layout: ts[n] | kind[n] | prices[n x c] | funding[n x c] | oi[n x c]
+    | position row offsets[n*c + 1] | positions[rows x POSITION_DTYPE fields].
+    Missing values are NaN. Sweep workers attach by name and unpack once,
+    so the dataset is read from disk and parsed a single time.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: dict, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self._owner = owner
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @staticmethod
+    def _sections(n: int, c: int, rows: int) -> list[tuple[str, tuple]]:
+        return [
+            ("ts", (n,)), ("kind", (n,)), ("prices", (n, c)), ("funding", (n, c)), ("oi", (n, c)),
+            ("offsets", (n * c + 1,)), ("positions", (rows, _WIDTH)),
+        ]
+
+    def _arrays(self) -> dict[str, np.ndarray]:
+        n, c, rows = self.layout["n"], len(self.layout["coins"]), self.layout["rows"]
+        out, offset = {}, 0
+        for name, shape in self._sections(n, c, rows):
+            count = int(np.prod(shape))
+            out[name] = np.ndarray(shape, dtype=np.float64, buffer=self.shm.buf, offset=offset * 8)
+            offset += count
+        return out
+
+    @classmethod
+    def create(cls, snapshots: list[dict], coins: list[str]) -> "SharedDataset":
+        n, c = len(snapshots), len(coins)
+        col = {coin: j for j, coin in enumerate(coins)}
+        batches = []
+        counts = np.zeros(n * c, dtype=np.int64)
+        for i, snap in enumerate(snapshots):
+            for coin, batch in snap.get("positions", {}).items():
+                if coin in col and len(batch):
+                    counts[i * c + col[coin]] = len(batch)
+                    batches.append(batch.data)
+        rows = int(counts.sum())
+
+        layout = {"n": n, "coins": list(coins), "rows": rows}
+        size = sum(int(np.prod(shape)) for _, shape in cls._sections(n, c, rows)) * 8
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 8))
+        dataset = cls(shm, layout, owner=True)
+        arrays = dataset._arrays()
+
+        for name in ("prices", "funding", "oi"):
+            arrays[name][:] = np.nan
+        for i, snap in enumerate(snapshots):
+            arrays["ts"][i] = snap["ts"]
+            arrays["kind"][i] = KIND_TICK if snap["kind"] == "tick" else KIND_CYCLE
+            for name, key in (("prices", "prices"), ("funding", "funding"), ("oi", "oi")):
+                for coin, value in snap.get(key, {}).items():
+                    if coin in col and value is not None:
+                        arrays[name][i, col[coin]] = value
+        arrays["offsets"][0] = 0
+        arrays["offsets"][1:] = np.cumsum(counts)
+        if batches:
+            stacked = np.concatenate(batches)
+            for j, field in enumerate(POSITION_DTYPE.names):
+                arrays["positions"][:, j] = stacked[field]
+        return dataset
+
+    @classmethod
+    def attach(cls, name: str, layout: dict) -> "SharedDataset":
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    def to_snapshots(self) -> list[dict]:
+        """Unpack into the snapshot dicts ``read_snapshots`` yields (copied out of shared memory)."""
+        arrays = self._arrays()
+        coins = self.layout["coins"]
+        c = len(coins)
+        snapshots = []
+        for i in range(self.layout["n"]):
+            prices = {coin: float(v) for coin, v in zip(coins, arrays["prices"][i]) if v == v}
+            snap = {"kind": "tick" if arrays["kind"][i] == KIND_TICK else "cycle",
+                    "ts": float(arrays["ts"][i]), "prices": prices}
+            if snap["kind"] == "cycle":
+                snap["funding"] = {coin: float(v) for coin, v in zip(coins, arrays["funding"][i]) if v == v}
+                snap["oi"] = {coin: float(v) for coin, v in zip(coins, arrays["oi"][i]) if v == v}
+                positions = {}
+                for j, coin in enumerate(coins):
+                    lo, hi = int(arrays["offsets"][i * c + j]), int(arrays["offsets"][i * c + j + 1])
+                    if hi > lo:
+                        data = np.zeros(hi - lo, dtype=POSITION_DTYPE)
+                        for k, field in enumerate(POSITION_DTYPE.names):
+                            data[field] = arrays["positions"][lo:hi, k]
+                        positions[coin] = PositionBatch(coin, data)
+                snap["positions"] = positions
+            snapshots.append(snap)
+        del arrays  # release buffer views before close()
+        return snapshots
+
+    def close(self):
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
@@ -0,0 +1,82 @@
+"""Record per-cycle market inputs for backtesting, and read them back.
+
+Snapshots are JSON lines (gzip-compressed when the path ends in ``.gz``):
+
+    {"kind": "cycle", "ts": ..., "prices": {coin: px}, "funding": {coin: rate},
+     "oi": {coin: open interest in coins}, "positions": {coin: [[size, entry_price,
+     liquidation_price, leverage, margin_used, unrealized_pnl], ...]}}
+    {"kind": "tick", "ts": ..., "prices": {coin: px}}
+
+``tick`` lines are the mids fed to the exit engine between cycles.
+"""
+import gzip
+import json
+
+import numpy as np
+from numpy.lib import recfunctions
+
+from src.models import POSITION_DTYPE, PositionBatch
+from src.utils import clock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("backtest.recorder")
+
+
+def _open(path: str, mode: str):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _position_rows(positions) -> list[list[float]]:
+    if not isinstance(positions, PositionBatch):
+        positions = PositionBatch.from_records("", list(positions))
+    return recfunctions.structured_to_unstructured(positions.data).tolist()
+
+
+class SnapshotRecorder:
+    """Appends one line per cycle/exit tick to ``path``."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fh = _open(path, "a")
+
+    def _write(self, snapshot: dict):
+        self._fh.write(json.dumps(snapshot, separators=(",", ":")) + "\n")
+        self._fh.flush()
+
+    def record_cycle(self, prices: dict[str, float], funding: dict[str, float],
+                     open_interest: dict[str, float], positions_by_coin):
+        positions = {}
+        for coin in prices:
+            coin_positions = positions_by_coin.get(coin)
+            if coin_positions:
+                positions[coin] = _position_rows(coin_positions)
+        self._write({
+            "kind": "cycle", "ts": clock.now(), "prices": prices, "funding": funding,
+            "oi": open_interest, "positions": positions,
+        })
+
+    def record_tick(self, prices: dict[str, float]):
+        self._write({"kind": "tick", "ts": clock.now(), "prices": prices})
+
+    def close(self):
+        self._fh.close()
+
+
+def read_snapshots(path: str):
+    """Yield recorded snapshots in order, with positions decoded to PositionBatch."""
+    with _open(path, "r") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            snap = json.loads(line)
+            if snap["kind"] == "cycle":
+                snap["positions"] = {
+                    coin: PositionBatch(coin, recfunctions.unstructured_to_structured(
+                        np.asarray(rows, dtype=np.float64).reshape(-1, len(POSITION_DTYPE.names)),
+                        dtype=POSITION_DTYPE,
+                    ))
+                    for coin, rows in snap.get("positions", {}).items()
+                }
+            yield snap
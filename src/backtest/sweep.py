@@ -0,0 +1,174 @@
+"""Grid/random parameter sweep over recorded snapshots.
+
+    python -m src.backtest.sweep snapshots.jsonl.gz --spec sweep.yaml [--workers 8] [--out sweep.csv]
+
+Spec file::
+
+    mode: grid            # grid | random
+    samples: 1000         # random mode only
+    seed: 0
+    sort: total_pnl       # ranking metric (descending; max_drawdown_pct ranks ascending)
+    params:
+      signals.funding_rate_threshold: [0.0003, 0.0005, 0.0008]
+      signals.weights.liquidation: [0.25, 0.35, 0.45]
+      execution.take_profit_pct: {min: 1.0, max: 4.0}   # random mode: uniform range
+      signals.min_confidence: {min: 0.4, max: 0.8}
+
+Parameters are dotted paths into the config. The dataset is parsed once and
+placed in shared memory; each worker unpacks it once and computes the
+config-independent stages (OI deltas, liquidation clusters) once, then runs
+every config it is handed against that cache.
+"""
+import argparse
+import copy
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from src.backtest.dataset import SharedDataset
+from src.backtest.engine import Backtest, BacktestResult, StageCache
+from src.backtest.recorder import read_snapshots
+from src.utils.logger import configure_logging, setup_logger
+
+logger = setup_logger("backtest.sweep")
+
+METRICS = ("total_pnl", "trades", "win_rate", "profit_factor", "max_drawdown_pct")
+_ASCENDING = {"max_drawdown_pct"}
+
+# Per-worker state, set by _init_worker
+_worker: dict = {}
+
+
+def expand_grid(params: dict[str, list]) -> list[dict]:
+    keys = list(params)
+    return [dict(zip(keys, values)) for values in itertools.product(*(params[k] for k in keys))]
+
+
+def sample_random(params: dict, samples: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(samples):
+        point = {}
+        for key, space in params.items():
+            if isinstance(space, dict):
+                point[key] = rng.uniform(space["min"], space["max"])
+            else:
+                point[key] = rng.choice(space)
+        out.append(point)
+    return out
+
+
+def apply_overrides(config: dict, overrides: dict) -> dict:
+    """Deep-copied ``config`` with dotted-path ``overrides`` set."""
+    config = copy.deepcopy(config)
+    for path, value in overrides.items():
+        node = config
+        *parents, leaf = path.split(".")
+        for key in parents:
+            node = node.setdefault(key, {})
+        node[leaf] = value
+    return config
+
+
+def summarize(result: BacktestResult, capital: float) -> dict:
+    pnls = [t.pnl_usd for t in result.trades]
+    wins = [p for p in pnls if p > 0]
+    losses = [-p for p in pnls if p < 0]
+    peak, max_dd = capital, 0.0
+    for _, equity in result.equity:
+        peak = max(peak, equity)
+        max_dd = max(max_dd, (peak - equity) / peak * 100 if peak else 0.0)
+    return {
+        "total_pnl": result.total_pnl,
+        "trades": len(pnls),
+        "win_rate": len(wins) / len(pnls) if pnls else 0.0,
+        "profit_factor": sum(wins) / sum(losses) if losses else (float("inf") if wins else 0.0),
+        "max_drawdown_pct": max_dd,
+    }
+
+
+def _init_worker(shm_name: str, layout: dict, base_config: dict):
+    configure_logging(level="WARNING")
+    dataset = SharedDataset.attach(shm_name, layout)
+    try:
+        snapshots = dataset.to_snapshots()
+    finally:
+        dataset.close()
+    _worker["snapshots"] = snapshots
+    _worker["stages"] = StageCache(snapshots, base_config["coins"])
+    _worker["base"] = base_config
+
+
+def _run_config(overrides: dict) -> dict:
+    config = apply_overrides(_worker["base"], overrides)
+    result = Backtest(config, stages=_worker["stages"]).run(_worker["snapshots"])
+    return summarize(result, config["total_capital_usd"])
+
+
+def run_sweep(snapshots: list[dict], base_config: dict, configs: list[dict], workers: int = 0,
+              sort: str = "total_pnl") -> list[dict]:
+    """Evaluate every override set in ``configs``; return rows ranked by ``sort``."""
+    workers = workers or os.cpu_count() or 1
+    dataset = SharedDataset.create(snapshots, base_config["coins"])
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(dataset.name, dataset.layout, base_config),
+        ) as pool:
+            chunksize = max(1, len(configs) // (workers * 8))
+            metrics = list(pool.map(_run_config, configs, chunksize=chunksize))
+    finally:
+        dataset.close()
+
+    rows = [{**overrides, **m} for overrides, m in zip(configs, metrics)]
+    rows.sort(key=lambda r: r[sort], reverse=sort not in _ASCENDING)
+    for rank, row in enumerate(rows, 1):
+        row["rank"] = rank
+    return rows
+
+
+def write_table(rows: list[dict], path: str):
+    if not rows:
+        return
+    fields = ["rank"] + [k for k in rows[0] if k != "rank"]
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main():
+    from src.config import load_config
+
+    parser = argparse.ArgumentParser(description="Parameter sweep over recorded snapshots")
+    parser.add_argument("snapshots")
+    parser.add_argument("--spec", required=True, help="sweep spec YAML")
+    parser.add_argument("--config", default=None, help="base config.yaml")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--out", default="sweep_results.csv")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    with open(args.spec, encoding="utf-8") as fh:
+        spec = yaml.safe_load(fh)
+    base = load_config(args.config)
+    if spec.get("mode", "grid") == "random":
+        configs = sample_random(spec["params"], spec.get("samples", 100), spec.get("seed", 0))
+    else:
+        configs = expand_grid(spec["params"])
+
+    configure_logging(level="WARNING")
+    rows = run_sweep(list(read_snapshots(args.snapshots)), base, configs, args.workers,
+                     spec.get("sort", "total_pnl"))
+    write_table(rows, args.out)
+    for row in rows[: args.top]:
+        print("  ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()))
+    print(f"{len(rows)} configs -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
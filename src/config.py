@@ -16,6 +16,18 @@ def load_config(path: str = None) -> dict:
     cfg.setdefault("total_capital_usd", 500)
     cfg.setdefault("coins", ["BTC", "ETH"])
     cfg.setdefault("whale_wallets", [])
+    cfg.setdefault("info_url", "https://api.hyperliquid.xyz/info")  # or a local src.data.info_server
+    cfg.setdefault("venues", ["hyperliquid"])  # + "binance", "dydx" for cross-venue funding/OI
+    cfg.setdefault("workers", 0)  # >1 shards coin evaluation across processes
+
+    client = cfg.setdefault("client", {})
+    client.setdefault("max_retries", 2)
+    client.setdefault("backoff_seconds", 0.2)  # full-jitter exponential backoff base
+    client.setdefault("hedge", True)  # duplicate slow /info requests after the hedge quantile
+    client.setdefault("hedge_quantile", 0.95)
+    client.setdefault("min_timeout", 0.5)
+    client.setdefault("max_timeout", 10.0)
+    client.setdefault("cycle_deadline_seconds", 25)  # under poll_interval_seconds; 0 = unbounded
 
     signals = cfg.setdefault("signals", {})
     signals.setdefault("funding_rate_threshold", 0.0005)
@@ -29,5 +41,59 @@ def load_config(path: str = None) -> dict:
     execution.setdefault("take_profit_pct", 2.0)
     execution.setdefault("stop_loss_pct", 1.0)
     execution.setdefault("timeout_minutes", 30)
+    execution.setdefault("exit_tick_seconds", 1)  # >0 = check TP/SL between cycles every N seconds
+    execution.setdefault("slippage_budget_bps", 0)  # >0 = cap size to what the book fills within N bps of mid
+    execution.setdefault("min_trade_usd", 10)  # capped sizes below this are skipped
+    execution.setdefault("max_correlated_exposure_pct", 0)  # >0 = cap sqrt(x'Cx) of open trades, % of capital
+
+    metrics_cfg = cfg.setdefault("metrics", {})
+    metrics_cfg.setdefault("enabled", False)
+    metrics_cfg.setdefault("host", "127.0.0.1")
+    metrics_cfg.setdefault("port", 9108)  # 0 = no HTTP endpoint, log summaries only
+    metrics_cfg.setdefault("summary_every", 10)  # cycles between log summaries (0 = off)
+
+    profiling = cfg.setdefault("profiling", {})
+    profiling.setdefault("cycles", 3)
+    profiling.setdefault("out_dir", "data/profiles")
+    profiling.setdefault("trigger_file", "data/profile.trigger")
+
+    degraded = cfg.setdefault("degraded", {})
+    degraded.setdefault("failure_threshold", 3)  # consecutive failures that open a source's breaker
+    degraded.setdefault("reset_seconds", 60)  # open -> half-open (one trial fetch)
+    degraded.setdefault("max_age_seconds", 300)  # last good data older than this is refused
+    degraded.setdefault("half_life_seconds", 120)  # stale signal strength halves every N seconds
+
+    cascade = cfg.setdefault("cascade", {})
+    cascade.setdefault("enabled", False)  # needs websocket-client (or a replay_path)
+    cascade.setdefault("ws_url", "wss://api.hyperliquid.xyz/ws")
+    cascade.setdefault("replay_path", "")  # JSONL trades file replayed instead of the live stream
+    cascade.setdefault("replay_speed", 1.0)
+    cascade.setdefault("window_seconds", 10)
+    cascade.setdefault("min_trades", 20)
+    cascade.setdefault("imbalance", 0.6)  # |buy - sell| / (buy + sell) taker notional
+    cascade.setdefault("velocity_pct", 0.4)  # price move within the window
+    cascade.setdefault("rate_multiplier", 3.0)  # trade rate vs its long-run baseline
+    cascade.setdefault("baseline_seconds", 600)
+    cascade.setdefault("cluster_band_pct", 0.25)
+    cascade.setdefault("cooldown_seconds", 120)
+    cascade.setdefault("max_trades", 5000)  # per-coin window cap
+    cascade.setdefault("exit", True)  # close trades on the wrong side of a cascade
+    cascade.setdefault("enter", False)  # open trades riding it
+    cascade.setdefault("min_strength", 0.6)
+
+    correlation = cfg.setdefault("correlation", {})
+    correlation.setdefault("halflife_cycles", 60)  # EW return covariance half-life
+    correlation.setdefault("min_observations", 20)  # fewer returns: treated as correlated with everything
+
+    activity = cfg.setdefault("activity", {})
+    activity.setdefault("enabled", False)
+    activity.setdefault("path", "data/activity")  # append-only fills/funding store
+    # API weight per cycle for the round-robin batch; each wallet costs 2 requests x 20 (0 = every wallet)
+    activity.setdefault("weight_per_cycle", 200)
+    activity.setdefault("lookback_hours", 24)  # history pulled for a wallet seen for the first time
+
+    logging_cfg = cfg.setdefault("logging", {})
+    logging_cfg.setdefault("level", "INFO")
+    logging_cfg.setdefault("format", "text")
 
     return cfg
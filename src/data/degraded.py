@@ -0,0 +1,134 @@
+"""Degraded operation: per-source circuit breakers and last-good data with age.
+
+A failed fetch no longer blanks the signal it feeds. Each data source
+(prices, funding, OI, whale scan, order books) sits behind a
+``CircuitBreaker``; the last successful result is kept with its timestamp
+and served, with its age, while the source is failing or its breaker is
+open. Results older than the source's ``max_age_seconds`` are refused.
+``staleness()`` turns the ages of the sources behind each signal into
+strength multipliers (halving every ``half_life_seconds``) for
+``aggregate_signals``.
+"""
+import time
+
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("degraded")
+
+# Which sources feed which signal ("venues" when cross-venue aggregation is on). Every
+# signal's entry goes in at the last mid, so stale prices weaken all of them
+SIGNAL_SOURCES = {
+    "funding": ("funding", "venues", "prices"),
+    "oi_divergence": ("oi", "venues", "prices"),
+    "liquidation": ("whales", "prices"),
+    "pull": ("whales", "prices"),
+}
+
+
+class CircuitBreaker:
+    """closed -> (``failure_threshold`` consecutive failures) -> open -> (after
+    ``reset_seconds``) -> half-open: one trial call closes or re-opens it."""
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()  # (re)open; a failed half-open trial restarts the wait
+
+
+class Source:
+    def __init__(self, name: str, max_age_seconds: float, half_life_seconds: float, breaker: CircuitBreaker):
+        self.name = name
+        self.max_age_seconds = max_age_seconds
+        self.half_life_seconds = half_life_seconds
+        self.breaker = breaker
+        self.value = None
+        self.fetched_at: float | None = None
+        self.served_age: float | None = None  # age of what the last ``fetch`` returned
+
+    def age(self) -> float | None:
+        return None if self.fetched_at is None else time.monotonic() - self.fetched_at
+
+    def fetch(self, fn, *args):
+        """(value, age seconds) — fresh from ``fn(*args)``, else last good, else (None, None)."""
+        if self.breaker.allow():
+            try:
+                value = fn(*args)
+            except Exception as e:
+                self.breaker.failure()
+                logger.warning("%s fetch failed (%s), breaker %s", self.name, e, self.breaker.state)
+            else:
+                self.breaker.success()
+                self.value, self.fetched_at, self.served_age = value, time.monotonic(), 0.0
+                metrics.set_gauge("source_age_seconds", 0.0, source=self.name)
+                return value, 0.0
+
+        age = self.age()
+        metrics.set_gauge("breaker_open", float(self.breaker.state == "open"), source=self.name)
+        if age is None or age > self.max_age_seconds:
+            self.served_age = None
+            if age is not None:
+                logger.warning("%s: last good data is %.0fs old (max %ss), refusing", self.name, age,
+                               self.max_age_seconds)
+            return None, None
+        self.served_age = age
+        metrics.set_gauge("source_age_seconds", age, source=self.name)
+        logger.info("%s: using last good data (%.0fs old)", self.name, age)
+        return self.value, age
+
+    def decay(self) -> float:
+        """Strength multiplier for what was last served (0 when nothing usable was)."""
+        if self.served_age is None:
+            return 0.0
+        return 0.5 ** (self.served_age / self.half_life_seconds) if self.half_life_seconds > 0 else 1.0
+
+
+class DegradedSources:
+    """Named ``Source``s built from the ``degraded`` config section."""
+
+    def __init__(self, cfg: dict | None = None):
+        self.cfg = cfg or {}
+        self._sources: dict[str, Source] = {}
+
+    def source(self, name: str) -> Source:
+        src = self._sources.get(name)
+        if src is None:
+            kind = name.split(":")[0]  # "book:BTC" -> "book" settings
+            cfg = {**self.cfg, **(self.cfg.get("sources") or {}).get(kind, {})}
+            src = self._sources[name] = Source(
+                name, cfg.get("max_age_seconds", 300), cfg.get("half_life_seconds", 120),
+                CircuitBreaker(cfg.get("failure_threshold", 3), cfg.get("reset_seconds", 60)),
+            )
+        return src
+
+    def fetch(self, name: str, fn, *args):
+        return self.source(name).fetch(fn, *args)
+
+    def staleness(self) -> dict[str, float]:
+        """{signal: strength multiplier} for signals whose inputs are stale (fresh ones omitted)."""
+        out = {}
+        for signal, names in SIGNAL_SOURCES.items():
+            for name in names:
+                src = self._sources.get(name)
+                if src is not None and src.served_age:
+                    out[signal] = min(out.get(signal, 1.0), src.decay())
+        return out
@@ -16,7 +16,7 @@ def fetch_funding_rates(client, coins: list[str]) -> dict[str, float]:
         if idx is not None and idx < len(ctxs):
             rate = float(ctxs[idx].get("funding", 0))
             rates[coin] = rate
-            logger.debug(f"{coin} funding rate: {rate:.6f}")
+            logger.debug("%s funding rate: %.6f", coin, rate)
     return rates
 
 
@@ -32,5 +32,5 @@ def detect_funding_extreme(rates: dict[str, float], threshold: float) -> dict[st
         if abs(rate) >= threshold:
             direction = "short" if rate > 0 else "long"
             extremes[coin] = {"rate": rate, "direction": direction}
-            logger.info(f"{coin} funding extreme: {rate:.6f} → cascade direction: {direction}")
+            logger.info("%s funding extreme: %.6f → cascade direction: %s", coin, rate, direction)
     return extremes
@@ -1,4 +1,14 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.utils import metrics
 from src.utils.logger import setup_logger
 
 logger = setup_logger("hl_client")
@@ -6,16 +16,185 @@ logger = setup_logger("hl_client")
 API_URL = "https://api.hyperliquid.xyz/info"
 
 
+class DeadlineExceeded(Exception):
+    """The cycle deadline passed before (or while) a request could be made."""
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class LatencyTracker:
+    """Rolling per-request-type latency samples (seconds)."""
+
+    def __init__(self, window: int = 256):
+        self.window = window
+        self._samples: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, seconds: float):
+        with self._lock:
+            samples = self._samples.get(kind)
+            if samples is None:
+                samples = self._samples[kind] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def count(self, kind: str) -> int:
+        return len(self._samples.get(kind, ()))
+
+    def quantile(self, kind: str, q: float) -> float | None:
+        with self._lock:
+            samples = sorted(self._samples.get(kind, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def _retryable(e: Exception) -> bool:
+    if isinstance(e, requests.HTTPError):
+        status = e.response.status_code if e.response is not None else 0
+        return status == 429 or status >= 500
+    # Connection errors, timeouts and truncated/invalid JSON bodies
+    return isinstance(e, (requests.ConnectionError, requests.Timeout, ValueError))
+
+
 class HyperliquidClient:
-    def __init__(self, url: str = API_URL):
+    """/info client with latency-derived timeouts, hedging, retries and a cycle deadline.
+
+    Every /info request is idempotent, so once a request type has
+    ``min_samples`` observations a duplicate is sent when the first has not
+    answered by its ``hedge_quantile`` latency; the first success wins.
+    Timeouts are ``timeout_multiplier`` x p99 clamped to
+    [``min_timeout``, ``max_timeout``]; a timed-out request counts as a
+    sample at its timeout, so a slowed endpoint widens its own. Failed requests (connection errors,
+    timeouts, 429/5xx, malformed JSON) are retried with full-jitter
+    exponential backoff. While a ``cycle_deadline`` is active no request
+    outlives it; once it passes, calls raise ``DeadlineExceeded`` at once.
+    """
+
+    def __init__(self, url: str = API_URL, max_retries: int = 2, backoff_seconds: float = 0.2,
+                 hedge: bool = True, hedge_quantile: float = 0.95, min_timeout: float = 0.5,
+                 max_timeout: float = 10.0, timeout_multiplier: float = 4.0, min_samples: int = 20):
         self.url = url
         self.session = requests.Session()
         self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=16))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=16))
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.latency = LatencyTracker()
+        self.deadline: Deadline | None = None
+        self.hedges = 0
+        self.retries = 0
+        self._pool: ThreadPoolExecutor | None = None
+
+    @contextmanager
+    def cycle_deadline(self, seconds: float | None):
+        """Bound every request made inside the block by ``seconds`` from now (None/0 = no bound)."""
+        self.deadline = Deadline(seconds) if seconds else None
+        try:
+            yield self.deadline
+        finally:
+            self.deadline = None
+
+    def timeout_for(self, kind: str) -> float:
+        timeout = self.max_timeout
+        if self.latency.count(kind) >= self.min_samples:
+            p99 = self.latency.quantile(kind, 0.99)
+            timeout = min(max(p99 * self.timeout_multiplier, self.min_timeout), self.max_timeout)
+        if self.deadline is not None:
+            remaining = self.deadline.remaining()
+            if remaining <= 0:
+                metrics.inc("deadline_exceeded_total", endpoint=kind)
+                raise DeadlineExceeded(kind)
+            timeout = min(timeout, remaining)
+        return timeout
 
     def _post(self, payload: dict) -> dict:
-        resp = self.session.post(self.url, json=payload, timeout=10)
-        resp.raise_for_status()
-        return resp.json()
+        kind = payload.get("type", "?")
+        attempt = 0
+        while True:
+            try:
+                return self._request(kind, payload)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                if attempt >= self.max_retries or not _retryable(e):
+                    raise
+                delay = random.uniform(0, self.backoff_seconds * 2 ** attempt)
+                if self.deadline is not None and self.deadline.remaining() <= delay:
+                    raise
+                attempt += 1
+                self.retries += 1
+                metrics.inc("retries_total", endpoint=kind)
+                logger.debug("%s failed (%s), retry %d in %.2fs", kind, e, attempt, delay)
+                time.sleep(delay)
+
+    def _request(self, kind: str, payload: dict):
+        timeout = self.timeout_for(kind)
+        hedge_after = None
+        if self.hedge and self.latency.count(kind) >= self.min_samples:
+            hedge_after = self.latency.quantile(kind, self.hedge_quantile)
+        if hedge_after is None or hedge_after >= timeout:
+            return self._send(kind, payload, timeout)
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hl-hedge")
+        primary = self._pool.submit(self._send, kind, payload, timeout)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+        self.hedges += 1
+        metrics.inc("hedged_requests_total", endpoint=kind)
+        pending = {primary, self._pool.submit(self._send, kind, payload, timeout - hedge_after)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _send(self, kind: str, payload: dict, timeout: float):
+        started = time.perf_counter()
+        ok, size = False, 0
+        try:
+            resp = self.session.post(self.url, json=payload, timeout=timeout)
+            size = len(resp.content)
+            resp.raise_for_status()
+            data = resp.json()
+            ok = True
+            return data
+        except requests.Timeout:
+            # Censored sample: the latency was at least the timeout. Without it a request type
+            # that slows past its learned timeout would time out forever and never widen it
+            self.latency.observe(kind, timeout)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if ok:
+                self.latency.observe(kind, elapsed)
+            metrics.observe_request("hyperliquid", kind, elapsed, size, ok)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.session.close()
 
     def get_meta_and_contexts(self) -> dict:
         return self._post({"type": "metaAndAssetCtxs"})
@@ -34,3 +213,6 @@ class HyperliquidClient:
 
     def get_user_funding(self, user: str, start_time: int) -> list:
         return self._post({"type": "userFunding", "user": user, "startTime": start_time})
+
+    def get_user_fills_by_time(self, user: str, start_time: int) -> list:
+        return self._post({"type": "userFillsByTime", "user": user, "startTime": start_time})
@@ -0,0 +1,252 @@
+"""Local Hyperliquid /info stand-in backed by a SyntheticMarket, with fault injection.
+
+    python -m src.data.info_server --wallets 10000 --port 8099 --faults faults.yaml
+
+then point the bot at it with ``info_url: http://127.0.0.1:8099/info``.
+
+Faults file (every key optional; per-endpoint sections override ``default``)::
+
+    seed: 0
+    tick_seconds: 1            # advance the market in real time (0 = frozen)
+    latency:                   # ms; dist = fixed | uniform | lognormal
+      default: {dist: lognormal, median_ms: 40, sigma: 0.6}
+      clearinghouseState: {dist: lognormal, median_ms: 80, sigma: 0.8}
+    rate_limit:
+      weight_per_minute: 1200  # token bucket shared by all clients (0 = off)
+      weights: {clearinghouseState: 2, l2Book: 2, allMids: 2, default: 20}
+    error_prob: 0.01           # HTTP 500
+    timeout_prob: 0.002        # hold the request for hang_seconds, then drop it
+    hang_seconds: 30
+    malformed_prob: 0.005      # 200 with a truncated JSON body
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+from src.data.synthetic import SyntheticMarket
+from src.utils.logger import configure_logging, setup_logger
+
+logger = setup_logger("info_server")
+
+# Hyperliquid's documented request weights
+DEFAULT_WEIGHTS = {"clearinghouseState": 2, "l2Book": 2, "allMids": 2, "orderStatus": 2, "default": 20}
+
+
+class LatencyModel:
+    def __init__(self, spec: dict | None, rng: random.Random):
+        spec = spec or {}
+        self.dist = spec.get("dist", "fixed")
+        self.median_ms = spec.get("median_ms", spec.get("ms", 0.0))
+        self.sigma = spec.get("sigma", 0.5)
+        self.low_ms = spec.get("min_ms", 0.0)
+        self.high_ms = spec.get("max_ms", self.median_ms * 2)
+        self.rng = rng
+
+    def sample(self) -> float:
+        """Seconds."""
+        if self.dist == "lognormal":
+            ms = self.median_ms * math.exp(self.rng.gauss(0, self.sigma))
+        elif self.dist == "uniform":
+            ms = self.rng.uniform(self.low_ms, self.high_ms)
+        else:
+            ms = self.median_ms
+        return max(ms, 0.0) / 1000
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, weight: float) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < weight:
+                return False
+            self.tokens -= weight
+            return True
+
+
+class Faults:
+    """Parsed fault config; decisions drawn from one seeded RNG."""
+
+    def __init__(self, spec: dict | None = None):
+        spec = spec or {}
+        self.rng = random.Random(spec.get("seed", 0))
+        self._rng_lock = threading.Lock()
+        latency = spec.get("latency") or {}
+        self.latency = {k: LatencyModel(v, self.rng) for k, v in latency.items()}
+        self.latency.setdefault("default", LatencyModel(None, self.rng))
+        rl = spec.get("rate_limit") or {}
+        self.bucket = TokenBucket(rl["weight_per_minute"]) if rl.get("weight_per_minute") else None
+        self.weights = {**DEFAULT_WEIGHTS, **(rl.get("weights") or {})}
+        self.error_prob = spec.get("error_prob", 0.0)
+        self.timeout_prob = spec.get("timeout_prob", 0.0)
+        self.hang_seconds = spec.get("hang_seconds", 30.0)
+        self.malformed_prob = spec.get("malformed_prob", 0.0)
+
+    def draw(self, kind: str) -> tuple[float, str]:
+        """(delay seconds, outcome) with outcome in ok | rate_limited | error | timeout | malformed."""
+        if self.bucket is not None and not self.bucket.take(self.weights.get(kind, self.weights["default"])):
+            return 0.0, "rate_limited"
+        with self._rng_lock:
+            delay = self.latency.get(kind, self.latency["default"]).sample()
+            roll = self.rng.random()
+        for outcome, p in (("timeout", self.timeout_prob), ("error", self.error_prob),
+                           ("malformed", self.malformed_prob)):
+            if roll < p:
+                return delay, outcome
+            roll -= p
+        return delay, "ok"
+
+
+class InfoServer:
+    """Serve ``market.info`` on POST /info in a background thread.
+
+    ``stats`` counts requests per (type, outcome). Use as a context manager
+    or call ``start()``/``stop()``.
+    """
+
+    def __init__(self, market: SyntheticMarket, faults: Faults | dict | None = None, host: str = "127.0.0.1",
+                 port: int = 0, tick_seconds: float = 0.0):
+        self.market = market
+        self.faults = faults if isinstance(faults, Faults) else Faults(faults)
+        self.tick_seconds = tick_seconds
+        self.stats: dict[tuple[str, str], int] = {}
+        self._market_lock = threading.Lock()
+        self._stop = threading.Event()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length)) if length else {}
+                    kind = body.get("type", "?")
+                except ValueError:
+                    self._reply(400, b'{"error":"invalid json"}')
+                    return
+                if self.path.split("?")[0] != "/info":
+                    self._reply(404, b'{"error":"not found"}')
+                    return
+
+                delay, outcome = server.faults.draw(kind)
+                server._count(kind, outcome)
+                if outcome == "rate_limited":
+                    self._reply(429, b"null")
+                    return
+                if outcome == "timeout":
+                    server._stop.wait(server.faults.hang_seconds)
+                    self.close_connection = True
+                    return
+                if delay:
+                    time.sleep(delay)
+                if outcome == "error":
+                    self._reply(500, b'{"error":"internal error"}')
+                    return
+                try:
+                    with server._market_lock:
+                        obj = server.market.info(body)
+                except (KeyError, ValueError) as e:
+                    self._reply(422, json.dumps({"error": str(e)}).encode())
+                    return
+                payload = json.dumps(obj, separators=(",", ":")).encode()
+                if outcome == "malformed":
+                    payload = payload[: max(1, len(payload) // 2)]
+                self._reply(200, payload)
+
+            def _reply(self, status: int, payload: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._threads: list[threading.Thread] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/info"
+
+    def _count(self, kind: str, outcome: str):
+        key = (kind, outcome)
+        with self._market_lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _tick(self):
+        while not self._stop.wait(self.tick_seconds):
+            with self._market_lock:
+                self.market.advance(self.tick_seconds)
+
+    def start(self) -> "InfoServer":
+        self._threads = [threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)]
+        if self.tick_seconds > 0:
+            self._threads.append(threading.Thread(target=self._tick, daemon=True))
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "InfoServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Hyperliquid /info stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--wallets", type=int, default=1000)
+    parser.add_argument("--coins", type=int, default=0, help="number of coins (0 = the default five)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--faults", default=None, help="fault/latency YAML")
+    parser.add_argument("--wallet-file", default=None, help="write the wallet list here (for wallet_sources)")
+    args = parser.parse_args()
+
+    configure_logging(level="INFO")
+    spec = {}
+    if args.faults:
+        with open(args.faults, encoding="utf-8") as fh:
+            spec = yaml.safe_load(fh) or {}
+    market = SyntheticMarket(args.coins or None, n_wallets=args.wallets, seed=args.seed)
+    if args.wallet_file:
+        with open(args.wallet_file, "w", encoding="utf-8") as fh:
+            fh.writelines(f"{w}\n" for w in market.wallets())
+    server = InfoServer(market, spec, args.host, args.port, spec.get("tick_seconds", 1.0)).start()
+    logger.info("Serving %d wallets on %s", args.wallets, server.url)
+    try:
+        while True:
+            time.sleep(60)
+            logger.info("Requests: %s", {f"{k}:{o}": n for (k, o), n in sorted(server.stats.items())})
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
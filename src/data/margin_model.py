@@ -0,0 +1,193 @@
+"""Local liquidation price recomputation between wallet scans.
+
+Hyperliquid liquidates when an account's margin available — account value
+minus maintenance margin — reaches zero. Maintenance margin is half the
+initial margin at the coin's max leverage (``mmr = 1 / (2 * max_leverage)``),
+and for a position of signed ``size`` at mark ``m``::
+
+    liq = m - margin_available / k,   k = size * (1 - side * mmr)
+
+An isolated position's liquidation price does not move with the mark. A
+cross position's does: every mark change on any of the account's cross
+positions changes the shared margin available by ``(m - m0) * k``.
+
+``MarginModel`` calibrates each wallet's margin available from the last
+``clearinghouseState`` (the API's own ``liquidationPx`` at the marks implied
+by ``unrealizedPnl``), then on every ``update(mids)`` recomputes all cross
+liquidation prices at once with a ``bincount`` over wallets. Positions the
+API reports no ``liquidationPx`` for get an estimate: from the account's
+margin available when other cross positions pin it down, otherwise from
+their own margin (a conservative lower bound on collateral).
+
+Moves of at least the engine's ``liq_move_pct`` are written back into the
+PositionTable and published as ``liq_moved`` events, so a subscribed
+LiquidationHeatmap rebuilds only the coins that changed.
+"""
+import numpy as np
+
+from src.data.position_diff import LIQ_MOVED, PositionDiffEngine, PositionEvent
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("margin_model")
+
+
+class MarginModel:
+    def __init__(self, engine: PositionDiffEngine):
+        self.engine = engine
+        self.table = engine.table
+        self._seen = np.empty(0, dtype=np.int64)       # table stamp each row was calibrated at
+        self._mark0 = np.empty(0)                      # mark at calibration
+        self._mmr = np.empty(0)                        # maintenance margin rate
+        self._group = np.empty(0, dtype=np.intp)       # cross group (wallet) id, -1 = none
+        self._coin_id = np.empty(0, dtype=np.intp)
+        self._coins: dict[str, int] = {}
+        self._groups: dict[str, int] = {}
+        self._free_groups: list[int] = []
+        self._margin0 = np.empty(0)                    # per group: margin available at calibration
+
+    def _grow(self, n: int):
+        have = len(self._seen)
+        if n <= have:
+            return
+        extra = n - have
+        self._seen = np.concatenate([self._seen, np.full(extra, -1, dtype=np.int64)])
+        self._mark0 = np.concatenate([self._mark0, np.full(extra, np.nan)])
+        self._mmr = np.concatenate([self._mmr, np.zeros(extra)])
+        self._group = np.concatenate([self._group, np.full(extra, -1, dtype=np.intp)])
+        self._coin_id = np.concatenate([self._coin_id, np.full(extra, -1, dtype=np.intp)])
+
+    def _group_id(self, wallet: str) -> int:
+        gid = self._groups.get(wallet)
+        if gid is None:
+            if self._free_groups:
+                gid = self._free_groups.pop()
+            else:
+                gid = len(self._margin0)
+                self._margin0 = np.append(self._margin0, np.nan)
+            self._groups[wallet] = gid
+        return gid
+
+    def _release_group(self, wallet: str):
+        gid = self._groups.pop(wallet, None)
+        if gid is not None:
+            self._margin0[gid] = np.nan
+            self._free_groups.append(gid)
+
+    def _calibrate(self, wallet: str, rows: list[int], cols: dict[str, np.ndarray]) -> list[int]:
+        """Derive a freshly scanned wallet's margin state; returns rows whose liq was estimated."""
+        size = cols["size"][rows]
+        side = np.sign(size)
+        max_lev = cols["max_leverage"][rows]
+        # Unknown max leverage: the position's own leverage bounds it from below (mmr from above)
+        max_lev = np.where(np.isnan(max_lev), np.maximum(cols["leverage"][rows], 1.0), max_lev)
+        mmr = 0.5 / max_lev
+        mark0 = cols["entry_price"][rows] + cols["unrealized_pnl"][rows] / size
+        k = size * (1 - side * mmr)
+        liq = cols["liquidation_price"][rows]
+        cross = cols["cross"][rows] == 1.0
+
+        self._mark0[rows] = mark0
+        self._mmr[rows] = mmr
+        for r in rows:
+            coin = self.table.coins[r]
+            self._coin_id[r] = self._coins.setdefault(coin, len(self._coins))
+
+        estimated = []
+        if cross.any():
+            gid = self._group_id(wallet)
+            implied = (mark0 - liq)[cross] * k[cross]
+            implied = implied[~np.isnan(implied)]
+            if len(implied):
+                # Every cross position implies the same account-wide margin available
+                margin0 = float(np.median(implied))
+            else:
+                # No liquidationPx at all: assume collateral no larger than the margin in use
+                margin0 = float(np.sum(cols["margin_used"][rows][cross] - np.abs(size[cross]) * mark0[cross] * mmr[cross]))
+            self._margin0[gid] = margin0
+            self._group[rows] = np.where(cross, gid, -1)
+        else:
+            self._release_group(wallet)
+            self._group[rows] = -1
+
+        # Isolated positions without a liquidationPx: their own margin is all they have
+        missing = ~cross & np.isnan(liq)
+        if missing.any():
+            margin = cols["margin_used"][rows] - np.abs(size) * mark0 * mmr
+            est = mark0 - margin / k
+            for i in np.flatnonzero(missing):
+                if est[i] > 0:
+                    cols["liquidation_price"][rows[i]] = est[i]
+                    estimated.append(rows[i])
+        return estimated
+
+    def update(self, mids: dict) -> list[PositionEvent]:
+        """Recompute cross liquidation prices at ``mids``; publish and return the moves."""
+        table = self.table
+        n = len(table.wallets)
+        if n == 0:
+            return []
+        with metrics.stage("margin_model"):
+            self._grow(n)
+            cols = {f: np.frombuffer(a, dtype=np.float64) for f, a in table.columns.items()}
+            stamps = np.frombuffer(table.stamps, dtype=np.int64)
+            events = []
+
+            fresh = np.flatnonzero(stamps != self._seen[:n])
+            if len(fresh):
+                self._seen[fresh] = stamps[fresh]
+                self._group[fresh] = -1
+                wallets = {table.wallets[r] for r in fresh}
+                wallets.discard(None)
+                for wallet in wallets:
+                    rows = sorted(table._by_wallet.get(wallet, ()))
+                    for r in self._calibrate(wallet, rows, cols):
+                        events.append(self._event(r, cols, cols["liquidation_price"][r], None))
+                # Freed rows no longer name their wallet: drop groups of wallets that left the table
+                for wallet in [w for w in self._groups if w not in table._by_wallet]:
+                    self._release_group(wallet)
+
+            rows = np.flatnonzero(self._group[:n] >= 0)
+            if len(rows):
+                events.extend(self._recompute(rows, cols, mids))
+            del cols, stamps  # release the buffers so the table's arrays can grow again
+
+        self.engine._publish(events)
+        return events
+
+    def _recompute(self, rows: np.ndarray, cols: dict[str, np.ndarray], mids: dict) -> list[PositionEvent]:
+        prices = np.array([float(mids.get(c) or "nan") for c in self._coins])
+        mark0 = self._mark0[rows]
+        marks = prices[self._coin_id[rows]] if len(prices) else np.full(len(rows), np.nan)
+        marks = np.where(np.isnan(marks), mark0, marks)
+        size = cols["size"][rows]
+        k = size * (1 - np.sign(size) * self._mmr[rows])
+        group = self._group[rows]
+
+        pnl = np.bincount(group, weights=(marks - mark0) * k, minlength=len(self._margin0))
+        margin = self._margin0[group] + pnl[group]
+        new = marks - margin / k
+        new[new <= 0] = np.nan  # a long that cannot be liquidated
+
+        old = cols["liquidation_price"][rows]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            moved = np.abs(new - old) / old * 100 >= self.engine.liq_move_pct
+        moved |= np.isnan(new) != np.isnan(old)
+        events = []
+        for i in np.flatnonzero(moved):
+            r = rows[i]
+            prev = old[i]
+            cols["liquidation_price"][r] = new[i]
+            events.append(self._event(r, cols, new[i], prev))
+        return events
+
+    def _event(self, row: int, cols: dict[str, np.ndarray], liq: float, prev: float | None) -> PositionEvent:
+        size = float(cols["size"][row])
+        return PositionEvent(
+            LIQ_MOVED, self.table.wallets[row], self.table.coins[row], size, size,
+            float(cols["leverage"][row]), _opt(liq), _opt(prev),
+        )
+
+
+def _opt(value) -> float | None:
+    return None if value is None or np.isnan(value) else float(value)
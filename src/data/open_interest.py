@@ -1,4 +1,4 @@
-import time
+from src.utils import clock
 from src.utils.logger import setup_logger
 
 logger = setup_logger("open_interest")
@@ -15,33 +15,35 @@ def fetch_open_interest(client, coins: list[str]) -> dict[str, float]:
 
     coin_index = {asset["name"]: i for i, asset in enumerate(meta["universe"])}
     oi_data = {}
-    now = time.time()
 
     for coin in coins:
         idx = coin_index.get(coin)
         if idx is not None and idx < len(ctxs):
-            oi = float(ctxs[idx].get("openInterest", 0))
-            oi_data[coin] = oi
-
-            # Track history
-            if coin not in _oi_history:
-                _oi_history[coin] = []
-            _oi_history[coin].append((now, oi))
-            # Keep only last 6 hours
-            cutoff = now - 6 * 3600
-            _oi_history[coin] = [(t, v) for t, v in _oi_history[coin] if t > cutoff]
-
-            logger.debug(f"{coin} OI: {oi:.2f}")
+            oi_data[coin] = float(ctxs[idx].get("openInterest", 0))
+
+    record_open_interest(oi_data)
     return oi_data
 
 
+def record_open_interest(oi_data: dict[str, float]):
+    """Append OI readings to the history used by ``get_oi_delta``."""
+    now = clock.now()
+    cutoff = now - 6 * 3600  # Keep only last 6 hours
+    for coin, oi in oi_data.items():
+        if coin not in _oi_history:
+            _oi_history[coin] = []
+        _oi_history[coin].append((now, oi))
+        _oi_history[coin] = [(t, v) for t, v in _oi_history[coin] if t > cutoff]
+        logger.debug("%s OI: %.2f", coin, oi)
+
+
 def get_oi_delta(coin: str, lookback_hours: float = 4.0) -> float | None:
     """Calculate OI % change over the lookback period. Returns None if insufficient data."""
     history = _oi_history.get(coin, [])
     if len(history) < 2:
         return None
 
-    now = time.time()
+    now = clock.now()
     cutoff = now - lookback_hours * 3600
 
     # Find the oldest reading within the lookback window
@@ -56,7 +58,7 @@ def get_oi_delta(coin: str, lookback_hours: float = 4.0) -> float | None:
         return None
 
     delta_pct = ((current_oi - old_oi) / old_oi) * 100
-    logger.debug(f"{coin} OI delta ({lookback_hours}h): {delta_pct:.2f}%")
+    logger.debug("%s OI delta (%sh): %.2f%%", coin, lookback_hours, delta_pct)
     return delta_pct
 
 
@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.utils.logger import setup_logger
 
 logger = setup_logger("orderbook")
@@ -11,7 +13,7 @@ def fetch_orderbook(client, coin: str) -> dict:
     bids = [(float(b["px"]), float(b["sz"])) for b in levels[0]] if levels[0] else []
     asks = [(float(a["px"]), float(a["sz"])) for a in levels[1]] if levels[1] else []
 
-    logger.debug(f"{coin} book: {len(bids)} bids, {len(asks)} asks")
+    logger.debug("%s book: %d bids, %d asks", coin, len(bids), len(asks))
     return {"bids": bids, "asks": asks}
 
 
@@ -28,3 +30,107 @@ def find_depth_clusters(book: dict, top_n: int = 5) -> dict:
     ask_walls = sorted(ask_walls, key=lambda x: x[2], reverse=True)[:top_n]
 
     return {"bid_walls": bid_walls, "ask_walls": ask_walls}
+
+
+class BookDepth:
+    """One L2 snapshot as cumulative depth arrays, for fill simulation.
+
+    Each side holds level prices (best first) and running totals of size and
+    notional, so the average price of a market order of any size is one
+    ``searchsorted`` plus a partial level. The average price of sweeping
+    through each level (``*_avg_px``) is monotonic, so the largest order
+    within a slippage budget is a ``searchsorted`` too.
+    """
+
+    __slots__ = ("coin", "ts", "bid_px", "bid_cum_sz", "bid_cum_notional", "bid_avg_px",
+                 "ask_px", "ask_cum_sz", "ask_cum_notional", "ask_avg_px")
+
+    def __init__(self, coin: str, ts: float, bids: list[tuple[float, float]], asks: list[tuple[float, float]]):
+        self.coin = coin
+        self.ts = ts
+        self.bid_px, self.bid_cum_sz, self.bid_cum_notional = _cumulate(bids)
+        self.ask_px, self.ask_cum_sz, self.ask_cum_notional = _cumulate(asks)
+        self.bid_avg_px = self.bid_cum_notional / self.bid_cum_sz if len(self.bid_px) else self.bid_px
+        self.ask_avg_px = self.ask_cum_notional / self.ask_cum_sz if len(self.ask_px) else self.ask_px
+
+    @classmethod
+    def from_book(cls, coin: str, book: dict, ts: float, band_pct: float | None = None) -> "BookDepth":
+        """Depth of ``book``; with ``band_pct``, only levels within that distance of the best price."""
+        bids, asks = book.get("bids", []), book.get("asks", [])
+        if band_pct is not None:
+            if bids:
+                floor = bids[0][0] * (1 - band_pct / 100)
+                bids = [lvl for lvl in bids if lvl[0] >= floor]
+            if asks:
+                cap = asks[0][0] * (1 + band_pct / 100)
+                asks = [lvl for lvl in asks if lvl[0] <= cap]
+        return cls(coin, ts, bids, asks)
+
+    def mid(self) -> float | None:
+        if not len(self.bid_px) or not len(self.ask_px):
+            return None
+        return (self.bid_px[0] + self.ask_px[0]) / 2
+
+    def _side(self, is_buy: bool):
+        if is_buy:  # buys lift the asks
+            return self.ask_px, self.ask_cum_sz, self.ask_cum_notional
+        return self.bid_px, self.bid_cum_sz, self.bid_cum_notional
+
+    def fill_size(self, is_buy: bool, size: float) -> tuple[float, float]:
+        """Market order for ``size`` coins -> (avg price, size the visible book can fill)."""
+        px, cum_sz, cum_notional = self._side(is_buy)
+        if not len(px) or size <= 0:
+            return float("nan"), 0.0
+        k = int(np.searchsorted(cum_sz, size))
+        if k >= len(px):
+            return float(cum_notional[-1] / cum_sz[-1]), float(cum_sz[-1])
+        prev_sz = cum_sz[k - 1] if k else 0.0
+        prev_notional = cum_notional[k - 1] if k else 0.0
+        notional = prev_notional + (size - prev_sz) * px[k]
+        return float(notional / size), size
+
+    def fill_notional(self, is_buy: bool, notional: float) -> tuple[float, float]:
+        """Market order spending ``notional`` USD -> (avg price, size filled)."""
+        px, cum_sz, cum_notional = self._side(is_buy)
+        if not len(px) or notional <= 0:
+            return float("nan"), 0.0
+        k = int(np.searchsorted(cum_notional, notional))
+        if k >= len(px):
+            return float(cum_notional[-1] / cum_sz[-1]), float(cum_sz[-1])
+        prev_sz = cum_sz[k - 1] if k else 0.0
+        prev_notional = cum_notional[k - 1] if k else 0.0
+        size = prev_sz + (notional - prev_notional) / px[k]
+        return float(notional / size), float(size)
+
+    def max_notional(self, is_buy: bool, budget_bps: float) -> float:
+        """Largest market order (USD) whose average price stays within ``budget_bps`` of mid.
+
+        Capped at the visible depth; 0.0 when the side is empty.
+        """
+        px, cum_sz, cum_notional = self._side(is_buy)
+        if not len(px):
+            return 0.0
+        ref = self.mid() or float(px[0])
+        avg = self.ask_avg_px if is_buy else self.bid_avg_px
+        if is_buy:
+            limit = ref * (1 + budget_bps / 10_000)
+            k = int(np.searchsorted(avg, limit, side="right"))
+        else:
+            limit = ref * (1 - budget_bps / 10_000)
+            k = int(np.searchsorted(-avg, -limit, side="right"))
+        if k >= len(px):
+            return float(cum_notional[-1])
+        prev_sz = cum_sz[k - 1] if k else 0.0
+        prev_notional = cum_notional[k - 1] if k else 0.0
+        # Partial level k: (prev_notional + x * px[k]) / (prev_sz + x) == limit
+        x = max((limit * prev_sz - prev_notional) / (px[k] - limit), 0.0)
+        return float(prev_notional + x * px[k])
+
+
+def _cumulate(levels: list[tuple[float, float]]):
+    if not levels:
+        empty = np.empty(0)
+        return empty, empty, empty
+    arr = np.asarray(levels, dtype=np.float64)
+    px, sz = arr[:, 0].copy(), arr[:, 1]  # contiguous prices; the (n, 2) array is not kept
+    return px, np.cumsum(sz), np.cumsum(px * sz)
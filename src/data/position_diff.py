@@ -0,0 +1,300 @@
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Callable, NamedTuple
+
+import numpy as np
+
+from src.models import POSITION_DTYPE, Position, PositionBatch
+from src.utils.logger import setup_logger
+
+logger = setup_logger("position_diff")
+
+# Event kinds
+OPEN = "open"
+CLOSE = "close"
+INCREASE = "increase"
+REDUCE = "reduce"
+LEVERAGE = "leverage"
+LIQ_MOVED = "liq_moved"
+
+# Liquidation price moves smaller than this (% of old price) are not reported
+LIQ_MOVE_PCT = 0.1
+
+_NAN = float("nan")
+_MODES = {"cross": 1.0, "isolated": 0.0}
+_MODE_NAMES = {v: k for k, v in _MODES.items()}
+
+
+class PositionEvent(NamedTuple):
+    kind: str
+    wallet: str
+    coin: str
+    size: float
+    prev_size: float
+    leverage: float
+    liquidation_price: float | None
+    prev_liquidation_price: float | None
+
+
+def _liq(value) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _num(value, default: float) -> float:
+    return default if value is None else float(value)
+
+
+def _opt(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class PositionTable:
+    """Columnar store of the last known whale positions keyed by (wallet, coin).
+
+    Each field lives in its own float64 array; rows freed by closed positions
+    are reused. Per-wallet and per-coin row indexes keep lookups O(1).
+    ``stamps[row]`` changes whenever a row is written or freed, so derived
+    state (see ``MarginModel``) can tell which rows a scan refreshed.
+    """
+
+    FIELDS = ("size", "entry_price", "liquidation_price", "leverage", "margin_used", "unrealized_pnl")
+    # Margin inputs kept alongside (not part of POSITION_DTYPE): cross is 1/0, NaN when unknown
+    MARGIN_FIELDS = ("cross", "max_leverage")
+
+    def __init__(self):
+        self.columns: dict[str, array] = {f: array("d") for f in self.FIELDS + self.MARGIN_FIELDS}
+        self.stamps = array("q")
+        self._stamp = 0
+        self.wallets: list[str | None] = []
+        self.coins: list[str | None] = []
+        self._index: dict[tuple[str, str], int] = {}
+        self._by_wallet: dict[str, set[int]] = {}
+        self._by_coin: dict[str, set[int]] = {}
+        self._free: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def row(self, wallet: str, coin: str) -> int | None:
+        return self._index.get((wallet, coin))
+
+    def upsert(self, wallet: str, pos: Position | dict) -> int:
+        if not isinstance(pos, Position):
+            pos = Position.from_dict(pos)
+        coin = pos.coin
+        values = (
+            _num(pos.size, 0.0),
+            _num(pos.entry_price, 0.0),
+            _liq(pos.liquidation_price),
+            _num(pos.leverage, 1.0),
+            _num(pos.margin_used, 0.0),
+            _num(pos.unrealized_pnl, 0.0),
+            _MODES.get(pos.margin_mode, _NAN),
+            _liq(pos.max_leverage),
+        )
+        fields = self.FIELDS + self.MARGIN_FIELDS
+        self._stamp += 1
+        row = self._index.get((wallet, coin))
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self.wallets[row] = wallet
+                self.coins[row] = coin
+                for field, v in zip(fields, values):
+                    self.columns[field][row] = v
+                self.stamps[row] = self._stamp
+            else:
+                row = len(self.wallets)
+                self.wallets.append(wallet)
+                self.coins.append(coin)
+                for field, v in zip(fields, values):
+                    self.columns[field].append(v)
+                self.stamps.append(self._stamp)
+            self._index[(wallet, coin)] = row
+            self._by_wallet.setdefault(wallet, set()).add(row)
+            self._by_coin.setdefault(coin, set()).add(row)
+        else:
+            for field, v in zip(fields, values):
+                self.columns[field][row] = v
+            self.stamps[row] = self._stamp
+        return row
+
+    def remove(self, wallet: str, coin: str):
+        row = self._index.pop((wallet, coin), None)
+        if row is None:
+            return
+        self._by_wallet[wallet].discard(row)
+        if not self._by_wallet[wallet]:
+            del self._by_wallet[wallet]
+        self._by_coin[coin].discard(row)
+        if not self._by_coin[coin]:
+            del self._by_coin[coin]
+        self.wallets[row] = None
+        self.coins[row] = None
+        self._stamp += 1
+        self.stamps[row] = self._stamp
+        self._free.append(row)
+
+    def wallet_coins(self, wallet: str) -> list[str]:
+        return [self.coins[r] for r in self._by_wallet.get(wallet, ())]
+
+    def tracked_wallets(self) -> list[str]:
+        return list(self._by_wallet)
+
+    def get(self, wallet: str, coin: str) -> Position | None:
+        row = self._index.get((wallet, coin))
+        return None if row is None else self._record(row)
+
+    def _record(self, row: int) -> Position:
+        cols = self.columns
+        return Position(
+            coin=self.coins[row],
+            wallet=self.wallets[row],
+            size=cols["size"][row],
+            entry_price=cols["entry_price"][row],
+            liquidation_price=_opt(cols["liquidation_price"][row]),
+            leverage=cols["leverage"][row],
+            margin_used=cols["margin_used"][row],
+            unrealized_pnl=cols["unrealized_pnl"][row],
+            margin_mode=_MODE_NAMES.get(cols["cross"][row]),
+            max_leverage=_opt(cols["max_leverage"][row]),
+        )
+
+    def positions_for_coin(self, coin: str) -> list[Position]:
+        return [self._record(r) for r in sorted(self._by_coin.get(coin, ()))]
+
+    def batch_for_coin(self, coin: str) -> PositionBatch:
+        """Gather a coin's rows into a structured PositionBatch without per-row objects."""
+        rows = np.fromiter(sorted(self._by_coin.get(coin, ())), dtype=np.intp)
+        data = np.empty(len(rows), dtype=POSITION_DTYPE)
+        for field in self.FIELDS:
+            data[field] = np.frombuffer(self.columns[field], dtype=np.float64)[rows]
+        return PositionBatch(coin, data, [self.wallets[r] for r in rows])
+
+    def positions_by_coin(self, coins: list[str]) -> "CoinPositions":
+        """Same shape as ``scan_whale_wallets`` output, materialized per coin on access."""
+        return CoinPositions(self, coins)
+
+
+class CoinPositions(Mapping):
+    """Lazy {coin: PositionBatch} view over a PositionTable."""
+
+    def __init__(self, table: PositionTable, coins: list[str]):
+        self._table = table
+        self._coins = coins
+        self._coin_set = set(coins)
+
+    def __getitem__(self, coin: str) -> PositionBatch:
+        if coin not in self._coin_set:
+            raise KeyError(coin)
+        return self._table.batch_for_coin(coin)
+
+    def __iter__(self):
+        return iter(self._coins)
+
+    def __len__(self) -> int:
+        return len(self._coins)
+
+
+class PositionDiffEngine:
+    """Diffs each wallet's fresh positions against the last known state.
+
+    ``apply`` updates the PositionTable and emits compact PositionEvents
+    (open, close, increase, reduce, leverage change, liquidation price moved)
+    to every subscriber, so downstream stages can recompute only the coins
+    that actually changed.
+    """
+
+    def __init__(self, liq_move_pct: float = LIQ_MOVE_PCT):
+        self.table = PositionTable()
+        self.liq_move_pct = liq_move_pct
+        self._subscribers: list[Callable[[list[PositionEvent]], None]] = []
+
+    def subscribe(self, callback: Callable[[list[PositionEvent]], None]):
+        self._subscribers.append(callback)
+
+    def _publish(self, events: list[PositionEvent]):
+        if not events:
+            return
+        for callback in self._subscribers:
+            try:
+                callback(events)
+            except Exception as e:
+                logger.warning("Position event subscriber failed: %s", e, exc_info=True)
+
+    def apply(self, wallet: str, positions: list[Position]) -> list[PositionEvent]:
+        """Diff a wallet's complete current position list (records or plain dicts) against the table."""
+        table = self.table
+        cols = table.columns
+        events = []
+        seen = set()
+
+        for pos in positions:
+            if not isinstance(pos, Position):
+                pos = Position.from_dict(pos)
+            coin = pos.coin
+            seen.add(coin)
+            size = _num(pos.size, 0.0)
+            leverage = _num(pos.leverage, 1.0)
+            liq = pos.liquidation_price
+            row = table.row(wallet, coin)
+
+            if row is None:
+                events.append(PositionEvent(OPEN, wallet, coin, size, 0.0, leverage, liq, None))
+                table.upsert(wallet, pos)
+                continue
+
+            prev_size = cols["size"][row]
+            prev_lev = cols["leverage"][row]
+            prev_liq = _opt(cols["liquidation_price"][row])
+
+            if (prev_size > 0) != (size > 0):
+                # Flipped sides: the old position closed and a new one opened
+                events.append(PositionEvent(CLOSE, wallet, coin, 0.0, prev_size, prev_lev, None, prev_liq))
+                events.append(PositionEvent(OPEN, wallet, coin, size, 0.0, leverage, liq, None))
+            else:
+                if abs(size) > abs(prev_size):
+                    events.append(PositionEvent(INCREASE, wallet, coin, size, prev_size, leverage, liq, prev_liq))
+                elif abs(size) < abs(prev_size):
+                    events.append(PositionEvent(REDUCE, wallet, coin, size, prev_size, leverage, liq, prev_liq))
+                if leverage != prev_lev:
+                    events.append(PositionEvent(LEVERAGE, wallet, coin, size, prev_size, leverage, liq, prev_liq))
+                if self._liq_moved(prev_liq, liq):
+                    events.append(PositionEvent(LIQ_MOVED, wallet, coin, size, prev_size, leverage, liq, prev_liq))
+            table.upsert(wallet, pos)
+
+        for coin in table.wallet_coins(wallet):
+            if coin not in seen:
+                events.extend(self._close(wallet, coin))
+
+        self._publish(events)
+        return events
+
+    def prune(self, wallets: list[str]) -> list[PositionEvent]:
+        """Drop wallets that are no longer tracked, emitting close events for their positions."""
+        keep = set(wallets)
+        events = []
+        for wallet in self.table.tracked_wallets():
+            if wallet not in keep:
+                for coin in self.table.wallet_coins(wallet):
+                    events.extend(self._close(wallet, coin))
+        self._publish(events)
+        return events
+
+    def _close(self, wallet: str, coin: str) -> list[PositionEvent]:
+        row = self.table.row(wallet, coin)
+        cols = self.table.columns
+        event = PositionEvent(
+            CLOSE, wallet, coin, 0.0, cols["size"][row], cols["leverage"][row],
+            None, _opt(cols["liquidation_price"][row]),
+        )
+        self.table.remove(wallet, coin)
+        return [event]
+
+    def _liq_moved(self, prev: float | None, new: float | None) -> bool:
+        if prev is None or new is None:
+            return prev is not new
+        if prev == 0:
+            return new != 0
+        return abs(new - prev) / prev * 100 >= self.liq_move_pct
@@ -1,12 +1,13 @@
+from src.models import Position
 from src.utils.logger import setup_logger
 
 logger = setup_logger("positions")
 
 
-def fetch_positions(client, wallet: str) -> list[dict]:
+def fetch_positions(client, wallet: str) -> list[Position]:
     """Fetch all open positions for a wallet.
 
-    Returns list of:
+    Returns list of Position records:
     {
         "coin": str,
         "size": float (positive=long, negative=short),
@@ -14,7 +15,10 @@ def fetch_positions(client, wallet: str) -> list[dict]:
         "liquidation_price": float | None,
         "leverage": float,
         "unrealized_pnl": float,
-        "margin_used": float
+        "margin_used": float,
+        "wallet": str,
+        "margin_mode": "cross" | "isolated" | None,
+        "max_leverage": float | None
     }
     """
     state = client.get_clearinghouse_state(wallet)
@@ -31,16 +35,21 @@ def fetch_positions(client, wallet: str) -> list[dict]:
         liq_price = float(liq_px) if liq_px else None
         leverage_info = p.get("leverage", {})
         leverage = float(leverage_info.get("value", 1)) if isinstance(leverage_info, dict) else 1.0
-
-        positions.append({
-            "coin": p.get("coin", ""),
-            "size": size,
-            "entry_price": entry,
-            "liquidation_price": liq_price,
-            "leverage": leverage,
-            "unrealized_pnl": float(p.get("unrealizedPnl", 0)),
-            "margin_used": float(p.get("marginUsed", 0)),
-        })
-
-    logger.debug(f"Wallet {wallet[:10]}...: {len(positions)} positions")
+        margin_mode = leverage_info.get("type") if isinstance(leverage_info, dict) else None
+        max_leverage = p.get("maxLeverage")
+
+        positions.append(Position(
+            coin=p.get("coin", ""),
+            size=size,
+            entry_price=entry,
+            liquidation_price=liq_price,
+            leverage=leverage,
+            unrealized_pnl=float(p.get("unrealizedPnl", 0)),
+            margin_used=float(p.get("marginUsed", 0)),
+            wallet=wallet,
+            margin_mode=margin_mode,
+            max_leverage=float(max_leverage) if max_leverage else None,
+        ))
+
+    logger.debug("Wallet %s...: %d positions", wallet[:10], len(positions))
     return positions
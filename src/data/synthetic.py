@@ -0,0 +1,389 @@
+"""Seeded synthetic market + whale population in Hyperliquid /info response shapes.
+
+For load testing without touching the live API::
+
+    market = SyntheticMarket(n_wallets=100_000, seed=1)
+    client = SyntheticClient(market)          # drop-in HyperliquidClient
+    market.inject_cascade("ETH", drop_pct=8, duration_seconds=600)
+    market.advance(900)
+
+Wallet positions are never stored: each wallet's book is regenerated from
+``(seed, wallet index)`` on request, so a million-position population costs
+only the per-coin market state. Positions whose liquidation price the coin
+has traded through since the start are dropped (liquidated), which is what
+makes injected cascades visible to the whale scan. ``info(payload)`` answers
+the /info request types the bot uses and is what the local server serves.
+"""
+import hashlib
+import math
+import random
+
+import numpy as np
+
+from src.data.hyperliquid_client import HyperliquidClient
+from src.utils.logger import setup_logger
+
+logger = setup_logger("synthetic")
+
+DEFAULT_COINS = {
+    # coin: (start price, hourly vol, szDecimals, max leverage)
+    "BTC": (100_000.0, 0.006, 5, 40),
+    "ETH": (3_000.0, 0.008, 4, 25),
+    "SOL": (150.0, 0.012, 2, 20),
+    "HYPE": (25.0, 0.015, 2, 10),
+    "DOGE": (0.15, 0.014, 0, 10),
+}
+
+LEVERAGES = (1, 2, 3, 5, 10, 20, 25, 40, 50)
+LEVERAGE_WEIGHTS = (3, 4, 6, 10, 14, 10, 6, 3, 1)
+
+
+def _px(x: float) -> str:
+    """Hyperliquid-style price string: 5 significant figures, no trailing zeros."""
+    if x <= 0:
+        return "0"
+    decimals = max(0, 4 - int(math.floor(math.log10(x))))
+    return f"{x:.{decimals}f}".rstrip("0").rstrip(".") if decimals else f"{round(x):d}"
+
+
+def _sz(x: float, decimals: int) -> str:
+    return f"{x:.{decimals}f}" if decimals else f"{round(x):d}"
+
+
+class SyntheticMarket:
+    def __init__(self, coins: dict | list | int | None = None, n_wallets: int = 1000, seed: int = 0,
+                 start: float = 1_700_000_000.0, max_positions_per_wallet: int = 4, book_levels: int = 20,
+                 trigger_prob: float = 0.3):
+        self.coins = self._coin_specs(coins, seed)
+        self.names = list(self.coins)
+        self.n_wallets = n_wallets
+        self.seed = seed
+        self.start = start
+        self.now = start
+        self.max_positions_per_wallet = max_positions_per_wallet
+        self.book_levels = book_levels
+        self.trigger_prob = trigger_prob
+
+        self.initial = np.array([self.coins[c][0] for c in self.names])
+        self.vol = np.array([self.coins[c][1] for c in self.names]) / math.sqrt(3600)  # per second
+        self.price = self.initial.copy()
+        self.low = self.initial.copy()
+        self.high = self.initial.copy()
+        self.funding = np.full(len(self.names), 0.0000125)  # 0.01%/8h baseline, hourly
+        rng = np.random.default_rng(seed)
+        self.open_interest = self.initial ** -1 * rng.uniform(5e7, 5e8, len(self.names))  # coin units
+        self._rng = rng
+        self._cascades: list[dict] = []
+        self._index = {c: i for i, c in enumerate(self.names)}
+
+    @staticmethod
+    def _coin_specs(coins, seed: int) -> dict:
+        if coins is None:
+            return dict(DEFAULT_COINS)
+        if isinstance(coins, dict):
+            return coins
+        if isinstance(coins, int):
+            coins = list(DEFAULT_COINS)[:coins] + [f"SYN{i}" for i in range(max(0, coins - len(DEFAULT_COINS)))]
+        rng = random.Random(f"{seed}:coins")
+        return {
+            c: DEFAULT_COINS.get(c) or (10 ** rng.uniform(-2, 3), rng.uniform(0.008, 0.03), rng.choice((0, 1, 2)),
+                                        rng.choice((3, 5, 10, 20)))
+            for c in coins
+        }
+
+    # --- time evolution ---
+
+    def inject_cascade(self, coin: str, drop_pct: float, duration_seconds: float = 600, start: float | None = None):
+        """Force ``coin`` down ``drop_pct``% (negative = squeeze up) over the window.
+
+        Crossed liquidation prices drop out of the whale population, OI is
+        flushed in proportion to the move and funding flips against the
+        liquidated side.
+        """
+        start = self.now if start is None else start
+        self._cascades.append({
+            "i": self._index[coin], "start": start, "end": start + duration_seconds,
+            "drift": math.log(1 - drop_pct / 100) / duration_seconds,
+        })
+        logger.info("Cascade scheduled: %s %+.1f%% over %ss", coin, -drop_pct, duration_seconds)
+
+    def advance(self, seconds: float, step: float = 1.0):
+        """Evolve prices, funding and OI by ``seconds`` in ``step``-second increments."""
+        n = max(1, int(round(seconds / step)))
+        for _ in range(n):
+            drift = np.zeros(len(self.names))
+            for c in self._cascades:
+                if c["start"] <= self.now < c["end"]:
+                    drift[c["i"]] += c["drift"]
+            shock = self._rng.standard_normal(len(self.names)) * self.vol * math.sqrt(step)
+            move = drift * step + shock
+            self.price *= np.exp(move)
+            np.minimum(self.low, self.price, out=self.low)
+            np.maximum(self.high, self.price, out=self.high)
+            # Funding mean-reverts to baseline and leans against forced flows
+            self.funding += (0.0000125 - self.funding) * min(1.0, step / 3600) + drift * step * 0.02
+            self.open_interest *= np.exp(-3 * np.abs(drift) * step + self._rng.standard_normal(len(self.names))
+                                         * 0.0002 * math.sqrt(step))
+            self.now += step
+        self._cascades = [c for c in self._cascades if c["end"] > self.now]
+
+    # --- whale population ---
+
+    def wallet(self, i: int) -> str:
+        # Hash prefix looks like a real address; the index suffix makes lookups O(1)
+        return "0x" + hashlib.sha256(f"{self.seed}:{i}".encode()).hexdigest()[:24] + f"{i:016x}"
+
+    def wallets(self):
+        for i in range(self.n_wallets):
+            yield self.wallet(i)
+
+    def _wallet_index(self, user: str) -> int | None:
+        try:
+            i = int(user[-16:], 16)
+        except (TypeError, ValueError):
+            return None
+        return i if i < self.n_wallets and self.wallet(i) == user.lower() else None
+
+    def _raw_positions(self, i: int) -> list[dict]:
+        """Positions of wallet ``i`` as opened at the start (before liquidations)."""
+        rng = random.Random(f"{self.seed}:w{i}")
+        n = rng.randint(1, self.max_positions_per_wallet)
+        whale = rng.paretovariate(1.3)  # heavy-tailed account size
+        out = []
+        for coin in rng.sample(self.names, min(n, len(self.names))):
+            p0, _, sz_dec, max_lev = self.coins[coin]
+            lev = min(rng.choices(LEVERAGES, LEVERAGE_WEIGHTS)[0], max_lev)
+            cross = rng.random() < 0.6
+            entry = p0 * math.exp(rng.gauss(0, 0.02))
+            notional = 20_000 * whale * rng.lognormvariate(0, 1)
+            long = rng.random() < 0.5
+            mmr = 0.5 / max_lev
+            # Cross positions draw on account equity beyond their own margin
+            buffer = (1 / lev - mmr) * (rng.uniform(1.0, 3.0) if cross else 1.0)
+            buffer = min(buffer, 0.95)
+            liq = entry * (1 - buffer) if long else entry * (1 + buffer)
+            size = round(notional / entry, sz_dec) or 10 ** -sz_dec
+            out.append({
+                "coin": coin, "szi": size if long else -size, "entry": entry, "liq": liq,
+                "lev": lev, "cross": cross, "sz_dec": sz_dec, "max_lev": max_lev, "tp": rng.random(),
+            })
+        return out
+
+    def _alive(self, pos: dict) -> bool:
+        i = self._index[pos["coin"]]
+        return self.low[i] > pos["liq"] if pos["szi"] > 0 else self.high[i] < pos["liq"]
+
+    def _position(self, pos: dict) -> dict:
+        mark = float(self.price[self._index[pos["coin"]]])
+        size = pos["szi"]
+        value = abs(size) * mark
+        upnl = size * (mark - pos["entry"])
+        margin = value / pos["lev"]
+        return {
+            "type": "oneWay",
+            "position": {
+                "coin": pos["coin"],
+                "szi": _sz(size, pos["sz_dec"]),
+                "entryPx": _px(pos["entry"]),
+                "positionValue": f"{value:.2f}",
+                "unrealizedPnl": f"{upnl:.2f}",
+                "returnOnEquity": f"{upnl / margin if margin else 0:.6f}",
+                "liquidationPx": _px(pos["liq"]),
+                "leverage": {"type": "cross" if pos["cross"] else "isolated", "value": pos["lev"]},
+                "marginUsed": f"{margin:.2f}",
+                "maxLeverage": pos["max_lev"],
+                "cumFunding": {"allTime": "0.0", "sinceOpen": "0.0", "sinceChange": "0.0"},
+            },
+        }
+
+    def positions(self, i: int) -> list[dict]:
+        """Open positions of wallet ``i`` in ``assetPositions`` shape."""
+        return [self._position(p) for p in self._raw_positions(i) if self._alive(p)]
+
+    def iter_positions(self, coin: str | None = None):
+        """Stream (wallet, assetPosition) over the whole population without materializing it."""
+        for i in range(self.n_wallets):
+            wallet = self.wallet(i)
+            for p in self._raw_positions(i):
+                if (coin is None or p["coin"] == coin) and self._alive(p):
+                    yield wallet, self._position(p)
+
+    # --- /info responses ---
+
+    def clearinghouse_state(self, user: str) -> dict:
+        i = self._wallet_index(user)
+        positions = self.positions(i) if i is not None else []
+        ntl = sum(float(p["position"]["positionValue"]) for p in positions)
+        margin = sum(float(p["position"]["marginUsed"]) for p in positions)
+        upnl = sum(float(p["position"]["unrealizedPnl"]) for p in positions)
+        value = max(margin * 1.5 + upnl, 0.0)
+        summary = {"accountValue": f"{value:.2f}", "totalNtlPos": f"{ntl:.2f}",
+                   "totalRawUsd": f"{value - upnl:.2f}", "totalMarginUsed": f"{margin:.2f}"}
+        return {
+            "assetPositions": positions,
+            "marginSummary": summary,
+            "crossMarginSummary": summary,
+            "crossMaintenanceMarginUsed": f"{margin * 0.25:.2f}",
+            "withdrawable": f"{max(value - margin, 0.0):.2f}",
+            "time": int(self.now * 1000),
+        }
+
+    def open_orders(self, user: str) -> list[dict]:
+        """TP/SL trigger orders resting on a share of the wallet's positions."""
+        i = self._wallet_index(user)
+        if i is None:
+            return []
+        out = []
+        for n, p in enumerate(self._raw_positions(i)):
+            if p["tp"] >= self.trigger_prob or not self._alive(p):
+                continue
+            long = p["szi"] > 0
+            size = _sz(abs(p["szi"]), p["sz_dec"])
+            close_side = "A" if long else "B"
+            # Stop between entry and liquidation; take profit symmetric on the other side
+            stop = p["entry"] + (p["liq"] - p["entry"]) * 0.6
+            take = p["entry"] - (p["liq"] - p["entry"]) * 0.8
+            for k, (kind, trigger, above) in enumerate((("Stop Market", stop, not long),
+                                                        ("Take Profit Market", take, long))):
+                out.append({
+                    "coin": p["coin"], "side": close_side, "limitPx": _px(trigger), "sz": size, "origSz": size,
+                    "oid": i * 100 + n * 2 + k, "timestamp": int(self.start * 1000),
+                    "triggerCondition": f"Price {'above' if above else 'below'} {_px(trigger)}",
+                    "isTrigger": True, "triggerPx": _px(trigger), "orderType": kind,
+                    "reduceOnly": True, "isPositionTpsl": True, "tif": None, "children": [],
+                })
+        return out
+
+    def all_mids(self) -> dict[str, str]:
+        return {c: _px(float(p)) for c, p in zip(self.names, self.price)}
+
+    def meta(self) -> dict:
+        return {"universe": [{"name": c, "szDecimals": self.coins[c][2], "maxLeverage": self.coins[c][3]}
+                             for c in self.names]}
+
+    def meta_and_contexts(self) -> list:
+        ctxs = []
+        for i, c in enumerate(self.names):
+            px = float(self.price[i])
+            ctxs.append({
+                "funding": f"{self.funding[i]:.8f}",
+                "openInterest": _sz(float(self.open_interest[i]), self.coins[c][2]),
+                "prevDayPx": _px(float(self.initial[i])),
+                "dayNtlVlm": f"{float(self.open_interest[i]) * px * 2:.2f}",
+                "premium": f"{self.funding[i] * 8:.6f}",
+                "oraclePx": _px(px), "markPx": _px(px), "midPx": _px(px),
+                "impactPxs": [_px(px * 0.9998), _px(px * 1.0002)],
+            })
+        return [self.meta(), ctxs]
+
+    def l2_book(self, coin: str, levels: int | None = None) -> dict:
+        i = self._index[coin]
+        mid = float(self.price[i])
+        levels = levels or self.book_levels
+        rng = np.random.default_rng([self.seed, i, int(self.now)])
+        tick = mid * 0.0001
+        depth_usd = float(self.open_interest[i]) * mid * 0.0005
+        sizes = rng.exponential(1.0, (2, levels)) * depth_usd / levels / mid
+        walls = rng.random((2, levels)) < 0.03
+        sizes[walls] *= 20
+        counts = rng.integers(1, 12, (2, levels))
+        sz_dec = self.coins[coin][2]
+        book = []
+        for side, sign in ((0, -1), (1, 1)):
+            book.append([
+                {"px": _px(mid + sign * tick * (k + 0.5)), "sz": _sz(max(float(sizes[side, k]), 10 ** -sz_dec), sz_dec),
+                 "n": int(counts[side, k])}
+                for k in range(levels)
+            ])
+        return {"coin": coin, "time": int(self.now * 1000), "levels": book}
+
+    def candles(self, coin: str, interval: str, start_ms: int, end_ms: int) -> list[dict]:
+        """Hourly-vol-consistent OHLC bars ending at the current price (``interval`` "1h" only)."""
+        step = 3600_000
+        t_end = min(end_ms, int(self.now * 1000))
+        n = min(max(0, (t_end - start_ms) // step), 5000)  # the API's per-request cap
+        rng = random.Random(f"{self.seed}:c{coin}:{t_end // step}")
+        hourly = self.coins[coin][1]
+        # Walk back from the current price, then emit bars oldest first
+        closes = [float(self.price[self._index[coin]])]
+        for _ in range(n):
+            closes.append(closes[-1] / math.exp(rng.gauss(0, hourly)))
+        closes.reverse()
+        out = []
+        for k in range(n):
+            open_, close = closes[k], closes[k + 1]
+            hi = max(open_, close) * (1 + abs(rng.gauss(0, hourly / 2)))
+            lo = min(open_, close) * (1 - abs(rng.gauss(0, hourly / 2)))
+            t = t_end - (n - k) * step
+            out.append({"t": t, "T": t + step - 1, "s": coin, "i": interval, "o": _px(open_), "c": _px(close),
+                        "h": _px(hi), "l": _px(lo), "v": "0", "n": 0})
+        return out
+
+    def user_funding(self, user: str, start_ms: int) -> list[dict]:
+        i = self._wallet_index(user)
+        if i is None:
+            return []
+        out = []
+        hour = 3600_000
+        first = max(start_ms, int(self.start * 1000)) // hour * hour + hour
+        for t in range(first, int(self.now * 1000) + 1, hour):
+            for p in self._raw_positions(i):
+                if not self._alive(p):
+                    continue
+                rate = float(self.funding[self._index[p["coin"]]])
+                out.append({"time": t, "hash": "0x" + "0" * 64, "delta": {
+                    "type": "funding", "coin": p["coin"], "usdc": f"{-p['szi'] * p['entry'] * rate:.6f}",
+                    "szi": _sz(p["szi"], p["sz_dec"]), "fundingRate": f"{rate:.8f}",
+                }})
+        return out
+
+    def user_fills(self, user: str, start_ms: int) -> list[dict]:
+        """The opening fill of each of wallet ``user``'s positions (all opened at the start)."""
+        i = self._wallet_index(user)
+        t = int(self.start * 1000)
+        if i is None or t < start_ms:
+            return []
+        out = []
+        for n, p in enumerate(self._raw_positions(i)):
+            long = p["szi"] > 0
+            out.append({
+                "coin": p["coin"], "px": _px(p["entry"]), "sz": _sz(abs(p["szi"]), p["sz_dec"]),
+                "side": "B" if long else "A", "time": t, "dir": "Open Long" if long else "Open Short",
+                "closedPnl": "0.0", "fee": f"{abs(p['szi']) * p['entry'] * 0.00035:.6f}", "tid": i * 100 + n + 1,
+            })
+        return out
+
+    def info(self, payload: dict):
+        """Answer one /info request body."""
+        kind = payload.get("type")
+        if kind == "allMids":
+            return self.all_mids()
+        if kind == "meta":
+            return self.meta()
+        if kind == "metaAndAssetCtxs":
+            return self.meta_and_contexts()
+        if kind == "l2Book":
+            return self.l2_book(payload["coin"])
+        if kind == "clearinghouseState":
+            return self.clearinghouse_state(payload["user"])
+        if kind in ("frontendOpenOrders", "openOrders"):
+            return self.open_orders(payload["user"])
+        if kind == "candleSnapshot":
+            req = payload["req"]
+            return self.candles(req["coin"], req.get("interval", "1h"), req["startTime"], req["endTime"])
+        if kind == "userFunding":
+            return self.user_funding(payload["user"], payload.get("startTime", 0))
+        if kind == "userFillsByTime":
+            return self.user_fills(payload["user"], payload.get("startTime", 0))
+        raise ValueError(f"Unsupported info type: {kind}")
+
+
+class SyntheticClient(HyperliquidClient):
+    """HyperliquidClient answering from a SyntheticMarket instead of the network."""
+
+    def __init__(self, market: SyntheticMarket):
+        super().__init__(url="synthetic://info")
+        self.market = market
+
+    def _post(self, payload: dict):
+        return self.market.info(payload)
@@ -0,0 +1,141 @@
+"""Public trades: Hyperliquid's WebSocket ``trades`` channel or a replay file.
+
+Both sources call ``on_trades(list[TradePrint])`` from a background thread.
+Replay files are JSON lines (optionally gzipped) of trades in the exchange's
+own shape, one per line or one ``data`` batch per line::
+
+    {"coin": "BTC", "side": "A", "px": "97012.0", "sz": "0.41", "time": 1700000000123}
+
+``websocket-client`` is an optional dependency, only needed for the live stream.
+"""
+import gzip
+import json
+import threading
+import time
+from typing import Callable, NamedTuple
+
+try:
+    import websocket
+except ImportError:  # pragma: no cover - exercised only without the streaming extra
+    websocket = None
+
+from src.utils.logger import setup_logger
+
+logger = setup_logger("trades_feed")
+
+WS_URL = "wss://api.hyperliquid.xyz/ws"
+
+
+class TradePrint(NamedTuple):
+    coin: str
+    time: float  # seconds
+    price: float
+    size: float
+    is_buy: bool  # taker side
+
+
+def parse_trades(data) -> list[TradePrint]:
+    """TradePrints from one exchange trade dict or a list of them."""
+    if isinstance(data, dict):
+        data = [data]
+    return [
+        TradePrint(t["coin"], t["time"] / 1000, float(t["px"]), float(t["sz"]), t["side"] == "B")
+        for t in data
+    ]
+
+
+def read_trades(path: str):
+    """Yield TradePrints from a replay file in order."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                msg = json.loads(line)
+                yield from parse_trades(msg.get("data", msg) if isinstance(msg, dict) else msg)
+
+
+class TradesStream:
+    """Subscribes to ``trades`` for each coin; reconnects after ``reconnect_seconds``."""
+
+    def __init__(self, coins: list[str], on_trades: Callable[[list[TradePrint]], None], url: str = WS_URL,
+                 reconnect_seconds: float = 5.0):
+        if websocket is None:
+            raise RuntimeError("Trades stream requires websocket-client (pip install websocket-client)")
+        self.coins = coins
+        self.on_trades = on_trades
+        self.url = url
+        self.reconnect_seconds = reconnect_seconds
+        self._app = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _on_open(self, app):
+        for coin in self.coins:
+            app.send(json.dumps({"method": "subscribe", "subscription": {"type": "trades", "coin": coin}}))
+        logger.info("Trades stream connected (%d coins)", len(self.coins))
+
+    def _on_message(self, app, message: str):
+        try:
+            msg = json.loads(message)
+            if msg.get("channel") == "trades":
+                self.on_trades(parse_trades(msg["data"]))
+        except Exception as e:
+            logger.warning("Bad trades message: %s", e)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._app = websocket.WebSocketApp(self.url, on_open=self._on_open, on_message=self._on_message)
+            self._app.run_forever(ping_interval=30, ping_timeout=10)
+            if not self._stop.is_set():
+                logger.warning("Trades stream disconnected, reconnecting in %ss", self.reconnect_seconds)
+                self._stop.wait(self.reconnect_seconds)
+
+    def start(self) -> "TradesStream":
+        self._thread = threading.Thread(target=self._run, name="trades-stream", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._app is not None:
+            self._app.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class ReplayStream:
+    """Plays a replay file through ``on_trades`` at ``speed`` x the recorded pace (0 = as fast as possible)."""
+
+    def __init__(self, path: str, on_trades: Callable[[list[TradePrint]], None], speed: float = 1.0):
+        self.path = path
+        self.on_trades = on_trades
+        self.speed = speed
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def run(self):
+        started = first = None
+        count = 0
+        for trade in read_trades(self.path):
+            if self._stop.is_set():
+                break
+            if self.speed > 0:
+                if first is None:
+                    started, first = time.monotonic(), trade.time
+                delay = (trade.time - first) / self.speed - (time.monotonic() - started)
+                if delay > 0 and self._stop.wait(delay):
+                    break
+            self.on_trades([trade])
+            count += 1
+        logger.info("Trades replay finished (%d trades)", count)
+
+    def start(self) -> "ReplayStream":
+        self._thread = threading.Thread(target=self.run, name="trades-replay", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
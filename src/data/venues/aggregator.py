@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from src.data.hyperliquid_client import HyperliquidClient
+from src.data.venues.base import ExchangeAdapter, VenueSnapshot
+from src.data.venues.binance import BinanceAdapter
+from src.data.venues.dydx import DydxAdapter
+from src.data.venues.hyperliquid import HyperliquidAdapter
+from src.utils.logger import setup_logger
+
+logger = setup_logger("venues")
+
+ADAPTERS = {
+    "hyperliquid": HyperliquidAdapter,
+    "binance": BinanceAdapter,
+    "dydx": DydxAdapter,
+}
+
+
+def create_adapters(names: list[str], client: HyperliquidClient = None) -> list[ExchangeAdapter]:
+    adapters = []
+    for name in names:
+        if name not in ADAPTERS:
+            raise ValueError(f"Unknown venue '{name}' (known: {', '.join(ADAPTERS)})")
+        adapters.append(HyperliquidAdapter(client) if name == "hyperliquid" else ADAPTERS[name]())
+    return adapters
+
+
+class VenueAggregator:
+    """Fetches every venue's snapshot concurrently, so a cycle waits for the
+    slowest venue rather than the sum of all of them. A venue that errors or
+    misses ``timeout`` is left out of that cycle."""
+
+    def __init__(self, adapters: list[ExchangeAdapter], timeout: float = 10):
+        self.adapters = adapters
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(len(adapters), 1), thread_name_prefix="venue")
+
+    def fetch(self, coins: list[str]) -> dict[str, VenueSnapshot]:
+        now = time.time()
+        futures = {self._pool.submit(a.snapshot, coins, now): a.name for a in self.adapters}
+        done, pending = wait(futures, timeout=self.timeout)
+        snapshots = {}
+        for future in done:
+            name = futures[future]
+            try:
+                snapshots[name] = future.result()
+            except Exception as e:
+                logger.warning("Venue %s fetch failed: %s", name, e)
+        for future in pending:
+            logger.warning("Venue %s timed out after %ss", futures[future], self.timeout)
+        return snapshots
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def aggregate_funding(snapshots: dict[str, VenueSnapshot]) -> dict[str, float]:
+    """OI-weighted hourly funding per coin across venues (plain mean where OI is unknown)."""
+    sums: dict[str, list[float]] = {}  # coin -> [weighted_sum, weight, plain_sum, n]
+    for snap in snapshots.values():
+        for coin, rate in snap.funding.items():
+            acc = sums.setdefault(coin, [0.0, 0.0, 0.0, 0])
+            weight = snap.open_interest_usd.get(coin, 0.0)
+            acc[0] += rate * weight
+            acc[1] += weight
+            acc[2] += rate
+            acc[3] += 1
+    return {
+        coin: (w_sum / weight if weight > 0 else plain / n)
+        for coin, (w_sum, weight, plain, n) in sums.items()
+    }
+
+
+def aggregate_open_interest(snapshots: dict[str, VenueSnapshot]) -> dict[str, float]:
+    """Total open interest per coin across venues, in USD."""
+    total: dict[str, float] = {}
+    for snap in snapshots.values():
+        for coin, oi in snap.open_interest_usd.items():
+            total[coin] = total.get(coin, 0.0) + oi
+    return total
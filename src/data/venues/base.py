@@ -0,0 +1,82 @@
+import time
+from abc import ABC, abstractmethod
+
+import requests
+
+from src.utils import metrics
+
+
+class VenueSnapshot:
+    """Per-venue market data for one cycle, in normalized units.
+
+    funding: rate per hour (fraction, e.g. 0.0001 = 0.01%/h)
+    open_interest_usd: open interest notional in USD
+    """
+
+    __slots__ = ("venue", "mids", "funding", "open_interest_usd", "fetched_at")
+
+    def __init__(self, venue: str, mids: dict[str, float], funding: dict[str, float],
+                 open_interest_usd: dict[str, float], fetched_at: float):
+        self.venue = venue
+        self.mids = mids
+        self.funding = funding
+        self.open_interest_usd = open_interest_usd
+        self.fetched_at = fetched_at
+
+
+class ExchangeAdapter(ABC):
+    """Normalized read-only market data for one perps venue.
+
+    Coins are always Hyperliquid-style tickers ("BTC", "ETH"); each adapter
+    maps them to its own symbols. Coins a venue does not list are omitted
+    from the results rather than raising.
+    """
+
+    name: str = ""
+    timeout: float = 10
+
+    def __init__(self, base_url: str, session: requests.Session = None):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+
+    def _get(self, path: str, params: dict = None):
+        started = time.perf_counter()
+        ok, size = False, 0
+        try:
+            resp = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+            size = len(resp.content)
+            resp.raise_for_status()
+            ok = True
+            return resp.json()
+        finally:
+            metrics.observe_request(self.name, path, time.perf_counter() - started, size, ok)
+
+    @abstractmethod
+    def get_mids(self, coins: list[str]) -> dict[str, float]:
+        """Return {coin: mid/mark price}."""
+
+    @abstractmethod
+    def get_funding(self, coins: list[str]) -> dict[str, float]:
+        """Return {coin: funding rate per hour}."""
+
+    @abstractmethod
+    def get_open_interest(self, coins: list[str]) -> dict[str, float]:
+        """Return {coin: open interest in USD}."""
+
+    @abstractmethod
+    def get_book(self, coin: str) -> dict:
+        """Return {"bids": [(price, size)], "asks": [(price, size)]}, best level first."""
+
+    def get_liquidations(self, coins: list[str]) -> list[dict]:
+        """Return recent liquidations where the venue exposes them publicly.
+
+        Each entry: {"venue", "coin", "side", "price", "size", "notional_usd", "time"}.
+        """
+        return []
+
+    def snapshot(self, coins: list[str], now: float) -> VenueSnapshot:
+        """Fetch mids, funding and OI for one cycle. Adapters whose API returns
+        all three in one response override this to make a single request."""
+        return VenueSnapshot(
+            self.name, self.get_mids(coins), self.get_funding(coins), self.get_open_interest(coins), now,
+        )
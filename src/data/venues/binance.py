@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.data.venues.base import ExchangeAdapter, VenueSnapshot
+from src.utils.logger import setup_logger
+
+logger = setup_logger("venue.binance")
+
+API_URL = "https://fapi.binance.com"
+DEFAULT_FUNDING_INTERVAL_HOURS = 8
+
+
+class BinanceAdapter(ExchangeAdapter):
+    """Binance USD-M futures.
+
+    Funding is quoted per funding interval (8h unless ``fundingInfo`` says
+    otherwise) and normalized to per hour. OI is quoted in contracts of the
+    base asset and converted at mark price. Public REST exposes no
+    liquidation history, so ``get_liquidations`` stays empty.
+    """
+
+    name = "binance"
+
+    def __init__(self, base_url: str = API_URL, session: requests.Session = None,
+                 symbol_map: dict[str, str] = None, max_workers: int = 8):
+        super().__init__(base_url, session)
+        self.symbol_map = symbol_map or {}
+        self._intervals: dict[str, float] | None = None
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="binance")
+
+    def symbol(self, coin: str) -> str:
+        return self.symbol_map.get(coin, f"{coin}USDT")
+
+    def _premium_index(self, coins: list[str]) -> dict[str, dict]:
+        by_symbol = {row["symbol"]: row for row in self._get("/fapi/v1/premiumIndex")}
+        return {c: by_symbol[self.symbol(c)] for c in coins if self.symbol(c) in by_symbol}
+
+    def _funding_intervals(self) -> dict[str, float]:
+        if self._intervals is None:
+            try:
+                rows = self._get("/fapi/v1/fundingInfo")
+                self._intervals = {r["symbol"]: float(r["fundingIntervalHours"]) for r in rows}
+            except (requests.RequestException, KeyError, ValueError) as e:
+                logger.warning("Binance fundingInfo unavailable, assuming 8h: %s", e)
+                self._intervals = {}
+        return self._intervals
+
+    def get_mids(self, coins: list[str]) -> dict[str, float]:
+        return {c: float(row["markPrice"]) for c, row in self._premium_index(coins).items()}
+
+    def get_funding(self, coins: list[str]) -> dict[str, float]:
+        return self._funding_from(self._premium_index(coins))
+
+    def _funding_from(self, index: dict[str, dict]) -> dict[str, float]:
+        intervals = self._funding_intervals()
+        return {
+            c: float(row["lastFundingRate"])
+            / intervals.get(row["symbol"], DEFAULT_FUNDING_INTERVAL_HOURS)
+            for c, row in index.items()
+        }
+
+    def get_open_interest(self, coins: list[str]) -> dict[str, float]:
+        return self._open_interest_from(self.get_mids(coins))
+
+    def _open_interest_from(self, marks: dict[str, float]) -> dict[str, float]:
+        def fetch(coin):
+            row = self._get("/fapi/v1/openInterest", {"symbol": self.symbol(coin)})
+            return coin, float(row["openInterest"]) * marks[coin]
+
+        out = {}
+        for future in [self._pool.submit(fetch, c) for c in marks]:
+            try:
+                coin, oi = future.result()
+                out[coin] = oi
+            except Exception as e:
+                logger.warning("Binance OI fetch failed: %s", e)
+        return out
+
+    def get_book(self, coin: str) -> dict:
+        raw = self._get("/fapi/v1/depth", {"symbol": self.symbol(coin), "limit": 100})
+        return {
+            "bids": [(float(px), float(sz)) for px, sz in raw.get("bids", [])],
+            "asks": [(float(px), float(sz)) for px, sz in raw.get("asks", [])],
+        }
+
+    def snapshot(self, coins: list[str], now: float) -> VenueSnapshot:
+        index = self._premium_index(coins)
+        marks = {c: float(row["markPrice"]) for c, row in index.items()}
+        return VenueSnapshot(self.name, marks, self._funding_from(index), self._open_interest_from(marks), now)
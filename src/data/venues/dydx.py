@@ -0,0 +1,75 @@
+import requests
+
+from src.data.venues.base import ExchangeAdapter, VenueSnapshot
+
+API_URL = "https://indexer.dydx.trade"
+
+
+class DydxAdapter(ExchangeAdapter):
+    """dYdX v4 via the public indexer.
+
+    ``nextFundingRate`` is already an hourly rate; OI is in base units and
+    converted at oracle price. Liquidations come from the trades feed, where
+    they are tagged ``LIQUIDATED``.
+    """
+
+    name = "dydx"
+
+    def __init__(self, base_url: str = API_URL, session: requests.Session = None):
+        super().__init__(base_url, session)
+
+    @staticmethod
+    def ticker(coin: str) -> str:
+        return f"{coin}-USD"
+
+    def _markets(self, coins: list[str]) -> dict[str, dict]:
+        markets = self._get("/v4/perpetualMarkets").get("markets", {})
+        return {c: markets[self.ticker(c)] for c in coins if self.ticker(c) in markets}
+
+    def get_mids(self, coins: list[str]) -> dict[str, float]:
+        return {c: float(m["oraclePrice"]) for c, m in self._markets(coins).items()}
+
+    def get_funding(self, coins: list[str]) -> dict[str, float]:
+        return {c: float(m.get("nextFundingRate", 0)) for c, m in self._markets(coins).items()}
+
+    def get_open_interest(self, coins: list[str]) -> dict[str, float]:
+        return {
+            c: float(m.get("openInterest", 0)) * float(m["oraclePrice"])
+            for c, m in self._markets(coins).items()
+        }
+
+    def get_book(self, coin: str) -> dict:
+        raw = self._get(f"/v4/orderbooks/perpetualMarket/{self.ticker(coin)}")
+        return {
+            "bids": [(float(b["price"]), float(b["size"])) for b in raw.get("bids", [])],
+            "asks": [(float(a["price"]), float(a["size"])) for a in raw.get("asks", [])],
+        }
+
+    def get_liquidations(self, coins: list[str]) -> list[dict]:
+        out = []
+        for coin in coins:
+            trades = self._get(f"/v4/trades/perpetualMarket/{self.ticker(coin)}").get("trades", [])
+            for t in trades:
+                if t.get("type") != "LIQUIDATED":
+                    continue
+                price, size = float(t["price"]), float(t["size"])
+                out.append({
+                    "venue": self.name,
+                    "coin": coin,
+                    "side": t.get("side", "").lower(),
+                    "price": price,
+                    "size": size,
+                    "notional_usd": price * size,
+                    "time": t.get("createdAt"),
+                })
+        return out
+
+    def snapshot(self, coins: list[str], now: float) -> VenueSnapshot:
+        markets = self._markets(coins)
+        return VenueSnapshot(
+            self.name,
+            {c: float(m["oraclePrice"]) for c, m in markets.items()},
+            {c: float(m.get("nextFundingRate", 0)) for c, m in markets.items()},
+            {c: float(m.get("openInterest", 0)) * float(m["oraclePrice"]) for c, m in markets.items()},
+            now,
+        )
@@ -0,0 +1,52 @@
+from src.data.hyperliquid_client import HyperliquidClient
+from src.data.orderbook import fetch_orderbook
+from src.data.venues.base import ExchangeAdapter, VenueSnapshot
+
+
+class HyperliquidAdapter(ExchangeAdapter):
+    """Hyperliquid perps. Funding in ``metaAndAssetCtxs`` is already hourly;
+    open interest is quoted in coins and converted at mark price."""
+
+    name = "hyperliquid"
+
+    def __init__(self, client: HyperliquidClient = None):
+        self.client = client or HyperliquidClient()
+
+    def _contexts(self, coins: list[str]) -> dict[str, dict]:
+        meta, ctxs = self.client.get_meta_and_contexts()[:2]
+        wanted = set(coins)
+        return {
+            asset["name"]: ctxs[i]
+            for i, asset in enumerate(meta["universe"])
+            if asset["name"] in wanted and i < len(ctxs)
+        }
+
+    @staticmethod
+    def _mark(ctx: dict) -> float:
+        return float(ctx.get("markPx") or ctx.get("midPx") or ctx.get("oraclePx") or 0)
+
+    def get_mids(self, coins: list[str]) -> dict[str, float]:
+        mids = self.client.get_all_mids()
+        return {c: float(mids[c]) for c in coins if mids.get(c)}
+
+    def get_funding(self, coins: list[str]) -> dict[str, float]:
+        return {c: float(ctx.get("funding", 0)) for c, ctx in self._contexts(coins).items()}
+
+    def get_open_interest(self, coins: list[str]) -> dict[str, float]:
+        return {
+            c: float(ctx.get("openInterest", 0)) * self._mark(ctx)
+            for c, ctx in self._contexts(coins).items()
+        }
+
+    def get_book(self, coin: str) -> dict:
+        return fetch_orderbook(self.client, coin)
+
+    def snapshot(self, coins: list[str], now: float) -> VenueSnapshot:
+        ctxs = self._contexts(coins)
+        return VenueSnapshot(
+            self.name,
+            {c: self._mark(ctx) for c, ctx in ctxs.items() if self._mark(ctx)},
+            {c: float(ctx.get("funding", 0)) for c, ctx in ctxs.items()},
+            {c: float(ctx.get("openInterest", 0)) * self._mark(ctx) for c, ctx in ctxs.items()},
+            now,
+        )
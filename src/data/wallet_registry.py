@@ -0,0 +1,204 @@
+import math
+import os
+import threading
+import time
+
+import requests
+
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("wallet_registry")
+
+# Score weights (sum to 1.0)
+SCORE_WEIGHTS = {
+    "equity": 0.5,
+    "leverage": 0.25,
+    "activity": 0.25,
+}
+EQUITY_SCALE_USD = 10_000_000      # equity factor saturates here (log scale)
+LEVERAGE_SCALE = 25.0              # leverage factor saturates here
+ACTIVITY_HALF_LIFE_HOURS = 24.0
+NEW_WALLET_SCORE = 0.5             # unscanned wallets get a fair first look
+
+
+def _parse_wallets(text: str) -> list[str]:
+    return [l.strip() for l in text.splitlines() if l.strip() and not l.strip().startswith("#")]
+
+
+class WalletStats:
+    __slots__ = ("equity", "leverage", "last_active", "signature")
+
+    def __init__(self):
+        self.equity = 0.0
+        self.leverage = 0.0
+        self.last_active = 0.0
+        self.signature = None
+
+
+class WalletRegistry:
+    """Deduplicated, ranked set of whale wallets to scan.
+
+    Sources (static config list, a local file and an optional URL) are reloaded
+    on a background thread using conditional fetches — file mtime for the file,
+    ETag / Last-Modified for the URL — so a slow source never blocks a cycle.
+    Wallets are scored from their last observed positions and ``get_wallets``
+    returns the top ``max_wallets`` by score.
+    """
+
+    def __init__(
+        self,
+        static_wallets: list[str] = None,
+        file_path: str = None,
+        url: str = None,
+        reload_minutes: float = 10,
+        max_wallets: int = 0,
+        timeout: float = 10,
+    ):
+        self.static_wallets = list(static_wallets or [])
+        self.file_path = file_path
+        self.url = url
+        self.reload_seconds = reload_minutes * 60
+        self.max_wallets = max_wallets
+        self.timeout = timeout
+        self.last_reload: float = 0.0
+
+        self._session = requests.Session()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self._file_mtime: float | None = None
+        self._file_wallets: list[str] = []
+        self._url_etag: str | None = None
+        self._url_modified: str | None = None
+        self._url_wallets: list[str] = []
+
+        self._wallets: list[str] = list(dict.fromkeys(self.static_wallets))
+        self._stats: dict[str, WalletStats] = {}
+
+    # --- source loading ---
+
+    def start(self):
+        """Start the background reload thread (first reload runs immediately)."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="wallet-registry", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.reload()
+            except Exception as e:
+                logger.warning("Wallet reload failed: %s", e)
+            self._stop.wait(self.reload_seconds)
+
+    def reload(self) -> bool:
+        """Reload all sources once. Returns True if the merged wallet set changed."""
+        with metrics.stage("wallet_reload"):
+            changed = self._reload_file() | self._reload_url()
+        merged = list(dict.fromkeys(self.static_wallets + self._file_wallets + self._url_wallets))
+        with self._lock:
+            changed = changed or merged != self._wallets
+            self._wallets = merged
+            self.last_reload = time.time()
+        if changed:
+            logger.info("Wallet list refreshed: %d wallets", len(merged))
+        return changed
+
+    def _reload_file(self) -> bool:
+        if not self.file_path:
+            return False
+        try:
+            mtime = os.stat(self.file_path).st_mtime
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        with open(self.file_path, "r") as f:
+            self._file_wallets = _parse_wallets(f.read())
+        self._file_mtime = mtime
+        return True
+
+    def _reload_url(self) -> bool:
+        if not self.url:
+            return False
+        headers = {}
+        if self._url_etag:
+            headers["If-None-Match"] = self._url_etag
+        if self._url_modified:
+            headers["If-Modified-Since"] = self._url_modified
+        try:
+            r = self._session.get(self.url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.warning("Wallet URL fetch failed: %s", e)
+            return False
+        metrics.cache_result("wallet_url", r.status_code == 304)
+        if r.status_code == 304 or not r.ok:
+            return False
+        self._url_etag = r.headers.get("ETag")
+        self._url_modified = r.headers.get("Last-Modified")
+        self._url_wallets = _parse_wallets(r.text)
+        return True
+
+    # --- scoring ---
+
+    def observe(self, wallet: str, positions: list[dict], now: float = None):
+        """Record a wallet's latest positions for scoring."""
+        now = now or time.time()
+        equity = 0.0
+        notional = 0.0
+        lev_notional = 0.0
+        for pos in positions:
+            equity += pos.get("margin_used", 0) + pos.get("unrealized_pnl", 0)
+            n = abs(pos.get("size", 0)) * pos.get("entry_price", 0)
+            notional += n
+            lev_notional += n * pos.get("leverage", 1)
+
+        signature = tuple(sorted((p.get("coin", ""), p.get("size", 0)) for p in positions))
+        with self._lock:
+            stats = self._stats.get(wallet)
+            if stats is None:
+                stats = self._stats[wallet] = WalletStats()
+            stats.equity = equity
+            stats.leverage = lev_notional / notional if notional else 0.0
+            if signature != stats.signature:
+                if stats.signature is not None or positions:
+                    stats.last_active = now
+                stats.signature = signature
+
+    def score(self, wallet: str, now: float = None) -> float:
+        """Score a wallet 0-1 from equity, leverage and recency of position changes."""
+        stats = self._stats.get(wallet)
+        if stats is None:
+            return NEW_WALLET_SCORE
+        now = now or time.time()
+        equity_factor = min(math.log10(1 + max(stats.equity, 0)) / math.log10(EQUITY_SCALE_USD), 1.0)
+        leverage_factor = min(stats.leverage / LEVERAGE_SCALE, 1.0)
+        if stats.last_active:
+            age_hours = max(now - stats.last_active, 0) / 3600
+            activity_factor = 0.5 ** (age_hours / ACTIVITY_HALF_LIFE_HOURS)
+        else:
+            activity_factor = 0.0
+        return (
+            equity_factor * SCORE_WEIGHTS["equity"]
+            + leverage_factor * SCORE_WEIGHTS["leverage"]
+            + activity_factor * SCORE_WEIGHTS["activity"]
+        )
+
+    def get_wallets(self, now: float = None) -> list[str]:
+        """Return wallets ranked by score, capped at ``max_wallets`` (0 = no cap)."""
+        now = now or time.time()
+        with self._lock:
+            wallets = list(self._wallets)
+            ranked = sorted(wallets, key=lambda w: self.score(w, now), reverse=True)
+        if self.max_wallets:
+            ranked = ranked[: self.max_wallets]
+        return ranked
@@ -0,0 +1,238 @@
+"""Incremental ingestion of whale fills and funding payments.
+
+Position snapshots miss a wallet that opens and closes between two scans.
+``ActivityIngestor`` pulls each tracked wallet's fills (``userFillsByTime``)
+and funding payments (``userFunding``) starting at a per-wallet cursor, the
+time of the last event already stored, so history is downloaded once.
+Events land in an ``EventStore``: fixed-width binary records appended to
+``events.bin`` with wallet and coin names interned in ``names.txt``.
+Cursors are rebuilt from the store on start-up.
+"""
+import os
+import time
+
+import numpy as np
+
+from src.data.hyperliquid_client import DeadlineExceeded
+from src.utils.logger import setup_logger
+
+logger = setup_logger("whale_activity")
+
+FILL = 1
+FUNDING = 2
+
+# Fill direction as reported in ``dir``; index is stored in the record
+DIRECTIONS = ("", "Open Long", "Close Long", "Open Short", "Close Short", "Long > Short", "Short > Long")
+OPENS = (1, 3)
+CLOSES = (2, 4)
+
+EVENT_DTYPE = np.dtype([
+    ("time", "i8"),     # ms
+    ("wallet", "u4"),   # index into EventStore.wallets
+    ("coin", "u2"),     # index into EventStore.coins
+    ("kind", "u1"),     # FILL | FUNDING
+    ("dir", "u1"),      # fills: index into DIRECTIONS (0 = other)
+    ("price", "f8"),    # fills: px; funding: funding rate
+    ("size", "f8"),     # fills: signed size (+ = buy); funding: position size (szi)
+    ("value", "f8"),    # fills: closed PnL; funding: USDC paid (+) or received (-)
+    ("fee", "f8"),
+    ("tid", "i8"),      # fills: trade id (dedupe at the cursor)
+])
+
+# Page sizes the API caps responses at
+FILL_PAGE = 2000
+FUNDING_PAGE = 500
+# Info API weight of one userFillsByTime / userFunding request (the budget is 1200 per minute)
+REQUEST_WEIGHT = 20
+
+
+class EventStore:
+    """Append-only store of fill/funding events in ``directory``."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.events_path = os.path.join(directory, "events.bin")
+        self.names_path = os.path.join(directory, "names.txt")
+        self.wallets: list[str] = []
+        self.coins: list[str] = []
+        self._wallet_ids: dict[str, int] = {}
+        self._coin_ids: dict[str, int] = {}
+        # (wallet, kind) -> (cursor ms, keys of the events at exactly that time)
+        self.cursors: dict[tuple[str, int], tuple[int, set]] = {}
+        self._load()
+        self._events = open(self.events_path, "ab")
+        self._names = open(self.names_path, "a", encoding="utf-8")
+
+    def _load(self):
+        if os.path.exists(self.names_path):
+            with open(self.names_path, encoding="utf-8") as fh:
+                for line in fh:
+                    kind, _, name = line.rstrip("\n").partition(" ")
+                    (self.wallets if kind == "w" else self.coins).append(name)
+        self._wallet_ids = {w: i for i, w in enumerate(self.wallets)}
+        self._coin_ids = {c: i for i, c in enumerate(self.coins)}
+        events = self.read()
+        if len(events) == 0:
+            return
+        # Sort by (wallet, kind, time) once; the last run per (wallet, kind) is its cursor
+        order = np.lexsort((events["time"], events["kind"], events["wallet"]))
+        events = events[order]
+        wallets, kinds, times = events["wallet"], events["kind"], events["time"]
+        for i in np.flatnonzero(np.r_[(wallets[1:] != wallets[:-1]) | (kinds[1:] != kinds[:-1]), True]):
+            w, kind, t = wallets[i], kinds[i], times[i]
+            # The events at the cursor time sit just before ``i``
+            j = i
+            while j > 0 and times[j - 1] == t and wallets[j - 1] == w and kinds[j - 1] == kind:
+                j -= 1
+            self.cursors[(self.wallets[w], int(kind))] = (int(t), {self._key(e) for e in events[j:i + 1]})
+
+    def _intern(self, name: str, ids: dict[str, int], names: list[str], tag: str) -> int:
+        i = ids.get(name)
+        if i is None:
+            i = ids[name] = len(names)
+            names.append(name)
+            self._names.write(f"{tag} {name}\n")
+        return i
+
+    def cursor(self, wallet: str, kind: int) -> int | None:
+        entry = self.cursors.get((wallet, kind))
+        return None if entry is None else entry[0]
+
+    def append(self, wallet: str, kind: int, rows: list[tuple]) -> np.ndarray:
+        """Append ``rows`` of (time, coin, dir, price, size, value, fee, tid) not seen yet; returns them."""
+        cursor, seen = self.cursors.get((wallet, kind), (-1, set()))
+        w = self._intern(wallet, self._wallet_ids, self.wallets, "w")
+        fresh = []
+        for row in rows:
+            t = row[0]
+            if t < cursor or (t == cursor and (row[7], row[1]) in seen):
+                continue
+            fresh.append(row)
+        if not fresh:
+            return np.empty(0, dtype=EVENT_DTYPE)
+        fresh.sort(key=lambda r: r[0])
+        out = np.empty(len(fresh), dtype=EVENT_DTYPE)
+        for i, (t, coin, direction, price, size, value, fee, tid) in enumerate(fresh):
+            out[i] = (t, w, self._intern(coin, self._coin_ids, self.coins, "c"), kind, direction,
+                      price, size, value, fee, tid)
+        self._names.flush()  # names before the records that refer to them
+        self._events.write(out.tobytes())
+        self._events.flush()
+
+        last = int(out["time"][-1])
+        keys = {self._key(e) for e in out[out["time"] == last]}
+        if last == cursor:
+            keys |= seen
+        self.cursors[(wallet, kind)] = (last, keys)
+        return out
+
+    def read(self) -> np.ndarray:
+        """Every stored event (memory-mapped; empty array when there are none)."""
+        if not os.path.exists(self.events_path) or os.path.getsize(self.events_path) < EVENT_DTYPE.itemsize:
+            return np.empty(0, dtype=EVENT_DTYPE)
+        count = os.path.getsize(self.events_path) // EVENT_DTYPE.itemsize  # ignore a torn trailing record
+        return np.memmap(self.events_path, dtype=EVENT_DTYPE, mode="r", shape=(count,))
+
+    def _key(self, event) -> tuple:
+        """Identity of an event among those at the same time: (tid, coin); funding has tid 0."""
+        return int(event["tid"]), self.coins[event["coin"]]
+
+    def close(self):
+        self._events.close()
+        self._names.close()
+
+
+def _fill_row(f: dict) -> tuple:
+    size = float(f["sz"])
+    direction = DIRECTIONS.index(f.get("dir")) if f.get("dir") in DIRECTIONS else 0
+    return (int(f["time"]), f["coin"], direction, float(f["px"]), size if f["side"] == "B" else -size,
+            float(f.get("closedPnl") or 0), float(f.get("fee") or 0), int(f.get("tid") or 0))
+
+
+def _funding_row(f: dict) -> tuple:
+    d = f["delta"]
+    return (int(f["time"]), d["coin"], 0, float(d["fundingRate"]), float(d["szi"]), float(d["usdc"]), 0.0, 0)
+
+
+class ActivityIngestor:
+    """Pulls fills and funding for tracked wallets after each one's cursor.
+
+    Each ``ingest`` visits wallets round-robin until its requests would
+    exceed ``weight_per_cycle`` of API weight (0 = every wallet), so a large
+    registry is covered over several cycles without a burst of requests. A
+    wallet costs at least two requests (fills and funding) of
+    ``REQUEST_WEIGHT`` each; a full page left over waits for the next visit.
+    A wallet seen for the first time starts ``lookback_hours`` back.
+    """
+
+    def __init__(self, client, store: EventStore, weight_per_cycle: int = 200, lookback_hours: float = 24):
+        self.client = client
+        self.store = store
+        self.weight_per_cycle = weight_per_cycle
+        self.lookback_ms = int(lookback_hours * 3600_000)
+        self.pages = {FILL: FILL_PAGE, FUNDING: FUNDING_PAGE}
+        self._next = 0
+        self._spent = 0  # API weight used by the current ``ingest``
+
+    def _over_budget(self, extra: int = 0) -> bool:
+        return bool(self.weight_per_cycle) and self._spent + extra > self.weight_per_cycle
+
+    def _start(self, wallet: str, kind: int, now_ms: int) -> int:
+        cursor = self.store.cursor(wallet, kind)
+        # Resume at the cursor itself: events sharing its timestamp are deduped by the store
+        return now_ms - self.lookback_ms if cursor is None else cursor
+
+    def _pull(self, wallet: str, kind: int, now_ms: int) -> np.ndarray:
+        if kind == FILL:
+            fetch, parse = self.client.get_user_fills_by_time, _fill_row
+        else:
+            fetch, parse = self.client.get_user_funding, _funding_row
+        page = self.pages[kind]
+        new = []
+        start = self._start(wallet, kind, now_ms)
+        while True:
+            self._spent += REQUEST_WEIGHT
+            raw = fetch(wallet, start) or []
+            rows = [parse(r) for r in raw]
+            added = self.store.append(wallet, kind, rows)
+            if len(added):
+                new.append(added)
+            # A full page may have more behind it; continue from its last timestamp
+            if len(raw) < page or not len(added) or self._over_budget(REQUEST_WEIGHT):
+                break
+            start = int(added["time"][-1])
+        return np.concatenate(new) if new else np.empty(0, dtype=EVENT_DTYPE)
+
+    def ingest(self, wallets: list[str], now_ms: int | None = None) -> dict[str, np.ndarray]:
+        """Fetch new events for the next batch of ``wallets``; returns {wallet: new fills}."""
+        if not wallets:
+            return {}
+        start = self._next % len(wallets)
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        fills = {}
+        visited = 0
+        self._spent = 0
+        for i in range(len(wallets)):
+            # Always visit one wallet, so a budget below two requests still makes progress
+            if visited and self._over_budget(2 * REQUEST_WEIGHT):
+                break
+            wallet = wallets[(start + i) % len(wallets)]
+            try:
+                new_fills = self._pull(wallet, FILL, now_ms)
+                self._pull(wallet, FUNDING, now_ms)
+            except DeadlineExceeded:
+                break
+            except Exception as e:
+                logger.warning("Activity fetch failed for %s...: %s", wallet[:10], e)
+            else:
+                if len(new_fills):
+                    fills[wallet] = new_fills
+            visited += 1
+        self._next = start + visited
+        for wallet, new in fills.items():
+            opened = int(np.isin(new["dir"], OPENS).sum())
+            closed = int(np.isin(new["dir"], CLOSES).sum())
+            if opened or closed:
+                logger.info("Whale %s...: %d opening / %d closing fills since last check", wallet[:10], opened, closed)
+        return fills
@@ -1,40 +1,58 @@
+from src.data.hyperliquid_client import DeadlineExceeded
 from src.data.positions import fetch_positions
+from src.models import Order, Position
 from src.utils.logger import setup_logger
 
 logger = setup_logger("whale_tracker")
 
 
-def scan_whale_wallets(client, wallets: list[str], coins: list[str]) -> dict[str, list[dict]]:
+def scan_whale_wallets(
+    client, wallets: list[str], coins: list[str], registry=None, diff_engine=None
+) -> dict[str, list[Position]]:
     """Scan whale wallets and collect positions for target coins.
 
-    Returns {coin: [position_dicts]} aggregated across all wallets.
+    If a WalletRegistry is given, every wallet's full position list is fed back
+    to it for scoring. If a PositionDiffEngine is given, each successfully
+    fetched wallet is diffed against its last known state.
+
+    If the client's cycle deadline passes mid-scan, the wallets fetched so
+    far are returned.
+
+    Returns {coin: [Position]} aggregated across all wallets.
     """
-    result: dict[str, list[dict]] = {coin: [] for coin in coins}
+    result: dict[str, list[Position]] = {coin: [] for coin in coins}
 
-    for wallet in wallets:
+    for n, wallet in enumerate(wallets):
         try:
             positions = fetch_positions(client, wallet)
+            if registry is not None:
+                registry.observe(wallet, positions)
+            if diff_engine is not None:
+                diff_engine.apply(wallet, positions)
             for pos in positions:
-                if pos["coin"] in coins:
-                    pos["wallet"] = wallet
-                    result[pos["coin"]].append(pos)
+                if pos.coin in coins:
+                    result[pos.coin].append(pos)
+        except DeadlineExceeded:
+            # Partial scan; a diff engine keeps the unscanned wallets' last known state
+            logger.warning("Cycle deadline reached after %d/%d wallets", n, len(wallets))
+            break
         except Exception as e:
             logger.warning(f"Failed to scan wallet {wallet[:10]}...: {e}")
 
     for coin in coins:
         count = len(result[coin])
         if count > 0:
-            logger.info(f"{coin}: {count} whale positions found")
+            logger.info("%s: %d whale positions found", coin, count)
 
     return result
 
 
-def scan_whale_orders(client, wallets: list[str], coins: list[str]) -> dict[str, list[dict]]:
+def scan_whale_orders(client, wallets: list[str], coins: list[str]) -> dict[str, list[Order]]:
     """Scan whale wallets for open orders (including TP/SL triggers).
 
-    Returns {coin: [order_dicts]} with trigger info.
+    Returns {coin: [Order]} with trigger info.
     """
-    result: dict[str, list[dict]] = {coin: [] for coin in coins}
+    result: dict[str, list[Order]] = {coin: [] for coin in coins}
 
     for wallet in wallets:
         try:
@@ -42,16 +60,16 @@ def scan_whale_orders(client, wallets: list[str], coins: list[str]) -> dict[str,
             for order in orders:
                 coin = order.get("coin", "")
                 if coin in coins:
-                    result[coin].append({
-                        "wallet": wallet,
-                        "coin": coin,
-                        "side": order.get("side", ""),
-                        "price": float(order.get("limitPx", 0)),
-                        "size": float(order.get("sz", 0)),
-                        "order_type": order.get("orderType", ""),
-                        "trigger_condition": order.get("triggerCondition", ""),
-                        "trigger_px": order.get("triggerPx", ""),
-                    })
+                    result[coin].append(Order(
+                        wallet=wallet,
+                        coin=coin,
+                        side=order.get("side", ""),
+                        price=float(order.get("limitPx", 0)),
+                        size=float(order.get("sz", 0)),
+                        order_type=order.get("orderType", ""),
+                        trigger_condition=order.get("triggerCondition", ""),
+                        trigger_px=order.get("triggerPx", ""),
+                    ))
         except Exception as e:
             logger.warning(f"Failed to scan orders for {wallet[:10]}...: {e}")
 
@@ -1,4 +1,5 @@
 from src.execution.executor import Executor
+from src.models import Decision
 from src.utils.logger import setup_logger
 
 logger = setup_logger("executor.alert")
@@ -10,7 +11,7 @@ class AlertExecutor(Executor):
     def __init__(self):
         self.alert_history = []
 
-    def execute_trade(self, decision: dict, capital: float, config: dict) -> dict | None:
+    def execute_trade(self, decision: Decision, capital: float, config: dict) -> dict | None:
         alert = {
             "coin": decision["coin"],
             "direction": decision["direction"],
@@ -23,13 +24,10 @@ class AlertExecutor(Executor):
         self.alert_history.append(alert)
 
         logger.info(
-            f"{'='*60}\n"
-            f"  ALERT: {decision['coin']} {decision['direction'].upper()}\n"
-            f"  Confidence: {decision['confidence']:.1%}\n"
-            f"  Capital: ${capital:.2f}\n"
-            f"  Target: {decision.get('target_price', 'N/A')}\n"
-            f"  Active signals: {', '.join(alert['signals'])}\n"
-            f"{'='*60}"
+            "ALERT: %s %s confidence=%.1f%% capital=$%.2f target=%s signals=%s",
+            alert["coin"], alert["direction"].upper(), alert["confidence"] * 100, capital,
+            alert["target_price"] or "N/A", ",".join(alert["signals"]),
+            extra={"alert": alert},
         )
         return alert
 
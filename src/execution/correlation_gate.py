@@ -0,0 +1,129 @@
+"""Correlation-weighted exposure limit across open trades.
+
+``CorrelationGate`` keeps an exponentially weighted covariance of per-cycle
+log returns for every coin it has seen (RiskMetrics-style, zero mean)::
+
+    cov = lam * cov + (1 - lam) * r r^T
+
+one in-place O(n^2) outer-product update per cycle, never a recomputation
+from history. A book of signed notionals ``x`` then has a correlation-weighted
+exposure ``sqrt(x^T C x)``: two longs on coins moving together count as one
+bigger bet, a long and a short on them largely cancel.
+
+``cap`` returns the largest size of a new trade that keeps that exposure
+within a limit (or, when the open trades are already over it, that does
+not add to it). It solves a quadratic over the coins of the open trades only,
+so the cost per decision does not grow with the universe. Coins with fewer
+than ``min_observations`` returns are treated as perfectly correlated with
+everything, so an unknown coin is never a diversifier.
+"""
+import math
+
+import numpy as np
+
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("correlation_gate")
+
+
+class CorrelationGate:
+    def __init__(self, halflife_cycles: float = 60, min_observations: int = 20, capacity: int = 64):
+        self.lam = 0.5 ** (1 / halflife_cycles)
+        self.min_observations = min_observations
+        self._index: dict[str, int] = {}
+        self._cov = np.zeros((capacity, capacity))
+        self._outer = np.empty((capacity, capacity))
+        self._last = np.full(capacity, np.nan)   # previous price
+        self._weight = np.zeros(capacity)        # EW weight of the returns seen (bias correction)
+        self._obs = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _grow(self, n: int):
+        cap = len(self._last)
+        if n <= cap:
+            return
+        new = max(n, cap * 2)
+        cov = np.zeros((new, new))
+        cov[:cap, :cap] = self._cov
+        self._cov = cov
+        self._outer = np.empty((new, new))
+        self._last = np.concatenate([self._last, np.full(new - cap, np.nan)])
+        self._weight = np.concatenate([self._weight, np.zeros(new - cap)])
+        self._obs = np.concatenate([self._obs, np.zeros(new - cap, dtype=np.int64)])
+
+    def update(self, prices: dict[str, float]):
+        """Fold one cycle's prices in. Coins without a price this cycle contribute a zero return."""
+        with metrics.stage("correlation"):
+            for coin in prices:
+                if coin not in self._index:
+                    self._index[coin] = len(self._index)
+            n = len(self._index)
+            self._grow(n)
+            price = np.full(n, np.nan)
+            for coin, p in prices.items():
+                if p:
+                    price[self._index[coin]] = p
+            with np.errstate(invalid="ignore", divide="ignore"):
+                r = np.log(price / self._last[:n])
+            valid = np.isfinite(r)
+            r[~valid] = 0.0
+            have = ~np.isnan(price)
+            self._last[:n][have] = price[have]
+
+            lam = self.lam
+            cov = self._cov[:n, :n]
+            outer = self._outer[:n, :n]
+            np.outer(r, r * (1 - lam), out=outer)
+            cov *= lam
+            cov += outer
+            self._weight[:n] = lam * self._weight[:n] + (1 - lam) * valid
+            self._obs[:n] += valid
+
+    def correlation(self, coins: list[str]) -> np.ndarray:
+        """Correlation matrix of ``coins``; 1.0 wherever either coin lacks history."""
+        k = len(coins)
+        idx = np.array([self._index.get(c, -1) for c in coins], dtype=np.intp)
+        known = idx >= 0
+        ok = np.zeros(k, dtype=bool)
+        ok[known] = self._obs[idx[known]] >= self.min_observations
+        out = np.ones((k, k))
+        sel = np.flatnonzero(ok)
+        if len(sel):
+            i = idx[sel]
+            w = self._weight[i]
+            var = self._cov[i, i] / w
+            cov = self._cov[np.ix_(i, i)] / np.minimum.outer(w, w)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                corr = cov / np.sqrt(np.outer(var, var))
+            corr = np.where(np.isfinite(corr), np.clip(corr, -1.0, 1.0), 1.0)
+            out[np.ix_(sel, sel)] = corr
+        np.fill_diagonal(out, 1.0)
+        return out
+
+    def exposure(self, book: dict[str, float]) -> float:
+        """sqrt(x^T C x) of a {coin: signed notional} book."""
+        if not book:
+            return 0.0
+        x = np.array(list(book.values()))
+        return math.sqrt(max(float(x @ self.correlation(list(book)) @ x), 0.0))
+
+    def cap(self, coin: str, direction: str, size_usd: float, book: dict[str, float], limit_usd: float) -> float:
+        """Largest size <= ``size_usd`` for a new ``direction`` trade on ``coin`` within ``limit_usd``.
+
+        ``book`` maps coins of open trades to signed notional (+ long, - short).
+        """
+        if limit_usd <= 0 or size_usd <= 0:
+            return size_usd
+        sign = 1.0 if direction == "long" else -1.0
+        coins = list(book) if coin in book else [*book, coin]
+        x = np.array([book.get(c, 0.0) for c in coins])
+        cx = self.correlation(coins) @ x
+        # |x + s*sign*e_j|_C^2 = s^2 + 2*s*sign*(Cx)_j + x^T C x  (C_jj = 1); allow up to the limit,
+        # or up to the current exposure when already over it (a hedge may always go on)
+        b = sign * cx[coins.index(coin)]
+        c = min(float(x @ cx) - limit_usd ** 2, 0.0)
+        s = -b + math.sqrt(b * b - c)
+        return float(min(max(s, 0.0), size_usd))
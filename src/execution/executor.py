@@ -1,20 +1,22 @@
 from abc import ABC, abstractmethod
 
+from src.models import Decision
+
 
 class Executor(ABC):
     """Base class for trade executors."""
 
     @abstractmethod
-    def execute_trade(self, decision: dict, capital: float, config: dict) -> dict | None:
+    def execute_trade(self, decision: Decision, capital: float, config: dict) -> dict | None:
         """Execute a trade based on the signal decision.
 
         Args:
-            decision: {coin, direction, confidence, signals, target_price}
+            decision: Decision record {coin, direction, confidence, signals, target_price}
             capital: USD amount allocated for this trade
             config: execution config (take_profit_pct, stop_loss_pct, timeout_minutes)
 
         Returns:
-            Trade record dict or None if skipped.
+            Trade record (or alert dict) or None if skipped.
         """
         pass
 
@@ -27,3 +29,14 @@ class Executor(ABC):
     def get_open_positions(self) -> list[dict]:
         """Return list of currently open positions."""
         pass
+
+    def on_price_tick(self, prices: dict[str, float]) -> list[dict]:
+        """Handle a price update between poll cycles. Returns closed trade records."""
+        return []
+
+    def close_trades(self, coin: str, direction: str, price: float, reason: str) -> list[dict]:
+        """Close every open ``direction`` trade in ``coin`` at about ``price``. Returns closed records."""
+        return []
+
+    def shutdown(self):
+        """Release background threads/connections. No-op by default."""
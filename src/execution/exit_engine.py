@@ -0,0 +1,128 @@
+import heapq
+from bisect import bisect_left, bisect_right, insort
+
+TAKE_PROFIT = "take_profit"
+STOP_LOSS = "stop_loss"
+TIMEOUT = "timeout"
+
+
+class _CoinTriggers:
+    """Sorted trigger levels for one coin.
+
+    ``upper`` fires when price >= level (long TP, short SL);
+    ``lower`` fires when price <= level (long SL, short TP).
+    Entries are (level, seq, trade_id, reason) so ties sort deterministically.
+    """
+
+    __slots__ = ("upper", "lower")
+
+    def __init__(self):
+        self.upper: list[tuple] = []
+        self.lower: list[tuple] = []
+
+
+class ExitEngine:
+    """Price-indexed TP/SL trigger book plus a timeout heap.
+
+    ``on_tick`` costs O(log n + fired) per coin: a bisect finds the fired
+    prefix of the upper levels and suffix of the lower levels. Timeouts live
+    in a min-heap with lazy deletion.
+    """
+
+    def __init__(self):
+        self._coins: dict[str, _CoinTriggers] = {}
+        self._entries: dict[str, list[tuple]] = {}  # trade_id -> its trigger entries
+        self._coin_of: dict[str, str] = {}
+        self._deadline_of: dict[str, float] = {}
+        self._deadlines: list[tuple[float, str]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._coin_of)
+
+    def __contains__(self, trade_id: str) -> bool:
+        return trade_id in self._coin_of
+
+    def add(self, trade_id: str, coin: str, direction: str, entry_price: float,
+            take_profit_pct: float, stop_loss_pct: float, deadline: float):
+        if trade_id in self._coin_of:
+            self.remove(trade_id)
+        if direction == "long":
+            upper = entry_price * (1 + take_profit_pct / 100), TAKE_PROFIT
+            lower = entry_price * (1 - stop_loss_pct / 100), STOP_LOSS
+        else:
+            upper = entry_price * (1 + stop_loss_pct / 100), STOP_LOSS
+            lower = entry_price * (1 - take_profit_pct / 100), TAKE_PROFIT
+
+        book = self._coins.get(coin)
+        if book is None:
+            book = self._coins[coin] = _CoinTriggers()
+        self._seq += 1
+        up = (upper[0], self._seq, trade_id, upper[1])
+        down = (lower[0], self._seq, trade_id, lower[1])
+        insort(book.upper, up)
+        insort(book.lower, down)
+        self._entries[trade_id] = [up, down]
+        self._coin_of[trade_id] = coin
+        self._deadline_of[trade_id] = deadline
+        heapq.heappush(self._deadlines, (deadline, trade_id))
+
+    def remove(self, trade_id: str):
+        coin = self._coin_of.pop(trade_id, None)
+        if coin is None:
+            return
+        del self._deadline_of[trade_id]
+        book = self._coins[coin]
+        up, down = self._entries.pop(trade_id)
+        for levels, entry in ((book.upper, up), (book.lower, down)):
+            i = bisect_left(levels, entry)
+            if i < len(levels) and levels[i] == entry:
+                del levels[i]
+        if not book.upper and not book.lower:
+            del self._coins[coin]
+        # Heap entry is dropped lazily in ``expired``
+
+    def on_tick(self, coin: str, price: float) -> list[tuple[str, str]]:
+        """Return [(trade_id, reason)] for every trigger crossed by ``price``."""
+        book = self._coins.get(coin)
+        if book is None:
+            return []
+        fired = []
+        # Upper levels <= price fired (sentinel sorts after any real entry at that level)
+        i = bisect_right(book.upper, (price, float("inf")))
+        fired.extend((e[2], e[3]) for e in book.upper[:i])
+        # Lower levels >= price fired
+        j = bisect_left(book.lower, (price,))
+        fired.extend((e[2], e[3]) for e in book.lower[j:])
+        out = []
+        for trade_id, reason in fired:
+            if trade_id in self._coin_of:  # one exit per trade
+                self.remove(trade_id)
+                out.append((trade_id, reason))
+        return out
+
+    def expired(self, now: float, coins: set[str] | None = None) -> list[str]:
+        """Remove and return every trade whose deadline has passed.
+
+        If ``coins`` is given, only trades in those coins (e.g. coins with a
+        current price to exit at) are returned; the rest stay scheduled.
+        """
+        out = []
+        deferred = []
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, trade_id = heapq.heappop(self._deadlines)
+            if self._deadline_of.get(trade_id) != deadline:
+                continue
+            if coins is not None and self._coin_of[trade_id] not in coins:
+                deferred.append((deadline, trade_id))
+                continue
+            self.remove(trade_id)
+            out.append(trade_id)
+        for item in deferred:
+            heapq.heappush(self._deadlines, item)
+        return out
+
+    def next_deadline(self) -> float | None:
+        while self._deadlines and self._deadline_of.get(self._deadlines[0][1]) != self._deadlines[0][0]:
+            heapq.heappop(self._deadlines)
+        return self._deadlines[0][0] if self._deadlines else None
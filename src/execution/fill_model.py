@@ -0,0 +1,91 @@
+from typing import NamedTuple
+
+from src.data.orderbook import BookDepth
+from src.utils import clock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("executor.fills")
+
+
+class Fill(NamedTuple):
+    price: float
+    size: float
+    fee_usd: float
+    slippage_bps: float  # vs. mid, positive = worse than mid
+
+
+class FillSimulator:
+    """Depth-aware market-order fills for paper trading.
+
+    Orders walk the cached L2 book (``BookDepth``) instead of filling at mid.
+    The walk gives slippage relative to the book's own mid, applied to the
+    current mark, so a book a few seconds old never drags a fill back to
+    where price was. Size beyond the visible book is priced at the worst
+    visible level.
+
+    latency_ms: an order only fills against prices/books observed at least
+        this long after it was sent.
+    taker_fee_bps: charged on the notional of every fill.
+    book_source: optional ``coin -> {"bids", "asks"}`` callable used to refresh
+        books older than ``book_max_age_seconds``; without a fresh book the
+        fill falls back to mid (fees still apply).
+    """
+
+    def __init__(self, book_source=None, latency_ms: float = 250, taker_fee_bps: float = 4.5,
+                 book_max_age_seconds: float = 5.0):
+        self.book_source = book_source
+        self.latency = latency_ms / 1000
+        self.fee_rate = taker_fee_bps / 10_000
+        self.book_max_age = book_max_age_seconds
+        self._books: dict[str, BookDepth] = {}
+
+    def update_book(self, coin: str, book: dict, ts: float = None):
+        self._books[coin] = BookDepth.from_book(coin, book, clock.now() if ts is None else ts)
+
+    def ready(self, sent_at: float, now: float = None) -> bool:
+        """True once ``latency_ms`` has passed since ``sent_at``."""
+        return (clock.now() if now is None else now) - sent_at >= self.latency
+
+    def _depth(self, coin: str, now: float) -> BookDepth | None:
+        depth = self._books.get(coin)
+        if (depth is None or now - depth.ts > self.book_max_age) and self.book_source is not None:
+            try:
+                self.update_book(coin, self.book_source(coin), now)
+                depth = self._books[coin]
+            except Exception as e:
+                logger.warning("Book fetch for fill simulation failed (%s): %s", coin, e)
+        if depth is None or now - depth.ts > self.book_max_age:
+            return None
+        return depth
+
+    def fill(self, coin: str, is_buy: bool, mid: float, size: float = None, notional: float = None,
+             now: float = None) -> Fill:
+        """Simulate a market order for ``size`` coins or ``notional`` USD."""
+        now = clock.now() if now is None else now
+        depth = self._depth(coin, now)
+        price, size = mid, (notional / mid if size is None else size)
+
+        # The book can be seconds older than ``mid``: walk it for the slippage relative to its own
+        # mid and apply that to the current mark, never its absolute prices
+        levels = None if depth is None else (depth.ask_px if is_buy else depth.bid_px)
+        ref = None if depth is None else depth.mid()
+        if levels is not None and len(levels) and ref:
+            scale = ref / mid  # book price per unit of mark price
+            worst = levels[-1]
+            if notional is not None:
+                book_notional = notional * scale
+                avg, filled = depth.fill_notional(is_buy, book_notional)
+                if filled > 0:
+                    rest = book_notional - avg * filled  # > 0 only when the book ran out
+                    book_size = filled + (rest / worst if rest > 1e-9 else 0.0)
+                    price = book_notional / book_size / scale
+                    size = notional / price
+            else:
+                avg, filled = depth.fill_size(is_buy, size)
+                if filled > 0:
+                    price = (avg * filled + worst * (size - filled)) / size / scale
+            if 0 < filled < size:
+                logger.debug("%s fill of %.6g exceeds visible depth %.6g", coin, size, filled)
+
+        slippage = (price - mid) / mid if is_buy else (mid - price) / mid
+        return Fill(price, size, price * size * self.fee_rate, slippage * 10_000)
@@ -1,61 +1,513 @@
+import json
+import math
+import threading
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
 from src.execution.executor import Executor
+from src.execution.signing import NonceManager, Signer
+from src.models import Decision, Position, Trade
+from src.utils import metrics
 from src.utils.logger import setup_logger
 
 logger = setup_logger("executor.live")
 
+BASE_URL = "https://api.hyperliquid.xyz"
+MAX_PRICE_SIG_FIGS = 5
+MAX_PERP_DECIMALS = 6
+MID_MAX_AGE_SECONDS = 5  # older cached mids are refetched before pricing an entry
+
+
+def float_to_wire(x: float) -> str:
+    """Hyperliquid wire format: at most 8 decimals, no trailing zeros."""
+    rounded = f"{x:.8f}"
+    if abs(float(rounded) - x) >= 1e-12:
+        raise ValueError(f"float_to_wire causes rounding: {x}")
+    if rounded == "-0.00000000":
+        rounded = "0.00000000"
+    normalized = Decimal(rounded).normalize()
+    return f"{normalized:f}"
+
+
+def round_price(px: float, sz_decimals: int) -> float:
+    """Round to 5 significant figures and at most ``6 - szDecimals`` decimals."""
+    if px <= 0:
+        return 0.0
+    sig = round(px, MAX_PRICE_SIG_FIGS - 1 - int(math.floor(math.log10(px))))
+    return round(sig, MAX_PERP_DECIMALS - sz_decimals)
+
+
+def round_size(sz: float, sz_decimals: int) -> float:
+    """Round a size down to the asset's lot size."""
+    factor = 10 ** sz_decimals
+    return math.floor(sz * factor + 1e-9) / factor
+
+
+class PositionTracker:
+    """Keeps the account's positions fresh on a background thread.
+
+    Polls ``clearinghouseState`` every ``poll_seconds`` and immediately after
+    ``refresh()`` (called on each order ack), so the trading path never
+    blocks on a position query.
+    """
+
+    def __init__(self, post, address: str, poll_seconds: float = 2.0):
+        self._post = post
+        self.address = address
+        self.poll_seconds = poll_seconds
+        self._positions: dict[str, Position] = {}
+        self._updated = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="live-positions", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def refresh(self):
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+    def poll(self):
+        started = time.time()
+        try:
+            state = self._post("/info", {"type": "clearinghouseState", "user": self.address})
+        except Exception as e:
+            logger.warning("Position poll failed: %s", e)
+            return
+        positions = {}
+        for ap in state.get("assetPositions", []):
+            pos = ap.get("position", {})
+            size = float(pos.get("szi", 0))
+            if size == 0:
+                continue
+            liq = pos.get("liquidationPx")
+            positions[pos["coin"]] = Position(
+                coin=pos["coin"],
+                size=size,
+                entry_price=float(pos.get("entryPx") or 0),
+                liquidation_price=float(liq) if liq else None,
+                leverage=float(pos.get("leverage", {}).get("value", 1)),
+                unrealized_pnl=float(pos.get("unrealizedPnl", 0)),
+                margin_used=float(pos.get("marginUsed", 0)),
+            )
+        with self._lock:
+            self._positions = positions
+            self._updated = started
+
+    def snapshot(self) -> tuple[dict[str, Position], float]:
+        """Return ({coin: Position}, time the poll that produced it started)."""
+        with self._lock:
+            return dict(self._positions), self._updated
+
 
 class LiveExecutor(Executor):
     """Live trade executor for Hyperliquid.
 
     WARNING: This requires a private key and will place real orders.
-    Implementation is a placeholder — integrate with hyperliquid-python-sdk
-    or direct exchange API signing for real usage.
+
+    Each trade is one signed ``/exchange`` call carrying the IOC entry and its
+    reduce-only TP/SL trigger orders (``normalTpsl`` grouping). Requests go
+    over one pooled keep-alive session; asset metadata is loaded up front and
+    mids are taken from the latest price update, so the signal-to-ack path is
+    a single round trip. Positions are tracked by ``PositionTracker``.
+
+    Open trades are persisted to ``state_path`` and reconciled with the
+    exchange on start-up (``reconcile``), so a restart keeps their timeouts,
+    TP/SL orders and the ``max_positions`` count. Trades closed on the
+    exchange are booked at the price of the account's own closing fills.
     """
 
-    def __init__(self, private_key: str = None):
+    def __init__(
+        self,
+        private_key: str = None,
+        base_url: str = BASE_URL,
+        account_address: str = None,
+        slippage_pct: float = 0.5,
+        position_poll_seconds: float = 2.0,
+        mainnet: bool = True,
+        signer=None,
+        timeout: float = 10,
+        state_path: str | None = "data/live_state.json",
+    ):
         self.private_key = private_key
-        if not private_key:
+        self.base_url = base_url.rstrip("/")
+        self.slippage_pct = slippage_pct
+        self.timeout = timeout
+        self.open_trades: list[Trade] = []
+        self.closed_trades: list[Trade] = []
+        self.total_pnl: float = 0.0
+        self.nonces = NonceManager()
+        self._assets: dict[str, tuple[int, int]] = {}  # coin -> (asset index, szDecimals)
+        self._mids: dict[str, float] = {}
+        self._mids_at = 0.0
+        self.state_path = Path(state_path) if state_path else None
+        self._load_state()
+
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self.signer = signer
+        if self.signer is None and private_key:
+            self.signer = Signer(private_key, mainnet=mainnet)
+        self.tracker = None
+        if self.signer is None:
             logger.warning("LiveExecutor created without private key — trades will be rejected")
+            return
+
+        address = account_address or self.signer.address
+        self.tracker = PositionTracker(self._post, address, position_poll_seconds)
+        self.tracker.start()
+
+    def _load_state(self):
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            data = json.loads(self.state_path.read_text())
+            self.open_trades = [Trade.from_dict(t) for t in data.get("open_trades", [])]
+            self.closed_trades = [Trade.from_dict(t) for t in data.get("closed_trades", [])]
+            self.total_pnl = data.get("total_pnl", 0.0)
+        except Exception as e:
+            logger.error("Could not read live state %s: %s", self.state_path, e)
+
+    def _save_state(self):
+        if self.state_path is None:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps({
+            "open_trades": [t.to_dict() for t in self.open_trades],
+            "closed_trades": [t.to_dict() for t in self.closed_trades[-200:]],
+            "total_pnl": self.total_pnl,
+            "updated": time.time(),
+        }, indent=2))
+
+    def reconcile(self, config: dict) -> list[Trade]:
+        """Match persisted trades with the exchange's positions; returns the trades closed meanwhile.
 
-    def execute_trade(self, decision: dict, capital: float, config: dict) -> dict | None:
-        if not self.private_key:
+        Persisted trades whose position is gone are closed at their fills; positions without a
+        trade (opened before a crash, before the state was written) are adopted with ``config``'s
+        TP/SL/timeout and their resting reduce-only orders.
+        """
+        if self.tracker is None:
+            return []
+        self.tracker.poll()
+        positions, updated = self.tracker.snapshot()
+        if not updated:
+            logger.error("Live reconcile skipped: no position snapshot")
+            return []
+        closed = []
+        for trade in self.open_trades:
+            if trade.coin not in positions:
+                price = self._exit_fill_price(trade) or trade.entry_price
+                closed.append(self._close(trade, price, "exchange"))
+        self.open_trades = [t for t in self.open_trades if t.status == "open"]
+
+        known = {t.coin for t in self.open_trades}
+        orphans = [p for coin, p in positions.items() if coin not in known]
+        if orphans:
+            try:
+                orders = self._post("/info", {"type": "frontendOpenOrders", "user": self.tracker.address})
+            except Exception as e:
+                logger.warning("Open orders fetch failed: %s", e)
+                orders = []
+            now = time.time()
+            for pos in orphans:
+                trade = Trade(
+                    id=uuid.uuid4().hex[:12],
+                    coin=pos.coin,
+                    direction="long" if pos.size > 0 else "short",
+                    confidence=0.0,
+                    entry_capital=abs(pos.size) * pos.entry_price,
+                    entry_time=now,
+                    take_profit_pct=config.get("take_profit_pct", 2.0),
+                    stop_loss_pct=config.get("stop_loss_pct", 1.0),
+                    timeout_minutes=config.get("timeout_minutes", 30),
+                    entry_price=pos.entry_price,
+                    status="open",
+                    order_ids=[o["oid"] for o in orders if o.get("coin") == pos.coin and o.get("reduceOnly")],
+                )
+                self.open_trades.append(trade)
+                logger.warning("LIVE adopted untracked %s %s position $%.2f", trade.coin, trade.direction,
+                               trade.entry_capital)
+        logger.info("Live reconcile: %d open, %d closed while down, %d adopted",
+                    len(self.open_trades), len(closed), len(orphans))
+        self._save_state()
+        return closed
+
+    def _exit_fill_price(self, trade: Trade) -> float | None:
+        """Average price of the account's closing fills on ``trade.coin`` since the entry."""
+        try:
+            fills = self._post("/info", {"type": "userFillsByTime", "user": self.tracker.address,
+                                         "startTime": int(trade.entry_time * 1000)})
+        except Exception as e:
+            logger.warning("Fills fetch failed for %s: %s", trade.coin, e)
+            return None
+        closing = "B" if trade.direction == "short" else "A"
+        size = notional = 0.0
+        for f in fills or []:
+            if f.get("coin") == trade.coin and f.get("side") == closing:
+                sz = float(f["sz"])
+                size += sz
+                notional += sz * float(f["px"])
+        return notional / size if size else None
+
+    def _post(self, path: str, payload: dict):
+        started = time.perf_counter()
+        ok, size = False, 0
+        try:
+            resp = self.session.post(f"{self.base_url}{path}", json=payload, timeout=self.timeout)
+            size = len(resp.content)
+            resp.raise_for_status()
+            ok = True
+            return resp.json()
+        finally:
+            endpoint = payload.get("type") or payload.get("action", {}).get("type", "?")
+            metrics.observe_request("hyperliquid", f"{path}:{endpoint}", time.perf_counter() - started, size, ok)
+
+    def _load_meta(self):
+        meta = self._post("/info", {"type": "meta"})
+        self._assets = {
+            a["name"]: (i, int(a.get("szDecimals", 0))) for i, a in enumerate(meta["universe"])
+        }
+
+    def _mid(self, coin: str) -> float | None:
+        if coin not in self._mids or time.time() - self._mids_at > MID_MAX_AGE_SECONDS:
+            self.update_prices({k: float(v) for k, v in self._post("/info", {"type": "allMids"}).items()})
+        return self._mids.get(coin)
+
+    def update_prices(self, prices: dict[str, float]):
+        self._mids.update(prices)
+        self._mids_at = time.time()
+
+    def warm_up(self):
+        """Load asset metadata and open the pooled connection ahead of the first signal."""
+        if not self._assets:
+            self._load_meta()
+
+    def _submit(self, action: dict) -> dict:
+        nonce = self.nonces.next()
+        payload = {
+            "action": action,
+            "nonce": nonce,
+            "signature": self.signer.sign(action, nonce),
+            "vaultAddress": None,
+        }
+        return self._post("/exchange", payload)
+
+    @staticmethod
+    def _statuses(resp: dict) -> list[dict]:
+        if resp.get("status") != "ok":
+            raise RuntimeError(f"exchange rejected action: {resp.get('response')}")
+        return resp["response"]["data"]["statuses"]
+
+    def _order_wire(self, asset: int, is_buy: bool, px: float, sz: float, reduce_only: bool,
+                    trigger: tuple[float, str] | None = None) -> dict:
+        if trigger is None:
+            order_type = {"limit": {"tif": "Ioc"}}
+        else:
+            trigger_px, tpsl = trigger
+            order_type = {"trigger": {"isMarket": True, "triggerPx": float_to_wire(trigger_px), "tpsl": tpsl}}
+        return {
+            "a": asset,
+            "b": is_buy,
+            "p": float_to_wire(px),
+            "s": float_to_wire(sz),
+            "r": reduce_only,
+            "t": order_type,
+        }
+
+    def build_entry_action(self, coin: str, direction: str, capital: float, mid: float,
+                           take_profit_pct: float, stop_loss_pct: float) -> dict | None:
+        """Entry IOC plus TP/SL triggers as one ``order`` action, or None if size rounds to 0."""
+        self.warm_up()
+        asset, sz_decimals = self._assets[coin]
+        size = round_size(capital / mid, sz_decimals)
+        if size <= 0:
+            return None
+
+        is_buy = direction == "long"
+        sign = 1 if is_buy else -1
+        slip = self.slippage_pct / 100
+        entry_px = round_price(mid * (1 + sign * slip), sz_decimals)
+        tp_px = round_price(mid * (1 + sign * take_profit_pct / 100), sz_decimals)
+        sl_px = round_price(mid * (1 - sign * stop_loss_pct / 100), sz_decimals)
+        # Trigger orders execute as market; the limit price bounds their slippage
+        tp_limit = round_price(tp_px * (1 - sign * slip), sz_decimals)
+        sl_limit = round_price(sl_px * (1 - sign * slip), sz_decimals)
+
+        return {
+            "type": "order",
+            "orders": [
+                self._order_wire(asset, is_buy, entry_px, size, False),
+                self._order_wire(asset, not is_buy, tp_limit, size, True, (tp_px, "tp")),
+                self._order_wire(asset, not is_buy, sl_limit, size, True, (sl_px, "sl")),
+            ],
+            "grouping": "normalTpsl",
+        }
+
+    def execute_trade(self, decision: Decision, capital: float, config: dict) -> Trade | None:
+        if self.signer is None:
             logger.error("Cannot execute live trade: no private key configured")
             return None
 
-        # TODO: Implement real order placement via Hyperliquid exchange API
-        # This requires:
-        # 1. Sign the order with private key (EIP-712 signature)
-        # 2. POST to https://api.hyperliquid.xyz/exchange
-        # 3. Place market order with TP/SL attached
-        #
-        # Example payload structure:
-        # {
-        #     "action": {
-        #         "type": "order",
-        #         "orders": [{
-        #             "a": asset_index,
-        #             "b": is_buy,
-        #             "p": price,
-        #             "s": size,
-        #             "r": reduce_only,
-        #             "t": {"limit": {"tif": "Ioc"}}
-        #         }],
-        #         "grouping": "na"
-        #     },
-        #     "nonce": timestamp_ms,
-        #     "signature": signed_hash
-        # }
-
-        logger.warning(
-            f"LIVE TRADE (NOT IMPLEMENTED): {decision['coin']} {decision['direction'].upper()} "
-            f"${capital:.2f}"
+        coin = decision["coin"]
+        started = time.perf_counter()
+        try:
+            mid = self._mid(coin)
+            self.warm_up()
+            if mid is None or coin not in self._assets:
+                logger.error("Cannot execute live trade: no price/asset for %s", coin)
+                return None
+            action = self.build_entry_action(
+                coin, decision["direction"], capital, mid,
+                config.get("take_profit_pct", 2.0), config.get("stop_loss_pct", 1.0),
+            )
+            if action is None:
+                logger.warning("LIVE TRADE skipped: %s size rounds to zero for $%.2f", coin, capital)
+                return None
+            statuses = self._statuses(self._submit(action))
+        except Exception as e:
+            logger.error("LIVE TRADE failed: %s %s: %s", coin, decision["direction"], e)
+            return None
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        entry = statuses[0] if statuses else {}
+        filled = entry.get("filled")
+        if not filled:
+            logger.error("LIVE TRADE not filled: %s %s: %s", coin, decision["direction"], entry)
+            return None
+
+        trade = Trade(
+            id=uuid.uuid4().hex[:12],
+            coin=coin,
+            direction=decision["direction"],
+            confidence=decision["confidence"],
+            entry_capital=float(filled["totalSz"]) * float(filled["avgPx"]),
+            entry_time=time.time(),
+            take_profit_pct=config.get("take_profit_pct", 2.0),
+            stop_loss_pct=config.get("stop_loss_pct", 1.0),
+            timeout_minutes=config.get("timeout_minutes", 30),
+            entry_price=float(filled["avgPx"]),
+            status="open",
+            order_ids=[s["resting"]["oid"] for s in statuses[1:] if "resting" in s],
+        )
+        self.open_trades.append(trade)
+        self._save_state()
+        self.tracker.refresh()
+        logger.info(
+            "LIVE TRADE: %s %s $%.2f @ %s confidence=%.1f%% ack=%.1fms",
+            coin, trade.direction.upper(), trade.entry_capital, filled["avgPx"],
+            trade.confidence * 100, latency_ms,
+        )
+        return trade
+
+    def _close(self, trade: Trade, price: float, reason: str) -> Trade:
+        entry = trade.entry_price
+        if trade.direction == "long":
+            pnl_pct = (price - entry) / entry * 100
+        else:
+            pnl_pct = (entry - price) / entry * 100
+        trade.exit_price = price
+        trade.exit_time = time.time()
+        trade.pnl_pct = pnl_pct
+        trade.pnl_usd = trade.entry_capital * pnl_pct / 100
+        trade.exit_reason = reason
+        trade.status = "closed"
+        self.total_pnl += trade.pnl_usd
+        self.closed_trades.append(trade)
+        logger.info(
+            "LIVE CLOSE: %s %s %s PnL=%+.2f%% ($%+.2f) Total=$%+.2f",
+            trade.coin, trade.direction, reason, pnl_pct, trade.pnl_usd, self.total_pnl,
         )
-        return None
+        return trade
+
+    def _flatten(self, trade: Trade, mid: float) -> float:
+        """Flatten with a reduce-only IOC and cancel the resting TP/SL in one round trip each."""
+        asset, sz_decimals = self._assets[trade.coin]
+        is_buy = trade.direction == "short"
+        sign = 1 if is_buy else -1
+        px = round_price(mid * (1 + sign * self.slippage_pct / 100), sz_decimals)
+        size = round_size(trade.entry_capital / trade.entry_price, sz_decimals)
+        statuses = self._statuses(self._submit({
+            "type": "order",
+            "orders": [self._order_wire(asset, is_buy, px, size, True)],
+            "grouping": "na",
+        }))
+        if trade.order_ids:
+            self._submit({"type": "cancel", "cancels": [{"a": asset, "o": oid} for oid in trade.order_ids]})
+        filled = statuses[0].get("filled") if statuses else None
+        return float(filled["avgPx"]) if filled else mid
 
     def check_open_trades(self, current_prices: dict[str, float]) -> list[dict]:
-        # TODO: Query actual open positions and check TP/SL status
+        self.update_prices(current_prices)
+        if not self.open_trades:
+            return []
+        positions, updated = self.tracker.snapshot()
+        now = time.time()
+        closed = []
+        for trade in self.open_trades:
+            price = current_prices.get(trade.coin)
+            if price is None:
+                continue
+            # Only trust a position snapshot taken after the entry was acked
+            if updated > trade.entry_time and trade.coin not in positions:
+                closed.append(self._close(trade, self._exit_fill_price(trade) or price, "exchange"))
+            elif now - trade.entry_time > trade.timeout_minutes * 60:
+                try:
+                    closed.append(self._close(trade, self._flatten(trade, price), "timeout"))
+                except Exception as e:
+                    logger.error("LIVE timeout close failed for %s: %s", trade.coin, e)
+        if closed:
+            self.open_trades = [t for t in self.open_trades if t.status == "open"]
+            self._save_state()
+            self.tracker.refresh()
+        return closed
+
+    def on_price_tick(self, prices: dict[str, float]) -> list[dict]:
+        self.update_prices(prices)
         return []
 
+    def close_trades(self, coin: str, direction: str, price: float, reason: str) -> list[dict]:
+        closed = []
+        for trade in self.open_trades:
+            if trade.coin == coin and trade.direction == direction and trade.entry_price is not None:
+                try:
+                    closed.append(self._close(trade, self._flatten(trade, price), reason))
+                except Exception as e:
+                    logger.error("LIVE %s close failed for %s: %s", reason, trade.coin, e)
+        if closed:
+            self.open_trades = [t for t in self.open_trades if t.status == "open"]
+            self._save_state()
+            self.tracker.refresh()
+        return closed
+
     def get_open_positions(self) -> list[dict]:
-        # TODO: Query actual positions from Hyperliquid
-        return []
+        return list(self.open_trades)
+
+    def shutdown(self):
+        if self.tracker is not None:
+            self.tracker.stop()
+        self.session.close()
@@ -1,123 +1,192 @@
-import time
 import json
+import uuid
 from pathlib import Path
 from src.execution.executor import Executor
+from src.execution.exit_engine import TIMEOUT, ExitEngine
+from src.execution.fill_model import FillSimulator
+from src.models import Decision, Trade
+from src.utils import clock
 from src.utils.logger import setup_logger
 
 logger = setup_logger("executor.paper")
 
 
 class PaperExecutor(Executor):
-    """Simulated trade executor — tracks virtual PnL."""
-
-    def __init__(self, state_path: str = "data/paper_state.json"):
-        self.state_path = Path(state_path)
-        self.state_path.parent.mkdir(parents=True, exist_ok=True)
-        self.open_trades: list[dict] = []
-        self.closed_trades: list[dict] = []
+    """Simulated trade executor — tracks virtual PnL.
+
+    Exits are driven by an ExitEngine, so ``on_price_tick`` can be fed every
+    price update between poll cycles and only touches trades whose TP/SL
+    level was actually crossed.
+
+    With a ``FillSimulator`` entries and exits walk the L2 book (after the
+    simulated latency) and pay taker fees; without one they fill at mid.
+    """
+
+    def __init__(self, state_path: str | None = "data/paper_state.json", fill_model: FillSimulator = None,
+                 autosave: bool = True, keep_closed: int | None = 200):
+        # state_path=None keeps everything in memory (parameter sweeps)
+        self.state_path = Path(state_path) if state_path else None
+        if self.state_path is not None:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.open_trades: list[Trade] = []
+        self.closed_trades: list[Trade] = []
         self.total_pnl: float = 0.0
+        self._exits = ExitEngine()
+        self._by_id: dict[str, Trade] = {}
+        self.fill_model = fill_model
+        self.autosave = autosave  # False: only ``save_state()`` writes (backtests)
+        self.keep_closed = keep_closed  # closed trades kept in the state file (None = all)
         self._load_state()
 
     def _load_state(self):
-        if self.state_path.exists():
+        if self.state_path is not None and self.state_path.exists():
             try:
                 data = json.loads(self.state_path.read_text())
-                self.open_trades = data.get("open_trades", [])
-                self.closed_trades = data.get("closed_trades", [])
+                self.open_trades = [Trade.from_dict(t) for t in data.get("open_trades", [])]
+                self.closed_trades = [Trade.from_dict(t) for t in data.get("closed_trades", [])]
                 self.total_pnl = data.get("total_pnl", 0.0)
             except Exception:
                 pass
+        for trade in self.open_trades:
+            trade.id = trade.id or uuid.uuid4().hex[:12]
+            self._by_id[trade.id] = trade
+            if trade.entry_price is not None:
+                self._arm(trade)
 
     def _save_state(self):
+        if self.autosave:
+            self.save_state()
+
+    def save_state(self):
+        if self.state_path is None:
+            return
+        closed = self.closed_trades if self.keep_closed is None else self.closed_trades[-self.keep_closed:]
         data = {
-            "open_trades": self.open_trades,
-            "closed_trades": self.closed_trades[-200:],
+            "open_trades": [t.to_dict() for t in self.open_trades],
+            "closed_trades": [t.to_dict() for t in closed],
             "total_pnl": self.total_pnl,
-            "updated": time.time(),
+            "updated": clock.now(),
         }
         self.state_path.write_text(json.dumps(data, indent=2))
 
-    def execute_trade(self, decision: dict, capital: float, config: dict) -> dict | None:
-        trade = {
-            "coin": decision["coin"],
-            "direction": decision["direction"],
-            "confidence": decision["confidence"],
-            "entry_capital": capital,
-            "entry_time": time.time(),
-            "take_profit_pct": config.get("take_profit_pct", 2.0),
-            "stop_loss_pct": config.get("stop_loss_pct", 1.0),
-            "timeout_minutes": config.get("timeout_minutes", 30),
-            "entry_price": None,  # Set on first price check
-            "status": "open",
-        }
+    def _arm(self, trade: Trade):
+        self._exits.add(
+            trade.id, trade.coin, trade.direction, trade.entry_price,
+            trade.take_profit_pct, trade.stop_loss_pct,
+            trade.entry_time + trade.timeout_minutes * 60,
+        )
+
+    def execute_trade(self, decision: Decision, capital: float, config: dict) -> Trade | None:
+        trade = Trade(
+            id=uuid.uuid4().hex[:12],
+            coin=decision["coin"],
+            direction=decision["direction"],
+            confidence=decision["confidence"],
+            entry_capital=capital,
+            entry_time=clock.now(),
+            take_profit_pct=config.get("take_profit_pct", 2.0),
+            stop_loss_pct=config.get("stop_loss_pct", 1.0),
+            timeout_minutes=config.get("timeout_minutes", 30),
+            entry_price=None,  # Set on first price check
+            status="open",
+        )
 
         self.open_trades.append(trade)
+        self._by_id[trade.id] = trade
         self._save_state()
         logger.info(
-            f"PAPER TRADE: {decision['coin']} {decision['direction'].upper()} "
-            f"${capital:.2f} confidence={decision['confidence']:.1%}"
+            "PAPER TRADE: %s %s $%.2f confidence=%.1f%%",
+            trade.coin, trade.direction.upper(), capital, trade.confidence * 100,
+        )
+        return trade
+
+    def _fill_entry(self, trade: Trade, mid: float):
+        if self.fill_model is None:
+            trade.entry_price = mid
+            return
+        fill = self.fill_model.fill(trade.coin, trade.direction == "long", mid, notional=trade.entry_capital)
+        trade.entry_price = fill.price
+        trade.fees_usd = fill.fee_usd
+        logger.debug("%s entry fill %.6g (%.1f bps vs mid)", trade.coin, fill.price, fill.slippage_bps)
+
+    def _close(self, trade: Trade, price: float, reason: str) -> Trade:
+        entry = trade.entry_price
+        fees = trade.fees_usd or 0.0
+        if self.fill_model is not None:
+            fill = self.fill_model.fill(trade.coin, trade.direction == "short", price,
+                                        size=trade.entry_capital / entry)
+            price = fill.price
+            fees += fill.fee_usd
+            trade.fees_usd = fees
+        if trade.direction == "long":
+            pnl_pct = (price - entry) / entry * 100
+        else:
+            pnl_pct = (entry - price) / entry * 100
+        pnl_pct -= fees / trade.entry_capital * 100
+        pnl_usd = trade.entry_capital * pnl_pct / 100
+
+        trade.exit_price = price
+        trade.exit_time = clock.now()
+        trade.pnl_pct = pnl_pct
+        trade.pnl_usd = pnl_usd
+        trade.exit_reason = reason
+        trade.status = "closed"
+
+        self.total_pnl += pnl_usd
+        self.closed_trades.append(trade)
+        del self._by_id[trade.id]
+
+        logger.info(
+            "PAPER CLOSE: %s %s %s PnL=%+.2f%% ($%+.2f) Total=$%+.2f",
+            trade.coin, trade.direction, reason, pnl_pct, pnl_usd, self.total_pnl,
         )
         return trade
 
-    def check_open_trades(self, current_prices: dict[str, float]) -> list[dict]:
+    def _apply_prices(self, prices: dict[str, float]) -> list[Trade]:
         closed = []
-        still_open = []
+        changed = False
+        for coin, price in prices.items():
+            for trade_id, reason in self._exits.on_tick(coin, price):
+                closed.append(self._close(self._by_id[trade_id], price, reason))
+
+        for trade_id in self._exits.expired(clock.now(), set(prices)):
+            trade = self._by_id[trade_id]
+            closed.append(self._close(trade, prices[trade.coin], TIMEOUT))
 
+        # Entry fills on the first price observed after the trade was opened
+        # (and after the simulated order latency, with a fill model)
         for trade in self.open_trades:
-            coin = trade["coin"]
-            price = current_prices.get(coin)
-            if price is None:
-                still_open.append(trade)
-                continue
-
-            # Set entry price on first check
-            if trade["entry_price"] is None:
-                trade["entry_price"] = price
-                still_open.append(trade)
-                continue
-
-            entry = trade["entry_price"]
-            direction = trade["direction"]
-            elapsed_min = (time.time() - trade["entry_time"]) / 60
-
-            # Calculate PnL %
-            if direction == "long":
-                pnl_pct = (price - entry) / entry * 100
-            else:
-                pnl_pct = (entry - price) / entry * 100
-
-            # Check exit conditions
-            reason = None
-            if pnl_pct >= trade["take_profit_pct"]:
-                reason = "take_profit"
-            elif pnl_pct <= -trade["stop_loss_pct"]:
-                reason = "stop_loss"
-            elif elapsed_min >= trade["timeout_minutes"]:
-                reason = "timeout"
-
-            if reason:
-                pnl_usd = trade["entry_capital"] * pnl_pct / 100
-                trade["exit_price"] = price
-                trade["exit_time"] = time.time()
-                trade["pnl_pct"] = pnl_pct
-                trade["pnl_usd"] = pnl_usd
-                trade["exit_reason"] = reason
-                trade["status"] = "closed"
-
-                self.total_pnl += pnl_usd
-                self.closed_trades.append(trade)
-                closed.append(trade)
-
-                logger.info(
-                    f"PAPER CLOSE: {coin} {direction} {reason} "
-                    f"PnL={pnl_pct:+.2f}% (${pnl_usd:+.2f}) Total=${self.total_pnl:+.2f}"
-                )
-            else:
-                still_open.append(trade)
-
-        self.open_trades = still_open
-        self._save_state()
+            if trade.entry_price is None and trade.coin in prices:
+                if self.fill_model is not None and not self.fill_model.ready(trade.entry_time):
+                    continue
+                self._fill_entry(trade, prices[trade.coin])
+                self._arm(trade)
+                changed = True
+
+        if closed:
+            self.open_trades = [t for t in self.open_trades if t.status == "open"]
+        if closed or changed:
+            self._save_state()
+        return closed
+
+    def on_price_tick(self, prices: dict[str, float]) -> list[Trade]:
+        """Evaluate TP/SL/timeouts against fresh prices between poll cycles."""
+        return self._apply_prices(prices)
+
+    def check_open_trades(self, current_prices: dict[str, float]) -> list[Trade]:
+        # _apply_prices saves when a trade filled or closed
+        return self._apply_prices(current_prices)
+
+    def close_trades(self, coin: str, direction: str, price: float, reason: str) -> list[Trade]:
+        closed = []
+        for trade in self.open_trades:
+            if trade.coin == coin and trade.direction == direction and trade.entry_price is not None:
+                self._exits.remove(trade.id)
+                closed.append(self._close(trade, price, reason))
+        if closed:
+            self.open_trades = [t for t in self.open_trades if t.status == "open"]
+            self._save_state()
         return closed
 
-    def get_open_positions(self) -> list[dict]:
+    def get_open_positions(self) -> list[Trade]:
         return list(self.open_trades)
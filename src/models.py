@@ -0,0 +1,231 @@
+"""Typed records for data flowing between src/data, src/signals and src/execution.
+
+Records use ``__slots__`` for compact storage and fast attribute access, and
+also speak the subset of the dict protocol the rest of the code relies on
+(``rec["field"]``, ``rec.get``, ``in``, ``to_dict``), so callers and tests that
+still pass or expect plain dicts keep working. A field is a key once it has
+been given, even as None, exactly as in the dict it replaces; a field not
+given reads as None and becomes a key when it gets a value. Unlike a dict,
+assigning an unknown field raises instead of silently adding a typo'd key.
+
+Bulk data uses structured numpy arrays (see ``PositionBatch``).
+"""
+import numpy as np
+
+
+class Record:
+    # Fields not given at construction: a frozenset shared by records built with the same keywords
+    __slots__ = ("_absent",)
+    _FIELDS: frozenset = frozenset()  # field names, per subclass
+    _ABSENT: dict = {}  # keyword names given -> ``_absent``, per subclass
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._FIELDS = frozenset(cls.__slots__)
+        cls._ABSENT = {}
+
+    def __init__(self, **fields):
+        names = tuple(fields)
+        absent = self._ABSENT.get(names)
+        if absent is None:
+            if not self._FIELDS.issuperset(fields):
+                raise TypeError(f"{type(self).__name__} has no fields {sorted(fields.keys() - self._FIELDS)}")
+            absent = self._FIELDS.difference(fields)
+            # Share one set per distinct set of absent fields
+            absent = self._ABSENT[names] = next((a for a in self._ABSENT.values() if a == absent), absent)
+        self._absent = absent
+        get = fields.get
+        for name in self.__slots__:
+            setattr(self, name, get(name))
+
+    # Mapping shim for code and tests that still treat records as dicts; hot
+    # paths use attribute access. A field not given is an absent key until it
+    # holds a value, so ``get``/``in``/``[]`` see exactly what the dict would.
+
+    def __getitem__(self, key: str):
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            if value is not None or key not in self._absent:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+        if key in self._absent:
+            self._absent = self._absent - {key}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._FIELDS and (key not in self._absent or getattr(self, key) is not None)
+
+    def get(self, key: str, default=None):
+        if key in self._FIELDS:
+            value = getattr(self, key)
+            if value is not None or key not in self._absent:
+                return value
+        return default
+
+    def keys(self):
+        absent = self._absent
+        return [k for k in self.__slots__ if k not in absent or getattr(self, k) is not None]
+
+    def items(self):
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def to_dict(self) -> dict:
+        return {k: _plain(v) for k, v in self.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**{k: v for k, v in data.items() if k in cls._FIELDS})
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and dict(self.items()) == dict(other.items())
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.items())
+        return f"{type(self).__name__}({fields})"
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {name: s.to_dict() if isinstance(s, Record) else s for name, s in value.items()}
+    return value
+
+
+class Position(Record):
+    """Open perp position of a single wallet. size > 0 = long, < 0 = short."""
+
+    __slots__ = (
+        "coin", "size", "entry_price", "liquidation_price", "leverage",
+        "unrealized_pnl", "margin_used", "wallet",
+        "margin_mode",  # "cross" | "isolated" (None when unknown)
+        "max_leverage",  # coin's max leverage; maintenance margin is half its initial margin
+    )
+
+
+class Order(Record):
+    """Open (possibly trigger) order of a single wallet."""
+
+    __slots__ = (
+        "wallet", "coin", "side", "price", "size", "order_type", "trigger_condition", "trigger_px",
+    )
+
+
+class FundingSignal(Record):
+    __slots__ = ("strength", "direction", "rate")
+
+
+class OISignal(Record):
+    __slots__ = ("strength", "direction", "oi_delta", "price_delta")
+
+
+class LiquidationSignal(Record):
+    __slots__ = ("strength", "direction", "cluster_price", "cluster_volume", "distance_pct")
+
+
+class PullSignal(Record):
+    __slots__ = ("strength", "direction", "net_pull", "target_price", "distance_pct")
+
+
+class CascadeEvent(Record):
+    __slots__ = (
+        "coin", "direction", "time", "price", "imbalance", "trade_rate", "velocity_pct", "cluster_hits", "strength",
+    )
+
+
+class Decision(Record):
+    __slots__ = ("coin", "direction", "confidence", "signals", "target_price")
+
+
+class Trade(Record):
+    """Paper/live trade. Fields after ``status`` are filled in on exit.
+
+    ``order_ids`` holds the exchange ids of a live trade's resting TP/SL orders;
+    ``fees_usd`` the simulated/actual trading fees (already netted out of PnL).
+    """
+
+    __slots__ = (
+        "id", "coin", "direction", "confidence", "entry_capital", "entry_time",
+        "take_profit_pct", "stop_loss_pct", "timeout_minutes", "entry_price", "status",
+        "exit_price", "exit_time", "pnl_pct", "pnl_usd", "exit_reason", "order_ids",
+        "fees_usd",
+    )
+    _ALWAYS = frozenset(__slots__[:__slots__.index("status") + 1])
+
+    def to_dict(self) -> dict:
+        # Exit fields only appear once set, matching the persisted state format
+        return {k: v for k, v in super().to_dict().items() if v is not None or k in self._ALWAYS}
+
+
+POSITION_DTYPE = np.dtype([
+    ("size", "f8"),
+    ("entry_price", "f8"),
+    ("liquidation_price", "f8"),  # NaN when unknown
+    ("leverage", "f8"),
+    ("margin_used", "f8"),
+    ("unrealized_pnl", "f8"),
+])
+
+
+class PositionBatch:
+    """Positions for one coin as a structured array, with wallets alongside.
+
+    Iterating yields Position records, so a batch can stand in anywhere a
+    list of positions is expected; vectorized consumers use ``data`` directly.
+    """
+
+    __slots__ = ("coin", "data", "wallets")
+
+    def __init__(self, coin: str, data: np.ndarray, wallets: list[str] | None = None):
+        self.coin = coin
+        self.data = data
+        self.wallets = wallets if wallets is not None else [None] * len(data)
+
+    @classmethod
+    def from_records(cls, coin: str, positions) -> "PositionBatch":
+        data = np.empty(len(positions), dtype=POSITION_DTYPE)
+        wallets = []
+        for i, pos in enumerate(positions):
+            liq = pos.get("liquidation_price")
+            data[i] = (
+                pos.get("size", 0),
+                pos.get("entry_price", 0),
+                np.nan if liq is None else liq,
+                pos.get("leverage", 1),
+                pos.get("margin_used", 0),
+                pos.get("unrealized_pnl", 0),
+            )
+            wallets.append(pos.get("wallet"))
+        return cls(coin, data, wallets)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+
+    def _record(self, row: tuple, wallet: str | None) -> Position:
+        size, entry, liq, lev, margin, upnl = row
+        return Position(
+            coin=self.coin, size=size, entry_price=entry,
+            liquidation_price=None if liq != liq else liq,
+            leverage=lev, unrealized_pnl=upnl, margin_used=margin, wallet=wallet,
+        )
+
+    def __getitem__(self, i: int) -> Position:
+        return self._record(self.data[i].tolist(), self.wallets[i])
+
+    def __iter__(self):
+        for row, wallet in zip(self.data.tolist(), self.wallets):
+            yield self._record(row, wallet)
+
+    def to_records(self) -> list[Position]:
+        return list(self)
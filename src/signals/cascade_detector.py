@@ -0,0 +1,151 @@
+"""Streaming liquidation cascade detector over public trades.
+
+Per coin, a sliding ``window_seconds`` window keeps running sums that are
+updated in O(1) per trade (amortized eviction from the front of a deque):
+buy and sell taker notional, trade count, the first price in the window
+and how many trades printed within ``cluster_band_pct`` of a known
+liquidation cluster. A long-run trade rate is kept as a bias-corrected
+exponentially decayed counter, so no history beyond the window is stored;
+the window itself is capped at ``max_trades`` entries per coin.
+
+Onset is flagged when, inside the window, taker flow is one-sided
+(``imbalance``), price has moved the same way by ``velocity_pct`` and the
+trade rate is ``rate_multiplier`` times its baseline. Direction follows the
+move: selling into a falling price liquidates longs -> "short".
+"""
+import math
+import threading
+from bisect import bisect_left
+from collections import deque
+
+from src.models import CascadeEvent
+from src.utils.logger import setup_logger
+
+logger = setup_logger("signal.cascade")
+
+
+class _CoinWindow:
+    __slots__ = ("trades", "buy", "sell", "hits", "slow", "slow_at", "started", "last_event")
+
+    def __init__(self, t: float):
+        self.trades: deque = deque()  # (time, price, notional, is_buy, hit)
+        self.buy = 0.0
+        self.sell = 0.0
+        self.hits = 0
+        self.slow = 0.0  # decayed trade count
+        self.slow_at = t
+        self.started = t
+        self.last_event = -math.inf
+
+    def pop(self):
+        _, _, notional, is_buy, hit = self.trades.popleft()
+        if is_buy:
+            self.buy -= notional
+        else:
+            self.sell -= notional
+        self.hits -= hit
+
+
+class CascadeDetector:
+    def __init__(self, window_seconds: float = 10.0, min_trades: int = 20, imbalance: float = 0.6,
+                 velocity_pct: float = 0.4, rate_multiplier: float = 3.0, baseline_seconds: float = 600.0,
+                 cluster_band_pct: float = 0.25, cooldown_seconds: float = 120.0, max_trades: int = 5000):
+        self.window_seconds = window_seconds
+        self.min_trades = min_trades
+        self.imbalance = imbalance
+        self.velocity_pct = velocity_pct
+        self.rate_multiplier = rate_multiplier
+        self.baseline_seconds = baseline_seconds
+        self.cluster_band_pct = cluster_band_pct
+        self.cooldown_seconds = cooldown_seconds
+        self.max_trades = max_trades
+        self._windows: dict[str, _CoinWindow] = {}
+        self._clusters: dict[str, list[float]] = {}
+        self._events: deque[CascadeEvent] = deque(maxlen=1000)  # bounded if nobody drains
+        self._lock = threading.Lock()
+
+    def set_clusters(self, coin: str, prices: list[float]):
+        """Known liquidation cluster prices for ``coin`` (e.g. from the heatmap)."""
+        self._clusters[coin] = sorted(prices)
+
+    def _near_cluster(self, coin: str, price: float) -> bool:
+        levels = self._clusters.get(coin)
+        if not levels:
+            return False
+        i = bisect_left(levels, price)
+        band = price * self.cluster_band_pct / 100
+        return any(abs(levels[j] - price) <= band for j in (i - 1, i) if 0 <= j < len(levels))
+
+    def on_trades(self, trades):
+        """Feed TradePrints (stream callback); returns events flagged by this batch."""
+        events = []
+        for trade in trades:
+            event = self.on_trade(trade.coin, trade.time, trade.price, trade.size, trade.is_buy)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def on_trade(self, coin: str, t: float, price: float, size: float, is_buy: bool) -> CascadeEvent | None:
+        w = self._windows.get(coin)
+        if w is None:
+            w = self._windows[coin] = _CoinWindow(t)
+        trades = w.trades
+        while trades and (trades[0][0] <= t - self.window_seconds or len(trades) >= self.max_trades):
+            w.pop()
+        notional = price * size
+        hit = self._near_cluster(coin, price)
+        trades.append((t, price, notional, is_buy, hit))
+        if is_buy:
+            w.buy += notional
+        else:
+            w.sell += notional
+        w.hits += hit
+        w.slow = w.slow * math.exp(-max(t - w.slow_at, 0.0) / self.baseline_seconds) + 1
+        w.slow_at = t
+        return self._evaluate(coin, w, t, price)
+
+    def _evaluate(self, coin: str, w: _CoinWindow, t: float, price: float) -> CascadeEvent | None:
+        n = len(w.trades)
+        total = w.buy + w.sell
+        if n < self.min_trades or total <= 0 or t - w.last_event < self.cooldown_seconds:
+            return None
+        imbalance = (w.buy - w.sell) / total
+        velocity = (price / w.trades[0][1] - 1) * 100
+        if imbalance * velocity <= 0 or abs(imbalance) < self.imbalance or abs(velocity) < self.velocity_pct:
+            return None
+        # Decayed count / its expected value so far = unbiased long-run rate, even right after start
+        elapsed = max(t - w.started, self.window_seconds)
+        baseline = w.slow / (self.baseline_seconds * -math.expm1(-elapsed / self.baseline_seconds))
+        rate = n / self.window_seconds
+        if rate < self.rate_multiplier * baseline:
+            return None
+
+        w.last_event = t
+        score = (min(abs(imbalance), 1.0)
+                 + min(abs(velocity) / (2 * self.velocity_pct), 1.0)
+                 + min(rate / baseline / (2 * self.rate_multiplier), 1.0)) / 3
+        event = CascadeEvent(
+            coin=coin,
+            direction="long" if velocity > 0 else "short",
+            time=t,
+            price=price,
+            imbalance=imbalance,
+            trade_rate=rate,
+            velocity_pct=velocity,
+            cluster_hits=w.hits,
+            strength=min(1.0, score + 0.25 * w.hits / n),
+        )
+        with self._lock:
+            self._events.append(event)
+        logger.info(
+            "CASCADE %s %s: %.2f%% in %ss, imbalance %+.2f, %.1f trades/s (%.1fx), %d near clusters",
+            coin, event.direction.upper(), velocity, self.window_seconds, imbalance, rate, rate / baseline, w.hits,
+        )
+        return event
+
+    def drain(self) -> list[CascadeEvent]:
+        """Events flagged since the last call (safe to call from another thread)."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+        return events
@@ -0,0 +1,93 @@
+from src.signals.funding_signal import evaluate_funding_signal
+from src.signals.oi_divergence import evaluate_oi_signal
+from src.signals.liquidation_map import LiquidationHeatmap, build_liquidation_clusters, evaluate_liquidation_signal
+from src.signals.pull_field import pull_signals
+from src.signals.signal_aggregator import WEIGHTS, aggregate_signals
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("signal.evaluator")
+
+
+def evaluate_coins(
+    coins: list[str],
+    prices: dict[str, float],
+    funding_rates: dict[str, float],
+    funding_thresholds: dict[str, float],
+    oi_deltas: dict[str, float | None],
+    price_deltas: dict[str, float | None],
+    oi_thresholds: dict[str, float],
+    positions_by_coin: dict[str, list[dict]],
+    sig_cfg: dict,
+    heatmap: LiquidationHeatmap | None = None,
+    staleness: dict[str, float] | None = None,
+) -> list[dict]:
+    """Run the full signal stack for a set of coins and return trade decisions.
+
+    Every input is keyed by coin, so any subset of the universe can be
+    evaluated independently — this is the unit of work handed to a shard.
+    When a heatmap cache is given, clusters are only rebuilt for coins whose
+    positions changed. The pull field is computed for all the coins' clusters
+    in one vectorized pass.
+    """
+    coins = [c for c in coins if c in prices or c in funding_rates or c in oi_deltas]
+
+    liq_signals = {}
+    clusters_by_coin = {}
+    for coin in coins:
+        price = prices.get(coin, 0)
+        if not price:
+            continue
+        clusters = heatmap.cached(coin, price) if heatmap is not None else None
+        if clusters is None:
+            positions = positions_by_coin.get(coin)
+            if not positions:
+                continue
+            with metrics.stage("clusters"):
+                if heatmap is not None:
+                    clusters = heatmap.build(coin, positions, price)
+                else:
+                    clusters = build_liquidation_clusters(positions, price)
+        if clusters:
+            clusters_by_coin[coin] = clusters
+            sig_result = evaluate_liquidation_signal(
+                clusters,
+                price,
+                sig_cfg["liquidation_proximity"],
+                sig_cfg.get("volume_baseline_usd", 100_000),
+            )
+            if sig_result:
+                liq_signals[coin] = sig_result
+
+    pull_cfg = sig_cfg.get("pull_field") or {}
+    pulls = {}
+    # The weight is the only switch: at 0 (the default) the field is not computed
+    pull_weight = (sig_cfg.get("weights") or {}).get("pull", WEIGHTS["pull"])
+    if clusters_by_coin and pull_weight:
+        with metrics.stage("pull_field"):
+            pulls = pull_signals(
+                clusters_by_coin,
+                prices,
+                sig_cfg.get("volume_baseline_usd", 100_000),
+                pull_cfg.get("grid_pct", 0.1),
+                pull_cfg.get("range_pct", 10.0),
+                pull_cfg.get("decay_pct", 1.5),
+            )
+
+    rates = {c: funding_rates[c] for c in coins if c in funding_rates}
+    funding_sigs = evaluate_funding_signal(rates, 0)  # filtered by per-coin threshold below
+    funding_sigs = {
+        c: s for c, s in funding_sigs.items()
+        if abs(s["rate"]) >= funding_thresholds.get(c, sig_cfg["funding_rate_threshold"])
+    }
+
+    deltas = {c: oi_deltas.get(c) for c in coins}
+    oi_sigs = evaluate_oi_signal(deltas, price_deltas, 0)
+    oi_sigs = {
+        c: s for c, s in oi_sigs.items()
+        if abs(s["oi_delta"]) >= oi_thresholds.get(c, sig_cfg["oi_delta_threshold"])
+    }
+
+    return aggregate_signals(
+        funding_sigs, oi_sigs, liq_signals, sig_cfg["min_confidence"], sig_cfg.get("weights"), staleness, pulls,
+    )
@@ -1,9 +1,10 @@
+from src.models import FundingSignal
 from src.utils.logger import setup_logger
 
 logger = setup_logger("signal.funding")
 
 
-def evaluate_funding_signal(funding_rates: dict[str, float], threshold: float) -> dict[str, dict]:
+def evaluate_funding_signal(funding_rates: dict[str, float], threshold: float) -> dict[str, FundingSignal]:
     # Prevent division by zero
     if threshold <= 0:
         threshold = 1e-9
@@ -26,11 +27,7 @@ def evaluate_funding_signal(funding_rates: dict[str, float], threshold: float) -
         strength = min((abs_rate - threshold) / (2 * threshold), 1.0)
         direction = "short" if rate > 0 else "long"
 
-        signals[coin] = {
-            "strength": strength,
-            "direction": direction,
-            "rate": rate,
-        }
-        logger.info(f"{coin} funding signal: rate={rate:.6f} dir={direction} strength={strength:.2f}")
+        signals[coin] = FundingSignal(strength=strength, direction=direction, rate=rate)
+        logger.info("%s funding signal: rate=%.6f dir=%s strength=%.2f", coin, rate, direction, strength)
 
     return signals
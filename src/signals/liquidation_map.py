@@ -1,15 +1,19 @@
+import numpy as np
+
+from src.models import LiquidationSignal, PositionBatch
+from src.utils import metrics
 from src.utils.logger import setup_logger
 
 logger = setup_logger("signal.liqmap")
 
 
 def build_liquidation_clusters(
-    positions: list[dict], current_price: float, bin_pct: float = 0.5
+    positions: list[dict] | PositionBatch, current_price: float, bin_pct: float = 0.5
 ) -> list[dict]:
     """Build liquidation price clusters from whale positions.
 
     Groups liquidation prices into bins of bin_pct width and calculates
-    total volume at each level.
+    total volume at each level. A PositionBatch is binned vectorized.
 
     Returns sorted list of:
     {"price": float, "volume": float, "count": int, "distance_pct": float, "direction": "long"|"short"}
@@ -20,6 +24,8 @@ def build_liquidation_clusters(
     """
     if not positions or current_price <= 0:
         return []
+    if isinstance(positions, PositionBatch):
+        return _build_clusters_batch(positions, current_price, bin_pct)
 
     bins: dict[float, dict] = {}
 
@@ -50,9 +56,41 @@ def build_liquidation_clusters(
     return clusters
 
 
+def _build_clusters_batch(batch: PositionBatch, current_price: float, bin_pct: float) -> list[dict]:
+    data = batch.data
+    liq = data["liquidation_price"]
+    valid = liq > 0  # NaN compares False
+    if not valid.any():
+        return []
+    liq = liq[valid]
+    margin = data["margin_used"][valid]
+    volume = np.where(margin > 0, margin, np.abs(data["size"][valid]) * liq)
+
+    width = current_price * bin_pct / 100
+    bin_idx = np.round(liq / width)
+    # Bins ordered by first appearance, like the dict-based path
+    keys, first, inverse = np.unique(bin_idx, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    volumes = np.bincount(inverse, weights=volume, minlength=len(keys))
+    counts = np.bincount(inverse, minlength=len(keys))
+
+    clusters = []
+    for k in order:
+        price = float(keys[k]) * width
+        clusters.append({
+            "price": price,
+            "volume": float(volumes[k]),
+            "count": int(counts[k]),
+            "direction": "long" if liq[first[k]] < current_price else "short",
+            "distance_pct": abs(price - current_price) / current_price * 100,
+        })
+    clusters.sort(key=lambda x: x["volume"], reverse=True)
+    return clusters
+
+
 def evaluate_liquidation_signal(
     clusters: list[dict], current_price: float, proximity_pct: float, volume_baseline: float = 100_000
-) -> dict | None:
+) -> LiquidationSignal | None:
     """Check if a dense liquidation cluster is within proximity of current price.
 
     Returns signal dict or None:
@@ -82,15 +120,83 @@ def evaluate_liquidation_signal(
     # Short liquidation cluster → price pumps → we go long
     direction = "short" if best["direction"] == "long" else "long"
 
-    signal = {
-        "strength": strength,
-        "direction": direction,
-        "cluster_price": best["price"],
-        "cluster_volume": best["volume"],
-        "distance_pct": best["distance_pct"],
-    }
+    signal = LiquidationSignal(
+        strength=strength,
+        direction=direction,
+        cluster_price=best["price"],
+        cluster_volume=best["volume"],
+        distance_pct=best["distance_pct"],
+    )
     logger.info(
-        f"Liq signal: cluster @ {best['price']:.2f} ({best['distance_pct']:.2f}% away) "
-        f"vol={best['volume']:.0f} dir={direction} strength={strength:.2f}"
+        "Liq signal: cluster @ %.2f (%.2f%% away) vol=%.0f dir=%s strength=%.2f",
+        best["price"], best["distance_pct"], best["volume"], direction, strength,
     )
     return signal
+
+
+class LiquidationHeatmap:
+    """Per-coin cache of liquidation clusters driven by position diff events.
+
+    Subscribe ``on_events`` to a PositionDiffEngine. A coin's clusters are only
+    rebuilt when one of its positions changed, price drifted more than half a
+    bin since the last build, or price crossed a position's liquidation price
+    (flipping its cluster's long/short side); otherwise the cached bins are
+    reused and only their distances are refreshed.
+    """
+
+    def __init__(self, bin_pct: float = 0.5):
+        self.bin_pct = bin_pct
+        # coin -> (build price, clusters, (nearest liquidation price below, at or above it))
+        self._cache: dict[str, tuple[float, list[dict], tuple[float, float]]] = {}
+        self._dirty: set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def on_events(self, events):
+        for event in events:
+            self._dirty.add(event.coin)
+
+    def invalidate(self, coin: str):
+        self._dirty.add(coin)
+
+    def levels(self, coin: str) -> list[float]:
+        """Prices of the coin's last built clusters (empty before the first build)."""
+        cached = self._cache.get(coin)
+        return [c["price"] for c in cached[1]] if cached else []
+
+    def cached(self, coin: str, current_price: float) -> list[dict] | None:
+        """Return cached clusters with refreshed distances, or None if a rebuild is needed."""
+        cached = self._cache.get(coin)
+        if not cached or coin in self._dirty or current_price <= 0:
+            self.misses += 1
+            metrics.cache_result("heatmap", False)
+            return None
+        built_price, clusters, (below, above) = cached
+        # A position is a long liquidation while its price is below the current one
+        if abs(current_price - built_price) / built_price * 100 >= self.bin_pct / 2 or \
+                not below < current_price <= above:
+            self.misses += 1
+            metrics.cache_result("heatmap", False)
+            return None
+        self.hits += 1
+        metrics.cache_result("heatmap", True)
+        for c in clusters:
+            c["distance_pct"] = abs(c["price"] - current_price) / current_price * 100
+        return clusters
+
+    def build(self, coin: str, positions: list[dict] | PositionBatch, current_price: float) -> list[dict]:
+        clusters = build_liquidation_clusters(positions, current_price, self.bin_pct)
+        self._cache[coin] = (current_price, clusters, _side_band(positions, current_price))
+        self._dirty.discard(coin)
+        return clusters
+
+
+def _side_band(positions: list[dict] | PositionBatch, current_price: float) -> tuple[float, float]:
+    """(highest liquidation price below ``current_price``, lowest at or above it); +-inf when none."""
+    if isinstance(positions, PositionBatch):
+        liq = positions.data["liquidation_price"]
+    else:
+        liq = np.array([p.get("liquidation_price") or np.nan for p in positions or ()], dtype=float)
+    liq = liq[liq > 0]  # NaN compares False
+    below, above = liq[liq < current_price], liq[liq >= current_price]
+    return (float(below.max()) if len(below) else -np.inf, float(above.min()) if len(above) else np.inf)
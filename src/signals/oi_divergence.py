@@ -1,3 +1,4 @@
+from src.models import OISignal
 from src.utils.logger import setup_logger
 
 logger = setup_logger("signal.oi")
@@ -7,7 +8,7 @@ def evaluate_oi_signal(
     oi_deltas: dict[str, float | None],
     price_deltas: dict[str, float | None],
     oi_threshold: float,
-) -> dict[str, dict]:
+) -> dict[str, OISignal]:
     # Prevent division by zero
     if oi_threshold <= 0:
         oi_threshold = 1e-9
@@ -51,15 +52,12 @@ def evaluate_oi_signal(
         else:
             continue  # Price following OI, no divergence
 
-        signals[coin] = {
-            "strength": strength,
-            "direction": direction,
-            "oi_delta": oi_delta,
-            "price_delta": price_delta,
-        }
+        signals[coin] = OISignal(
+            strength=strength, direction=direction, oi_delta=oi_delta, price_delta=price_delta
+        )
         logger.info(
-            f"{coin} OI signal: oi_delta={oi_delta:.2f}% price_delta={price_delta:.2f}% "
-            f"dir={direction} strength={strength:.2f}"
+            "%s OI signal: oi_delta=%.2f%% price_delta=%.2f%% dir=%s strength=%.2f",
+            coin, oi_delta, price_delta, direction, strength,
         )
 
     return signals
@@ -0,0 +1,114 @@
+from src.signals.coin_evaluator import evaluate_coins
+from src.signals.liquidation_map import LiquidationHeatmap
+from src.signals.signal_aggregator import merge_decisions
+from src.utils import clock
+
+
+def dynamic_threshold(hist: list[float], base: float) -> float:
+    if len(hist) < 5:
+        return base
+    avg = sum(abs(x) for x in hist) / len(hist)
+    return max(base, avg * 1.5)
+
+
+def trade_capital(decision, capital: float, exe_cfg: dict) -> float:
+    """USD size for a decision: fixed %, or scaled by confidence between min/max %."""
+    if exe_cfg.get("size_by_confidence"):
+        min_pct = exe_cfg.get("min_size_pct", 10)
+        max_pct = exe_cfg.get("max_size_pct", 30)
+        return capital * (min_pct + (max_pct - min_pct) * decision.get("confidence", 0.5)) / 100
+    return capital * exe_cfg["position_size_pct"] / 100
+
+
+def cap_to_depth(capital: float, direction: str, depth, budget_bps: float) -> float:
+    """``capital`` cut to the largest order ``depth`` fills within ``budget_bps`` of slippage."""
+    if depth is None or budget_bps <= 0:
+        return capital
+    return min(capital, depth.max_notional(direction == "long", budget_bps))
+
+
+class SignalPipeline:
+    """The data-source-independent half of a cycle.
+
+    Holds the rolling state (price history, funding/OI threshold windows) and
+    turns one cycle's market inputs into trade decisions. ``run_cycle`` feeds
+    it from the live API; the backtester feeds it recorded snapshots under a
+    virtual clock, so both go through exactly the same code.
+    """
+
+    def __init__(self):
+        self.price_history: dict[str, list[tuple[float, float]]] = {}
+        self.fund_hist: dict[str, list[float]] = {}
+        self.oi_hist: dict[str, list[float]] = {}
+
+    def price_delta(self, coin: str, current_price: float, lookback_hours: float = 4.0) -> float | None:
+        now = clock.now()
+        history = self.price_history.setdefault(coin, [])
+        history.append((now, current_price))
+
+        # Keep 6 hours
+        cutoff = now - 6 * 3600
+        if history[0][0] <= cutoff:
+            history = self.price_history[coin] = [(t, p) for t, p in history if t > cutoff]
+        if len(history) < 2:
+            return None
+
+        lookback_cutoff = now - lookback_hours * 3600
+        old = [p for t, p in history if t <= lookback_cutoff + 300]
+        if not old:
+            old = [history[0][1]]
+
+        old_price = old[0]
+        if old_price == 0:
+            return None
+        return ((current_price - old_price) / old_price) * 100
+
+    def thresholds(self, coins: list[str], funding_rates: dict[str, float],
+                   oi_deltas: dict[str, float | None], sig_cfg: dict) -> tuple[dict, dict]:
+        """Record this cycle's funding/OI readings and return (funding, OI) thresholds per coin."""
+        fund_window = sig_cfg.get("dynamic_funding_window", 96)
+        oi_window = sig_cfg.get("dynamic_oi_window", 96)
+        for coin, rate in funding_rates.items():
+            hist = self.fund_hist.setdefault(coin, [])
+            hist.append(rate)
+            del hist[:-fund_window]
+        for coin, od in oi_deltas.items():
+            if od is not None:
+                hist = self.oi_hist.setdefault(coin, [])
+                hist.append(od)
+                del hist[:-oi_window]
+
+        fund_thr = {}
+        oi_thr = {}
+        for coin in coins:
+            fund_thr[coin] = dynamic_threshold(self.fund_hist.get(coin, []), sig_cfg["funding_rate_threshold"])
+            oi_thr[coin] = dynamic_threshold(self.oi_hist.get(coin, []), sig_cfg["oi_delta_threshold"])
+        return fund_thr, oi_thr
+
+    def decide(
+        self,
+        coins: list[str],
+        prices: dict[str, float],
+        funding_rates: dict[str, float],
+        oi_deltas: dict[str, float | None],
+        price_deltas: dict[str, float | None],
+        positions_by_coin,
+        sig_cfg: dict,
+        open_positions: list,
+        max_positions: int,
+        heatmap: LiquidationHeatmap | None = None,
+        pool=None,
+        staleness: dict[str, float] | None = None,
+    ) -> list:
+        """Thresholds + signal stack + merge; sharded across ``pool`` when given."""
+        fund_thr, oi_thr = self.thresholds(coins, funding_rates, oi_deltas, sig_cfg)
+        if pool is not None:
+            return pool.evaluate(
+                coins, prices, funding_rates, fund_thr, oi_deltas, price_deltas, oi_thr,
+                positions_by_coin, sig_cfg, open_positions, max_positions, staleness,
+            )
+        decisions = evaluate_coins(
+            coins, prices, funding_rates, fund_thr, oi_deltas, price_deltas, oi_thr,
+            positions_by_coin, sig_cfg, heatmap, staleness,
+        )
+        return merge_decisions([decisions], open_positions, max_positions)
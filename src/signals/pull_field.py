@@ -0,0 +1,118 @@
+"""Gravitational pull of liquidation clusters on price.
+
+Every coin's clusters are laid on the same grid of ``grid_pct``-wide steps
+spanning +-``range_pct`` around its current price, and the whole universe
+(coins x grid) is convolved at once with two distance-decay kernels
+(``exp(-distance / decay_pct)``):
+
+- the signed kernel gives the pull field: liquidation volume above pulls
+  price up, volume below pulls it down, nearer volume harder;
+- the unsigned kernel gives smoothed density, whose peak on the pulled side
+  is the target the pull points at.
+
+The pull itself is only read at the current price, so it is a single dot
+product per coin; the density convolution goes through the FFT once the
+kernel is long enough for it to win.
+"""
+from operator import itemgetter
+
+import numpy as np
+
+from src.models import PullSignal
+from src.utils.logger import setup_logger
+
+logger = setup_logger("signal.pull")
+
+# Kernel length from which the FFT beats the direct sliding-window product
+FFT_MIN_KERNEL = 64
+# Rows transformed per FFT batch: bounds the complex temporaries on large universes
+FFT_ROW_BLOCK = 32
+
+_price_volume = itemgetter("price", "volume")
+
+
+def decay_kernels(grid_pct: float, range_pct: float, decay_pct: float) -> tuple[np.ndarray, np.ndarray]:
+    """(signed, unsigned) kernels indexed by offset -range..+range grid steps."""
+    steps = int(round(range_pct / grid_pct))
+    offsets = np.arange(-steps, steps + 1)
+    unsigned = np.exp(-np.abs(offsets) * grid_pct / decay_pct)
+    # Mass at +d pulls the point it acts on upwards: h[t] = -sign(t) K(|t|) under convolution
+    return -np.sign(offsets) * unsigned, unsigned
+
+
+def convolve_rows(mass: np.ndarray, kernel: np.ndarray) -> np.ndarray:
+    """Same-size convolution of every row of ``mass`` with an odd-length ``kernel``."""
+    n, k = mass.shape[1], len(kernel)
+    half = k // 2
+    if k >= FFT_MIN_KERNEL:
+        size = 1 << (n + k - 2).bit_length()
+        spectrum = np.fft.rfft(kernel, size)
+        out = np.empty(mass.shape)
+        for r in range(0, len(mass), FFT_ROW_BLOCK):
+            block = np.fft.irfft(np.fft.rfft(mass[r:r + FFT_ROW_BLOCK], size, axis=1) * spectrum, size, axis=1)
+            out[r:r + FFT_ROW_BLOCK] = block[:, half:half + n]
+        return out
+    padded = np.pad(mass, ((0, 0), (half, half)))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, k, axis=1)
+    return windows @ kernel[::-1]
+
+
+def pull_signals(
+    clusters_by_coin: dict[str, list[dict]],
+    prices: dict[str, float],
+    volume_baseline: float = 100_000,
+    grid_pct: float = 0.1,
+    range_pct: float = 10.0,
+    decay_pct: float = 1.5,
+) -> dict[str, PullSignal]:
+    """Net liquidation pull at each coin's current price.
+
+    Returns {coin: PullSignal} for coins with any clusters in range:
+    {"strength": 0-1, "direction": "long"|"short", "net_pull": float (USD, + = up),
+     "target_price": float | None, "distance_pct": float | None}
+
+    Strength is the net pull relative to ``volume_baseline``, saturating at 1.
+    """
+    coins = [c for c, clusters in clusters_by_coin.items() if clusters and prices.get(c, 0) > 0]
+    if not coins:
+        return {}
+    signed, unsigned = decay_kernels(grid_pct, range_pct, decay_pct)
+    center = len(signed) // 2
+    n = len(signed)
+
+    # One flat (price, volume) array for every cluster of every coin
+    counts = [len(clusters_by_coin[c]) for c in coins]
+    flat = np.fromiter((_price_volume(cl) for c in coins for cl in clusters_by_coin[c]),
+                       dtype=(np.float64, 2), count=sum(counts))
+    row = np.repeat(np.arange(len(coins)), counts)
+    ref = np.repeat(np.array([prices[c] for c in coins], dtype=np.float64), counts)
+    idx = np.rint((flat[:, 0] / ref - 1) * (100 / grid_pct)).astype(np.intp) + center
+    keep = (idx >= 0) & (idx < n)
+    mass = np.bincount(row[keep] * n + idx[keep], weights=flat[keep, 1], minlength=len(coins) * n)
+    mass = mass.reshape(len(coins), n)
+
+    # The pull is only needed at the centre: one dot product per row, not a full convolution
+    net = mass @ signed[::-1]
+    density = convolve_rows(mass, unsigned)
+
+    signals = {}
+    for i, coin in enumerate(coins):
+        if net[i] == 0:
+            continue
+        up = net[i] > 0
+        side = density[i, center + 1:] if up else density[i, :center]
+        target = None
+        distance = None
+        if side.size and side.max() > 0:
+            j = int(np.argmax(side))
+            step = j + 1 if up else j - center
+            distance = abs(step) * grid_pct
+            target = prices[coin] * (1 + step * grid_pct / 100)
+        signals[coin] = PullSignal(
+            strength=min(abs(float(net[i])) / max(volume_baseline, 1), 1.0),
+            direction="long" if up else "short",
+            net_pull=float(net[i]),
+            target_price=target,
+            distance_pct=distance,
+        )
+    return signals
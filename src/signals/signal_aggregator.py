@@ -1,3 +1,4 @@
+from src.models import Decision, Position
 from src.utils.logger import setup_logger
 
 logger = setup_logger("signal.aggregator")
@@ -7,6 +8,7 @@ WEIGHTS = {
     "funding": 0.35,
     "oi_divergence": 0.30,
     "liquidation": 0.35,
+    "pull": 0.0,  # opt-in: the pull is built from the same clusters as the liquidation vote
 }
 
 
@@ -15,10 +17,20 @@ def aggregate_signals(
     oi_signals: dict[str, dict],
     liq_signals: dict[str, dict | None],
     min_confidence: float,
-) -> list[dict]:
+    weights: dict[str, float] | None = None,
+    staleness: dict[str, float] | None = None,
+    pull_signals: dict[str, dict] | None = None,
+) -> list[Decision]:
     """Combine all signals into trade decisions.
 
-    Returns list of trade decisions:
+    ``weights`` overrides entries of ``WEIGHTS`` (e.g. from ``signals.weights``).
+    ``staleness`` scales a signal's strength when its inputs are last-known
+    data rather than fresh ({signal name: multiplier in [0, 1]}).
+    ``pull_signals`` is the net pull of all nearby clusters (see
+    ``pull_field.pull_signals``); its target stands in when no single
+    cluster is close enough to give one. It is ignored at weight 0.
+
+    Returns list of Decision records:
     {
         "coin": str,
         "direction": "long" | "short",
@@ -27,13 +39,21 @@ def aggregate_signals(
         "target_price": float | None,
     }
     """
-    all_coins = set(funding_signals) | set(oi_signals) | set(liq_signals)
+    weights = {**WEIGHTS, **weights} if weights else WEIGHTS
+    staleness = staleness or {}
+    fresh_funding = staleness.get("funding", 1.0)
+    fresh_oi = staleness.get("oi_divergence", 1.0)
+    fresh_liq = staleness.get("liquidation", 1.0)
+    fresh_pull = staleness.get("pull", 1.0)
+    pull_signals = pull_signals or {}
+    all_coins = set(funding_signals) | set(oi_signals) | set(liq_signals) | set(pull_signals)
     decisions = []
 
     for coin in all_coins:
         funding = funding_signals.get(coin)
         oi = oi_signals.get(coin)
         liq = liq_signals.get(coin)
+        pull = pull_signals.get(coin) if weights["pull"] else None
 
         # Collect directions and weighted strengths
         direction_votes = {"long": 0.0, "short": 0.0}
@@ -41,23 +61,29 @@ def aggregate_signals(
         active_signals = {}
 
         if funding:
-            w = WEIGHTS["funding"]
-            direction_votes[funding["direction"]] += funding["strength"] * w
+            w = weights["funding"]
+            direction_votes[funding["direction"]] += funding["strength"] * fresh_funding * w
             total_weight += w
             active_signals["funding"] = funding
 
         if oi:
-            w = WEIGHTS["oi_divergence"]
-            direction_votes[oi["direction"]] += oi["strength"] * w
+            w = weights["oi_divergence"]
+            direction_votes[oi["direction"]] += oi["strength"] * fresh_oi * w
             total_weight += w
             active_signals["oi_divergence"] = oi
 
         if liq:
-            w = WEIGHTS["liquidation"]
-            direction_votes[liq["direction"]] += liq["strength"] * w
+            w = weights["liquidation"]
+            direction_votes[liq["direction"]] += liq["strength"] * fresh_liq * w
             total_weight += w
             active_signals["liquidation"] = liq
 
+        if pull:
+            w = weights["pull"]
+            direction_votes[pull["direction"]] += pull["strength"] * fresh_pull * w
+            total_weight += w
+            active_signals["pull"] = pull
+
         if total_weight == 0:
             continue
 
@@ -75,25 +101,56 @@ def aggregate_signals(
         target_price = None
         if liq and liq.get("cluster_price"):
             target_price = liq["cluster_price"]
+        elif pull and pull.get("target_price"):
+            target_price = pull["target_price"]
 
         if confidence >= min_confidence:
-            decision = {
-                "coin": coin,
-                "direction": direction,
-                "confidence": round(confidence, 3),
-                "signals": active_signals,
-                "target_price": target_price,
-            }
+            decision = Decision(
+                coin=coin,
+                direction=direction,
+                confidence=round(confidence, 3),
+                signals=active_signals,
+                target_price=target_price,
+            )
             decisions.append(decision)
             logger.info(
-                f"TRADE SIGNAL: {coin} {direction.upper()} "
-                f"confidence={confidence:.3f} target={target_price}"
+                "TRADE SIGNAL: %s %s confidence=%.3f target=%s",
+                coin, direction.upper(), confidence, target_price,
             )
         else:
             logger.debug(
-                f"{coin}: confidence {confidence:.3f} below threshold {min_confidence}"
+                "%s: confidence %.3f below threshold %s", coin, confidence, min_confidence
             )
 
     # Sort by confidence
-    decisions.sort(key=lambda x: x["confidence"], reverse=True)
+    decisions.sort(key=lambda x: x.confidence, reverse=True)
     return decisions
+
+
+def merge_decisions(
+    decision_batches: list[list[Decision]],
+    open_positions: list[dict],
+    max_positions: int,
+) -> list[Decision]:
+    """Merge per-shard decision lists under the global position limits.
+
+    Drops coins we already hold, then keeps the highest-confidence decisions
+    that fit in the remaining ``max_positions`` slots.
+    """
+    existing_coins = {p.coin if isinstance(p, Position) else p.get("coin") for p in open_positions}
+    slots_available = max_positions - len(open_positions)
+    if slots_available <= 0:
+        return []
+
+    merged = []
+    for batch in decision_batches:
+        for decision in batch:
+            # Attribute access for records; plain-dict decisions still work
+            coin = decision.coin if isinstance(decision, Decision) else decision["coin"]
+            if coin in existing_coins:
+                logger.info("Already positioned in %s, skipping", coin)
+                continue
+            merged.append(decision)
+
+    merged.sort(key=lambda x: x.confidence if isinstance(x, Decision) else x["confidence"], reverse=True)
+    return merged[:slots_available]
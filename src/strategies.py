@@ -0,0 +1,274 @@
+"""Multi-strategy mode: one market fetch per cycle, N independent strategies.
+
+Each ``Strategy`` owns its config, executor (and so its state file) and
+rolling signal state. ``main.run_cycle`` fetches prices, funding, OI and
+whale positions once and hands the same ``MarketSnapshot`` to every
+strategy, so API load does not grow with the number of variants.
+"""
+import copy
+import time
+
+from src.models import Decision
+from src.signals.pipeline import SignalPipeline, cap_to_depth, trade_capital
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("strategy")
+
+
+def merge_config(base: dict, override: dict) -> dict:
+    """Deep-merge ``override`` into a copy of ``base``."""
+    out = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(out.get(key), dict):
+            out[key] = merge_config(out[key], value)
+        else:
+            out[key] = copy.deepcopy(value)
+    return out
+
+
+def strategy_configs(config: dict) -> list[tuple[str, dict]]:
+    """[(name, config)] from the ``strategies`` section; the file itself if empty."""
+    variants = config.get("strategies") or []
+    if not variants:
+        return [("default", config)]
+    base = {k: v for k, v in config.items() if k != "strategies"}
+    out = []
+    for i, variant in enumerate(variants):
+        name = variant.get("name") or f"s{i}"
+        cfg = merge_config(base, {k: v for k, v in variant.items() if k != "name"})
+        cfg["execution"].setdefault("state_path", f"data/paper_state_{name}.json")
+        out.append((name, cfg))
+    if sum(1 for _, cfg in out if cfg.get("mode") == "live") > 1:
+        raise ValueError("At most one strategy may run in live mode (they would share one account)")
+    return out
+
+
+class MarketSnapshot:
+    """Market inputs of one cycle, shared read-only by every strategy."""
+
+    __slots__ = ("prices", "funding_rates", "oi_deltas", "whale_positions", "staleness", "correlation", "_client",
+                 "_atr", "_fetch_book", "_books")
+
+    def __init__(self, prices: dict[str, float], funding_rates: dict[str, float],
+                 oi_deltas: dict[str, float | None], whale_positions, client=None,
+                 staleness: dict[str, float] | None = None, fetch_book=None, correlation=None):
+        self.prices = prices
+        self.funding_rates = funding_rates
+        self.oi_deltas = oi_deltas
+        self.whale_positions = whale_positions
+        self.staleness = staleness or {}  # {signal: strength multiplier} for last-known inputs
+        self.correlation = correlation  # CorrelationGate updated with this cycle's prices, or None
+        self._client = client
+        self._atr: dict[str, float | None] = {}
+        self._fetch_book = fetch_book  # coin -> {"walls": ..., "depth": BookDepth} or None
+        self._books: dict[str, dict | None] = {}
+
+    def book(self, coin: str) -> dict | None:
+        """Walls and cumulative depth of ``coin``'s book; fetched once per coin per cycle, on demand."""
+        if coin not in self._books:
+            self._books[coin] = None
+            if self._fetch_book is not None:
+                try:
+                    with metrics.stage("orderbook"):
+                        self._books[coin] = self._fetch_book(coin)
+                except Exception as e:
+                    logger.warning("Book fetch failed for %s: %s", coin, e)
+        return self._books[coin]
+
+    def walls(self, coin: str) -> dict:
+        """{"bid": (px, sz, notional) | None, "ask": ...}: the largest wall on each side."""
+        book = self.book(coin)
+        if book is None:
+            return {}
+        walls = book["walls"]
+        return {
+            "bid": walls["bid_walls"][0] if walls["bid_walls"] else None,
+            "ask": walls["ask_walls"][0] if walls["ask_walls"] else None,
+        }
+
+    def atr_pct(self, coin: str) -> float | None:
+        """24h average 1h high-low range as % of price; fetched once per coin per cycle."""
+        if coin not in self._atr:
+            self._atr[coin] = None
+            try:
+                # use 24h candle snapshot (1h interval)
+                now = int(time.time())
+                with metrics.stage("candles"):
+                    candles = self._client._post({"type": "candleSnapshot", "req": {
+                        "coin": coin, "interval": "1h", "startTime": (now - 26 * 3600) * 1000, "endTime": now * 1000,
+                    }})
+                highs = [float(c["h"]) for c in candles]
+                lows = [float(c["l"]) for c in candles]
+                if highs and lows:
+                    atr = sum(h - l for h, l in zip(highs, lows)) / len(highs)
+                    self._atr[coin] = atr / self.prices.get(coin, 1) * 100
+            except Exception:
+                pass
+        return self._atr[coin]
+
+
+class Strategy:
+    def __init__(self, name: str, config: dict, executor):
+        self.name = name
+        self.config = config
+        self.executor = executor
+        self.pipeline = SignalPipeline()
+        self.market: MarketSnapshot | None = None  # last cycle's snapshot, for entries between cycles
+        self._tag = "" if name == "default" else f"[{name}] "
+
+    @property
+    def coins(self) -> list[str]:
+        return self.config["coins"]
+
+    def _log_closed(self, closed: list):
+        for t in closed:
+            logger.info("%sClosed: %s %s PnL=%+.2f%%", self._tag, t.coin, t.get("exit_reason", ""), t.get("pnl_pct", 0))
+
+    def check_exits(self, prices: dict[str, float]):
+        self._log_closed(self.executor.check_open_trades(prices))
+
+    def on_price_tick(self, prices: dict[str, float]):
+        self._log_closed(self.executor.on_price_tick({c: p for c, p in prices.items() if c in self.coins}))
+
+    def on_cascade(self, event) -> list:
+        """React to a streaming CascadeEvent between cycles (``cascade`` config section).
+
+        Exits trades caught on the wrong side of the cascade and, with
+        ``enter``, joins it when strong enough and a slot is free.
+        """
+        if event.coin not in self.coins:
+            return []
+        cfg = self.config.get("cascade", {})
+        if cfg.get("exit", True):
+            against = "long" if event.direction == "short" else "short"
+            self._log_closed(self.executor.close_trades(event.coin, against, event.price, "cascade"))
+        if not cfg.get("enter") or event.strength < cfg.get("min_strength", 0.6):
+            return []
+        if any(p.get("coin") == event.coin for p in self.executor.get_open_positions()) or self.at_capacity():
+            return []
+        decision = Decision(
+            coin=event.coin,
+            direction=event.direction,
+            confidence=round(event.strength, 3),
+            signals={"cascade": event},
+            target_price=None,
+        )
+        # Same caps as a cycle's entries, against the last cycle's book and correlation gate
+        size_usd = self.size_trade(decision, self.market)
+        if size_usd is None:
+            return []
+        self.executor.execute_trade(decision, size_usd, self.config["execution"])
+        return [decision]
+
+    def at_capacity(self) -> bool:
+        open_positions = self.executor.get_open_positions()
+        max_positions = self.config["execution"].get("max_positions", 3)
+        if len(open_positions) >= max_positions:
+            logger.info("%sMax positions reached (%d/%d), skipping signals", self._tag, len(open_positions), max_positions)
+            return True
+        return False
+
+    def step(self, market: MarketSnapshot, heatmap=None, pool=None, wall_confirm: dict | None = None) -> list:
+        """Evaluate signals on ``market`` and execute the resulting trades."""
+        self.market = market
+        coins = self.coins
+        sig_cfg = self.config["signals"]
+        exe_cfg = self.config["execution"]
+        prices = {c: p for c, p in market.prices.items() if c in coins}
+
+        # Calculate deltas
+        price_deltas = {}
+        for coin in coins:
+            price = prices.get(coin, 0)
+            price_deltas[coin] = self.pipeline.price_delta(coin, price) if price else None
+
+        # Dynamic thresholds (rolling history) + aggregate — sharded across
+        # worker processes when a pool is configured
+        decisions = self.pipeline.decide(
+            coins, prices, market.funding_rates, market.oi_deltas, price_deltas, market.whale_positions,
+            sig_cfg, self.executor.get_open_positions(), exe_cfg.get("max_positions", 3), heatmap, pool,
+            market.staleness,
+        )
+        if not decisions:
+            logger.info("%sNo trade signals this cycle", self._tag)
+            return decisions
+
+        for decision in decisions:
+            # Order book wall confirmation
+            min_wall = sig_cfg.get("min_wall_notional", 0)
+            if min_wall:
+                wall = market.walls(decision["coin"]) if wall_confirm is None else wall_confirm.get(decision["coin"], {})
+                if decision["direction"] == "long":
+                    ask = wall.get("ask")
+                    if not ask or ask[2] < min_wall:
+                        logger.info("%s%s skipped: no strong ask wall >= $%s", self._tag, decision["coin"], min_wall)
+                        continue
+                else:
+                    bid = wall.get("bid")
+                    if not bid or bid[2] < min_wall:
+                        logger.info("%s%s skipped: no strong bid wall >= $%s", self._tag, decision["coin"], min_wall)
+                        continue
+
+            # ATR/volatility filter (simple proxy using 1h candles)
+            min_atr = sig_cfg.get("min_atr_pct", 0)
+            if min_atr:
+                atr_pct = market.atr_pct(decision["coin"])
+                if atr_pct is not None and atr_pct < min_atr:
+                    logger.info("%s%s skipped: ATR %.2f%% < %s%%", self._tag, decision["coin"], atr_pct, min_atr)
+                    continue
+
+            size_usd = self.size_trade(decision, market)
+            if size_usd is None:
+                continue
+            self.executor.execute_trade(decision, size_usd, exe_cfg)
+        return decisions
+
+    def size_trade(self, decision, market: MarketSnapshot | None) -> float | None:
+        """USD size for ``decision`` after the slippage and correlation caps; None to skip it.
+
+        ``market`` supplies the book and the correlation gate; without one only
+        the configured size applies.
+        """
+        exe_cfg = self.config["execution"]
+        capital = self.config["total_capital_usd"]
+        size_usd = trade_capital(decision, capital, exe_cfg)
+        if market is None:
+            return size_usd
+        coin, direction = decision["coin"], decision["direction"]
+
+        # Slippage budget: no larger than the book fills within budget_bps of mid
+        budget_bps = exe_cfg.get("slippage_budget_bps", 0)
+        if budget_bps:
+            book = market.book(coin)
+            capped = cap_to_depth(size_usd, direction, book and book["depth"], budget_bps)
+            if capped < exe_cfg.get("min_trade_usd", 10):
+                logger.info("%s%s skipped: $%.0f fits a %sbps slippage budget", self._tag, coin, capped, budget_bps)
+                return None
+            if capped < size_usd:
+                logger.info("%s%s size capped $%.0f -> $%.0f by %sbps slippage budget", self._tag,
+                            coin, size_usd, capped, budget_bps)
+            size_usd = capped
+
+        # Correlation-weighted exposure: trades that are the same bet share one limit
+        max_corr_pct = exe_cfg.get("max_correlated_exposure_pct", 0)
+        if max_corr_pct and market.correlation is not None:
+            capped = market.correlation.cap(coin, direction, size_usd, self.exposure_book(),
+                                            capital * max_corr_pct / 100)
+            if capped < exe_cfg.get("min_trade_usd", 10):
+                logger.info("%s%s skipped: correlated exposure at its %s%% limit", self._tag, coin, max_corr_pct)
+                return None
+            if capped < size_usd:
+                logger.info("%s%s size capped $%.0f -> $%.0f by correlated exposure limit", self._tag,
+                            coin, size_usd, capped)
+            size_usd = capped
+        return size_usd
+
+    def exposure_book(self) -> dict[str, float]:
+        """{coin: signed entry notional} of the open trades (+ long, - short)."""
+        book: dict[str, float] = {}
+        for p in self.executor.get_open_positions():
+            notional = p.get("entry_capital") or 0.0
+            coin = p.get("coin")
+            book[coin] = book.get(coin, 0.0) + (notional if p.get("direction") == "long" else -notional)
+        return book
@@ -0,0 +1,35 @@
+"""Process-wide time source.
+
+Pipeline code that keeps time-windowed state (price/OI history, trade entry
+and exit times, timeouts) reads ``now()`` instead of ``time.time()`` so a
+backtest can drive it with a ``VirtualClock``.
+"""
+import time
+
+_source = time.time
+
+
+def now() -> float:
+    return _source()
+
+
+def set_clock(source=None):
+    """Install ``source`` (a zero-arg callable) as the clock; None restores wall time."""
+    global _source
+    _source = source or time.time
+
+
+class VirtualClock:
+    """Manually advanced clock for replaying recorded data."""
+
+    def __init__(self, start: float = 0.0):
+        self.t = start
+
+    def __call__(self) -> float:
+        return self.t
+
+    def set(self, t: float):
+        self.t = t
+
+    def advance(self, seconds: float):
+        self.t += seconds
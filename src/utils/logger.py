@@ -1,17 +1,195 @@
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
+import time
+
+TEXT_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+TEXT_DATEFMT = "%H:%M:%S"
+
+# Standard LogRecord attributes; anything else on a record came from ``extra=``
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus any ``extra=`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        out = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                out[key] = value
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            out["exc"] = record.exc_text
+        return json.dumps(out, default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-logger token bucket plus optional random sampling.
+
+    ``rates`` maps logger name -> max records/second (burst of the same size),
+    ``samples`` maps logger name -> fraction of records kept. WARNING and above
+    always pass. Suppressed counts are attached to the next record that passes.
+    """
+
+    def __init__(self, rates: dict[str, float] = None, samples: dict[str, float] = None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.samples = dict(samples or {})
+        self._buckets: dict[str, list[float]] = {}  # name -> [tokens, last_refill]
+        self._suppressed: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        name = record.name
+        sample = self.samples.get(name)
+        rate = self.rates.get(name)
+        if sample is None and rate is None:
+            return True
+
+        with self._lock:
+            keep = sample is None or random.random() < sample
+            if keep and rate is not None:
+                now = time.monotonic()
+                bucket = self._buckets.get(name)
+                if bucket is None:
+                    bucket = self._buckets[name] = [rate, now]
+                bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+                if bucket[0] >= 1:
+                    bucket[0] -= 1
+                else:
+                    keep = False
+            if not keep:
+                self._suppressed[name] = self._suppressed.get(name, 0) + 1
+                return False
+            dropped = self._suppressed.pop(name, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves the final layout (text/JSON) and I/O to the writer thread.
+
+    ``msg % args`` and the traceback text are still rendered here, on the
+    calling thread: an argument mutated after the call must not change what
+    was logged.
+    """
+
+    _exc_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _Pipeline:
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.rate_filter = RateLimitFilter()
+        self.queue_handler = _DeferredQueueHandler(self.queue)
+        self.queue_handler.addFilter(self.rate_filter)
+        self.writer = logging.StreamHandler(sys.stdout)
+        self.writer.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+        self.listener = logging.handlers.QueueListener(self.queue, self.writer)
+        self.loggers: set[str] = set()
+        self.level: str | None = None
+        self.started = False
+        atexit.register(self.stop)
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        # The writer thread does not survive fork; give the child its own
+        if self.started:
+            self.queue = queue.SimpleQueue()
+            self.queue_handler.queue = self.queue
+            self.listener = logging.handlers.QueueListener(self.queue, self.writer)
+            self.started = False
+            self.start()
+
+    def start(self):
+        if not self.started:
+            self.listener.start()
+            self.started = True
+
+    def stop(self):
+        if self.started:
+            self.listener.stop()  # drains the queue
+            self.started = False
+
+
+_pipeline = _Pipeline()
 
 
 def setup_logger(name: str = "liquidation_hunter", level: str = "INFO") -> logging.Logger:
+    """Return a logger that hands records to the shared background writer.
+
+    %-style arguments are only formatted for records that pass the level and
+    rate filters, so call sites should log ``logger.debug("x=%s", x)`` rather
+    than f-strings to keep suppressed levels free. Layout and I/O happen on
+    the writer thread.
+    """
     logger = logging.getLogger(name)
     if logger.handlers:
         return logger
 
-    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(
-        logging.Formatter("[%(asctime)s] %(levelname)s %(name)s: %(message)s", datefmt="%H:%M:%S")
-    )
-    logger.addHandler(handler)
+    logger.setLevel(getattr(logging, (_pipeline.level or level).upper(), logging.INFO))
+    logger.addHandler(_pipeline.queue_handler)
+    _pipeline.loggers.add(name)
+    _pipeline.start()
     return logger
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "text",
+    rate_limits: dict[str, float] = None,
+    sampling: dict[str, float] = None,
+    stream=None,
+):
+    """Apply the ``logging`` config section to every logger from ``setup_logger``.
+
+    fmt: "text" (human readable) or "json" (JSON lines).
+    rate_limits: {logger_name: max records/sec} for repetitive hot-path loggers.
+    sampling: {logger_name: fraction of records kept}.
+    """
+    _pipeline.level = level
+    for name in _pipeline.loggers:
+        logging.getLogger(name).setLevel(getattr(logging, level.upper(), logging.INFO))
+
+    if fmt == "json":
+        _pipeline.writer.setFormatter(JsonFormatter())
+    else:
+        _pipeline.writer.setFormatter(logging.Formatter(TEXT_FORMAT, datefmt=TEXT_DATEFMT))
+    if stream is not None:
+        _pipeline.writer.setStream(stream)
+
+    _pipeline.rate_filter.rates = dict(rate_limits or {})
+    _pipeline.rate_filter.samples = dict(sampling or {})
+
+
+def flush_logging():
+    """Block until every queued record has been written (restarts the writer)."""
+    _pipeline.stop()
+    _pipeline.start()
@@ -0,0 +1,268 @@
+"""In-process metrics: latency histograms, counters and gauges, Prometheus export.
+
+Disabled by default; while disabled ``stage()``/``observe()``/``inc()`` return
+immediately, so instrumented code pays one function call and a flag check.
+
+    from src.utils import metrics
+
+    with metrics.stage("whale_scan"):
+        ...
+    metrics.observe_request("hyperliquid", "clearinghouseState", seconds, n_bytes)
+    metrics.inc("cache_hits_total", cache="heatmap")
+"""
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Seconds; covers sub-ms in-process stages up to slow HTTP calls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HELP = {
+    "stage_seconds": "Time spent in each run_cycle stage",
+    "request_seconds": "HTTP request latency by venue and endpoint",
+    "requests_total": "HTTP requests by venue, endpoint and outcome",
+    "response_bytes_total": "HTTP response body bytes by venue and endpoint",
+    "cache_hits_total": "Cache hits by cache",
+    "cache_misses_total": "Cache misses by cache",
+    "cycle_seconds": "Wall time of a full cycle",
+    "cycle_overruns_total": "Cycles that took longer than the poll interval",
+    "hedged_requests_total": "Duplicate /info requests sent after the hedge delay",
+    "retries_total": "Requests retried after a retryable failure",
+    "deadline_exceeded_total": "Requests refused because the cycle deadline had passed",
+    "source_age_seconds": "Age of the data last served per source (0 = fresh)",
+    "breaker_open": "1 while a data source's circuit breaker is open",
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last = +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the last finite bound for +Inf)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[min(i, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms: dict[tuple, Histogram] = {}
+        self.counters: dict[tuple, float] = {}
+        self.gauges: dict[tuple, float] = {}
+
+    @staticmethod
+    def _key(name: str, labels: dict) -> tuple:
+        return (name, tuple(sorted(labels.items())))
+
+    def observe(self, name: str, value: float, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self.gauges[self._key(name, labels)] = value
+
+    def clear(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.gauges.clear()
+
+    def render(self, prefix: str = "liqhunter_") -> str:
+        """Prometheus text exposition format."""
+        def fmt_labels(labels: tuple, extra: tuple = ()) -> str:
+            items = labels + extra
+            return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}" if items else ""
+
+        lines = []
+        seen = set()
+
+        def header(name: str, kind: str):
+            if name not in seen:
+                seen.add(name)
+                if name in HELP:
+                    lines.append(f"# HELP {prefix}{name} {HELP[name]}")
+                lines.append(f"# TYPE {prefix}{name} {kind}")
+
+        with self._lock:
+            for (name, labels), hist in sorted(self.histograms.items()):
+                header(name, "histogram")
+                cumulative = 0
+                for bound, n in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{prefix}{name}_bucket{fmt_labels(labels, (('le', le),))} {cumulative}")
+                lines.append(f"{prefix}{name}_sum{fmt_labels(labels)} {hist.sum}")
+                lines.append(f"{prefix}{name}_count{fmt_labels(labels)} {hist.count}")
+            for (name, labels), value in sorted(self.counters.items()):
+                header(name, "counter")
+                lines.append(f"{prefix}{name}{fmt_labels(labels)} {value}")
+            for (name, labels), value in sorted(self.gauges.items()):
+                header(name, "gauge")
+                lines.append(f"{prefix}{name}{fmt_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def stage_totals(self) -> dict[str, tuple[int, float]]:
+        """{stage: (count, total seconds)} from ``stage_seconds``."""
+        with self._lock:
+            return {
+                dict(labels).get("stage"): (h.count, h.sum)
+                for (name, labels), h in self.histograms.items() if name == "stage_seconds"
+            }
+
+    def summary(self) -> str:
+        """One-line per-stage latency summary for the log."""
+        with self._lock:
+            stages = [
+                (dict(labels).get("stage"), h) for (name, labels), h in self.histograms.items()
+                if name == "stage_seconds"
+            ]
+            parts = [
+                f"{stage} n={h.count} avg={h.sum / h.count * 1000:.1f}ms p95<={h.quantile(0.95) * 1000:.0f}ms"
+                for stage, h in sorted(stages) if h.count
+            ]
+            hits = {dict(l).get("cache"): v for (n, l), v in self.counters.items() if n == "cache_hits_total"}
+            misses = {dict(l).get("cache"): v for (n, l), v in self.counters.items() if n == "cache_misses_total"}
+            overruns = sum(v for (n, _), v in self.counters.items() if n == "cycle_overruns_total")
+        for cache in sorted(set(hits) | set(misses)):
+            total = hits.get(cache, 0) + misses.get(cache, 0)
+            parts.append(f"{cache}_hit_rate={hits.get(cache, 0) / total:.0%}" if total else f"{cache}_hit_rate=n/a")
+        parts.append(f"overruns={overruns:.0f}")
+        return " | ".join(parts)
+
+
+registry = Registry()
+_enabled = False
+_server: ThreadingHTTPServer | None = None
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(on: bool = True):
+    global _enabled
+    _enabled = on
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopTimer()
+
+
+def stage(name: str):
+    """Context manager timing a pipeline stage into ``stage_seconds{stage=name}``."""
+    if not _enabled:
+        return _NOOP
+    return _Timer("stage_seconds", {"stage": name})
+
+
+def observe(name: str, value: float, **labels):
+    if _enabled:
+        registry.observe(name, value, **labels)
+
+
+def inc(name: str, amount: float = 1, **labels):
+    if _enabled:
+        registry.inc(name, amount, **labels)
+
+
+def set_gauge(name: str, value: float, **labels):
+    if _enabled:
+        registry.set(name, value, **labels)
+
+
+def observe_request(venue: str, endpoint: str, seconds: float, n_bytes: int, ok: bool = True):
+    if _enabled:
+        registry.observe("request_seconds", seconds, venue=venue, endpoint=endpoint)
+        registry.inc("requests_total", venue=venue, endpoint=endpoint, outcome="ok" if ok else "error")
+        registry.inc("response_bytes_total", n_bytes, venue=venue, endpoint=endpoint)
+
+
+def cache_result(cache: str, hit: bool):
+    if _enabled:
+        registry.inc("cache_hits_total" if hit else "cache_misses_total", cache=cache)
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Expose ``/metrics`` on a background thread."""
+    global _server
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    _server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+    return _server
+
+
+def stop_server():
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
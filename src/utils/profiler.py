@@ -0,0 +1,148 @@
+"""On-demand profiling of the next N cycles, without restarting the bot.
+
+Trigger with ``kill -USR1 <pid>`` or by creating the control file (its
+content, if an integer, overrides the number of cycles). While armed, each
+cycle runs under cProfile, tracemalloc tracks allocations and per-stage
+timings are collected from ``src.utils.metrics``. After the last cycle a
+report directory is written and profiling switches itself off::
+
+    data/profiles/20260101-120000/
+        report.txt   per-cycle stage timings, top functions, top allocations
+        cpu.prof     raw cProfile stats (snakeviz / pstats)
+"""
+import cProfile
+import io
+import os
+import pstats
+import signal
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from src.utils import metrics
+from src.utils.logger import setup_logger
+
+logger = setup_logger("profiler")
+
+
+class CycleProfiler:
+    def __init__(self, out_dir: str = "data/profiles", cycles: int = 3, trigger_file: str | None = None,
+                 top: int = 40, frames: int = 10):
+        self.out_dir = out_dir
+        self.cycles = cycles
+        self.trigger_file = trigger_file
+        self.top = top
+        self.frames = frames
+        self._requested = 0  # set from the signal handler; consumed at the next cycle
+        self._remaining = 0
+        self._profile: cProfile.Profile | None = None
+        self._snapshot: tracemalloc.Snapshot | None = None
+        self._own_tracemalloc = False
+        self._metrics_were_enabled = False
+        self._cycles: list[dict] = []
+
+    @property
+    def active(self) -> bool:
+        return self._remaining > 0
+
+    def request(self, cycles: int | None = None):
+        """Profile the next ``cycles`` cycles. Safe to call from a signal handler."""
+        self._requested = cycles or self.cycles
+
+    def install_signal(self) -> bool:
+        if not hasattr(signal, "SIGUSR1"):
+            return False
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request())
+        return True
+
+    def _check_trigger(self):
+        if not self.trigger_file or not os.path.exists(self.trigger_file):
+            return
+        try:
+            with open(self.trigger_file, encoding="utf-8") as fh:
+                content = fh.read().strip()
+            os.remove(self.trigger_file)
+        except OSError as e:
+            logger.warning("Profile trigger file unreadable: %s", e)
+            return
+        self.request(int(content) if content.isdigit() else None)
+
+    def _start(self):
+        self._remaining = self._requested
+        self._requested = 0
+        self._profile = cProfile.Profile()
+        self._cycles = []
+        self._own_tracemalloc = not tracemalloc.is_tracing()
+        if self._own_tracemalloc:
+            tracemalloc.start(self.frames)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._metrics_were_enabled = metrics.enabled()
+        metrics.enable()
+        logger.info("Profiling the next %d cycle(s)", self._remaining)
+
+    @contextmanager
+    def cycle(self, number: int):
+        """Wrap one cycle; profiles it if a capture is armed or running."""
+        self._check_trigger()
+        if self._requested and not self.active:
+            self._start()
+        if not self.active:
+            yield
+            return
+
+        stages_before = metrics.registry.stage_totals()
+        started = time.perf_counter()
+        self._profile.enable()
+        try:
+            yield
+        finally:
+            self._profile.disable()
+            elapsed = time.perf_counter() - started
+            stages_after = metrics.registry.stage_totals()
+            stages = {}
+            for stage, (count, total) in stages_after.items():
+                count0, total0 = stages_before.get(stage, (0, 0.0))
+                if count > count0:
+                    stages[stage] = (count - count0, total - total0)
+            self._cycles.append({"cycle": number, "seconds": elapsed, "stages": stages})
+            self._remaining -= 1
+            if not self.active:
+                self._finish()
+
+    def _finish(self):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+        if not self._metrics_were_enabled:
+            metrics.enable(False)
+
+        path = os.path.join(self.out_dir, time.strftime("%Y%m%d-%H%M%S"))
+        os.makedirs(path, exist_ok=True)
+        self._profile.dump_stats(os.path.join(path, "cpu.prof"))
+        report = self.render(snapshot, current, peak)
+        with open(os.path.join(path, "report.txt"), "w", encoding="utf-8") as fh:
+            fh.write(report)
+        self._profile = self._snapshot = None
+        logger.info("Profile written to %s", path)
+
+    def render(self, snapshot: tracemalloc.Snapshot, current: int, peak: int) -> str:
+        out = io.StringIO()
+        total = sum(c["seconds"] for c in self._cycles)
+        out.write(f"Profiled {len(self._cycles)} cycle(s), {total:.3f}s total\n\n")
+
+        out.write("== Stages (per cycle) ==\n")
+        for c in self._cycles:
+            out.write(f"cycle {c['cycle']}: {c['seconds'] * 1000:.1f}ms\n")
+            for stage, (count, seconds) in sorted(c["stages"].items(), key=lambda kv: -kv[1][1]):
+                share = seconds / c["seconds"] * 100 if c["seconds"] else 0.0
+                out.write(f"  {stage:<24} {seconds * 1000:9.1f}ms {share:5.1f}%  n={count}\n")
+
+        for sort in ("cumulative", "tottime"):
+            out.write(f"\n== Top functions by {sort} ==\n")
+            pstats.Stats(self._profile, stream=out).strip_dirs().sort_stats(sort).print_stats(self.top)
+
+        out.write(f"\n== Allocations (traced now {current / 1e6:.1f}MB, peak {peak / 1e6:.1f}MB) ==\n")
+        for stat in snapshot.compare_to(self._snapshot, "lineno")[: self.top]:
+            out.write(f"{stat}\n")
+        return out.getvalue()
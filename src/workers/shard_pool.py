@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.signals.coin_evaluator import evaluate_coins
+from src.signals.signal_aggregator import merge_decisions
+from src.workers.shared_snapshot import SharedSnapshot
+from src.utils.logger import setup_logger
+
+logger = setup_logger("workers.pool")
+
+
+def shard_indices(n_items: int, n_shards: int) -> list[list[int]]:
+    """Split ``range(n_items)`` into ``n_shards`` round-robin shards (empty shards dropped)."""
+    n_shards = max(1, min(n_shards, n_items))
+    return [list(range(i, n_items, n_shards)) for i in range(n_shards)] if n_items else []
+
+
+def _evaluate_shard(shm_name: str, coins: list[str], n_positions: int, indices: list[int], sig_cfg: dict,
+                    staleness: dict[str, float] | None = None) -> list[dict]:
+    snapshot = SharedSnapshot.attach(shm_name, coins, n_positions)
+    try:
+        inputs = snapshot.read_coins(indices)
+    finally:
+        snapshot.close()
+    return evaluate_coins([coins[i] for i in indices], sig_cfg=sig_cfg, staleness=staleness, **inputs)
+
+
+class ShardPool:
+    """Coordinator that fans per-coin signal work out to a process pool.
+
+    Each cycle the coordinator packs the snapshot into shared memory, every
+    worker evaluates its shard of coins, and decisions are merged centrally
+    under the global position limits.
+    """
+
+    def __init__(self, workers: int = 0):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        logger.info("Shard pool started with %d workers", self.workers)
+
+    def evaluate(
+        self,
+        coins: list[str],
+        prices: dict[str, float],
+        funding_rates: dict[str, float],
+        funding_thresholds: dict[str, float],
+        oi_deltas: dict[str, float | None],
+        price_deltas: dict[str, float | None],
+        oi_thresholds: dict[str, float],
+        positions_by_coin: dict[str, list[dict]],
+        sig_cfg: dict,
+        open_positions: list[dict],
+        max_positions: int,
+        staleness: dict[str, float] | None = None,
+    ) -> list[dict]:
+        snapshot = SharedSnapshot.create(
+            coins, prices, funding_rates, funding_thresholds,
+            oi_deltas, price_deltas, oi_thresholds, positions_by_coin,
+        )
+        try:
+            futures = [
+                self._pool.submit(
+                    _evaluate_shard, snapshot.name, snapshot.coins, snapshot.n_positions, shard, sig_cfg, staleness,
+                )
+                for shard in shard_indices(len(coins), self.workers)
+            ]
+            batches = [f.result() for f in futures]
+        finally:
+            snapshot.close()
+        return merge_decisions(batches, open_positions, max_positions)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,155 @@
+import math
+from array import array
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.models import POSITION_DTYPE, Position, PositionBatch
+
+# Per-coin row layout (float64). None is stored as NaN.
+COIN_FIELDS = ("price", "funding_rate", "funding_thr", "oi_delta", "price_delta", "oi_thr")
+# Per-position row layout (float64), rows grouped by coin.
+POSITION_FIELDS = ("size", "liquidation_price", "margin_used")
+
+_ITEM = array("d").itemsize
+_NAN = float("nan")
+
+
+def _f(value) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _opt(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class SharedSnapshot:
+    """Per-cycle market snapshot packed into a flat float64 shared-memory block.
+
+    Layout: [coin table: n_coins x COIN_FIELDS][row offsets: n_coins + 1]
+    [positions: n_positions x POSITION_FIELDS]. Workers attach by name and
+    copy out only the rows for their shard, so nothing large is pickled.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, coins: list[str], n_positions: int, owner: bool):
+        self.shm = shm
+        self.coins = coins
+        self.n_positions = n_positions
+        self._owner = owner
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(
+        cls,
+        coins: list[str],
+        prices: dict[str, float],
+        funding_rates: dict[str, float],
+        funding_thresholds: dict[str, float],
+        oi_deltas: dict[str, float | None],
+        price_deltas: dict[str, float | None],
+        oi_thresholds: dict[str, float],
+        positions_by_coin: dict[str, list[Position] | PositionBatch],
+    ) -> "SharedSnapshot":
+        data = array("d")
+        for coin in coins:
+            data.extend((
+                _f(prices.get(coin)),
+                _f(funding_rates.get(coin)),
+                _f(funding_thresholds.get(coin)),
+                _f(oi_deltas.get(coin)),
+                _f(price_deltas.get(coin)),
+                _f(oi_thresholds.get(coin)),
+            ))
+
+        offsets = array("d", [0.0])
+        rows = array("d")
+        for coin in coins:
+            positions = positions_by_coin.get(coin, [])
+            if isinstance(positions, PositionBatch):
+                cols = np.column_stack([positions.data[f] for f in POSITION_FIELDS])
+                rows.frombytes(np.ascontiguousarray(cols, dtype=np.float64).tobytes())
+                offsets.append(len(rows) // len(POSITION_FIELDS))
+                continue
+            for pos in positions:
+                rows.extend((
+                    _f(pos.get("size", 0)),
+                    _f(pos.get("liquidation_price")),
+                    _f(pos.get("margin_used", 0)),
+                ))
+            offsets.append(len(rows) // len(POSITION_FIELDS))
+
+        data.extend(offsets)
+        data.extend(rows)
+        n_positions = len(rows) // len(POSITION_FIELDS)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(len(data) * _ITEM, 1))
+        shm.buf[: len(data) * _ITEM] = data.tobytes()
+        return cls(shm, list(coins), n_positions, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, coins: list[str], n_positions: int) -> "SharedSnapshot":
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, coins, n_positions, owner=False)
+
+    def _read(self, start: int, count: int) -> array:
+        out = array("d")
+        out.frombytes(self.shm.buf[start * _ITEM: (start + count) * _ITEM])
+        return out
+
+    def _read_batch(self, coin: str, start: int, count: int) -> PositionBatch:
+        width = len(POSITION_FIELDS)
+        rows = np.frombuffer(self.shm.buf, dtype=np.float64, count=count * width, offset=start * _ITEM)
+        rows = rows.reshape(count, width).copy()  # copy so the shared buffer can be released
+        data = np.zeros(count, dtype=POSITION_DTYPE)
+        data["leverage"] = 1.0
+        for j, field in enumerate(POSITION_FIELDS):
+            data[field] = rows[:, j]
+        return PositionBatch(coin, data)
+
+    def read_coins(self, indices: list[int]) -> dict:
+        """Unpack the given coin rows back into the dict inputs of ``evaluate_coins``."""
+        n_coins = len(self.coins)
+        n_fields = len(COIN_FIELDS)
+        offsets_start = n_coins * n_fields
+        positions_start = offsets_start + n_coins + 1
+
+        prices, funding_rates, funding_thr = {}, {}, {}
+        oi_deltas, price_deltas, oi_thr = {}, {}, {}
+        positions_by_coin = {}
+
+        for i in indices:
+            coin = self.coins[i]
+            price, rate, f_thr, oi_d, px_d, o_thr = self._read(i * n_fields, n_fields)
+            if not math.isnan(price):
+                prices[coin] = price
+            if not math.isnan(rate):
+                funding_rates[coin] = rate
+            if not math.isnan(f_thr):
+                funding_thr[coin] = f_thr
+            if not math.isnan(o_thr):
+                oi_thr[coin] = o_thr
+            oi_deltas[coin] = _opt(oi_d)
+            price_deltas[coin] = _opt(px_d)
+
+            lo, hi = (int(x) for x in self._read(offsets_start + i, 2))
+            if hi > lo:
+                start = positions_start + lo * len(POSITION_FIELDS)
+                positions_by_coin[coin] = self._read_batch(coin, start, hi - lo)
+
+        return {
+            "prices": prices,
+            "funding_rates": funding_rates,
+            "funding_thresholds": funding_thr,
+            "oi_deltas": oi_deltas,
+            "price_deltas": price_deltas,
+            "oi_thresholds": oi_thr,
+            "positions_by_coin": positions_by_coin,
+        }
+
+    def close(self):
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
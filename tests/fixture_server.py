@@ -0,0 +1,69 @@
+"""Minimal local HTTP server serving canned JSON for adapter/client tests."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class FixtureServer:
+    """Serve ``routes`` on 127.0.0.1 in a background thread.
+
+    routes: {path: response} where response is a JSON-able object or a
+    callable ``(query: dict, body: dict | None) -> (status, obj)``.
+    Every request is recorded in ``requests`` as (method, path, query, body).
+    """
+
+    def __init__(self, routes: dict):
+        self.routes = routes
+        self.requests: list[tuple] = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+            disable_nagle_algorithm = True
+
+            def _serve(self, method: str):
+                parsed = urlparse(self.path)
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                server.requests.append((method, parsed.path, query, body))
+
+                route = server.routes.get(parsed.path)
+                if route is None:
+                    status, obj = 404, {"error": "not found"}
+                elif callable(route):
+                    status, obj = route(query, body)
+                else:
+                    status, obj = 200, route
+                payload = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
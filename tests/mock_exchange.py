@@ -0,0 +1,95 @@
+"""Local stand-in for the Hyperliquid /info + /exchange endpoints used by LiveExecutor."""
+import time
+
+from tests.fixture_server import FixtureServer
+
+DEFAULT_UNIVERSE = [
+    {"name": "BTC", "szDecimals": 5},
+    {"name": "ETH", "szDecimals": 4},
+    {"name": "SOL", "szDecimals": 2},
+]
+
+
+class MockExchange:
+    """Fills IOC orders at their limit price, rests trigger orders, tracks positions.
+
+    ``actions`` records every /exchange payload and ``fills`` every fill. Set
+    ``reject`` to a string to make the next actions fail with that error.
+    """
+
+    def __init__(self, mids: dict[str, float], universe: list[dict] = None):
+        self.mids = dict(mids)
+        self.universe = universe or DEFAULT_UNIVERSE
+        self.positions: dict[str, float] = {}
+        self.orders: list[dict] = []  # resting trigger orders, frontendOpenOrders shape
+        self.fills: list[dict] = []
+        self.actions: list[dict] = []
+        self.reject: str | None = None
+        self._next_oid = 1
+        self.server = FixtureServer({"/info": self._info, "/exchange": self._exchange})
+
+    @property
+    def url(self) -> str:
+        return self.server.url
+
+    def __enter__(self) -> "MockExchange":
+        self.server.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.__exit__(*exc)
+
+    def _info(self, query, body):
+        kind = body["type"]
+        if kind == "meta":
+            return 200, {"universe": self.universe}
+        if kind == "allMids":
+            return 200, {k: str(v) for k, v in self.mids.items()}
+        if kind == "clearinghouseState":
+            return 200, {"assetPositions": [
+                {"position": {"coin": coin, "szi": str(size), "entryPx": str(self.mids.get(coin, 0)),
+                              "leverage": {"value": 1}, "liquidationPx": None}}
+                for coin, size in self.positions.items() if size
+            ]}
+        if kind == "frontendOpenOrders":
+            return 200, self.orders
+        if kind == "userFillsByTime":
+            return 200, [f for f in self.fills if f["time"] >= body.get("startTime", 0)]
+        return 400, {"error": f"unknown info type {kind}"}
+
+    def fill(self, coin: str, size: float, px: float):
+        """Trade ``size`` (signed) of ``coin`` at ``px``, as an IOC or a triggered TP/SL would."""
+        self.positions[coin] = self.positions.get(coin, 0.0) + size
+        self.fills.append({"coin": coin, "px": str(px), "sz": str(abs(size)), "side": "B" if size > 0 else "A",
+                           "time": int(time.time() * 1000), "oid": self._oid()})
+        if not self.positions[coin]:
+            self.orders = [o for o in self.orders if o["coin"] != coin]
+
+    def _oid(self) -> int:
+        self._next_oid += 1
+        return self._next_oid
+
+    def _exchange(self, query, body):
+        self.actions.append(body)
+        if self.reject:
+            return 200, {"status": "err", "response": self.reject}
+        action = body["action"]
+        if action["type"] == "cancel":
+            cancelled = {c["o"] for c in action["cancels"]}
+            self.orders = [o for o in self.orders if o["oid"] not in cancelled]
+            return 200, {"status": "ok", "response": {"type": "cancel", "data": {
+                "statuses": ["success"] * len(action["cancels"])}}}
+
+        statuses = []
+        for order in action["orders"]:
+            coin = self.universe[order["a"]]["name"]
+            if "trigger" in order["t"]:
+                oid = self._oid()
+                self.orders.append({"coin": coin, "oid": oid, "reduceOnly": True, "isTrigger": True,
+                                    "triggerPx": order["t"]["trigger"]["triggerPx"]})
+                statuses.append({"resting": {"oid": oid}})
+                continue
+            size = float(order["s"])
+            self.fill(coin, size if order["b"] else -size, float(order["p"]))
+            statuses.append({"filled": {"totalSz": order["s"], "avgPx": order["p"], "oid": self._oid()}})
+        return 200, {"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}}
@@ -0,0 +1,95 @@
+import json
+import time
+
+import pytest
+
+from src.backtest.engine import Backtest
+from src.backtest.recorder import SnapshotRecorder, read_snapshots
+from src.execution.paper_executor import PaperExecutor
+from src.models import Position
+from src.utils import clock
+
+CONFIG = {
+    "coins": ["BTC"],
+    "total_capital_usd": 1000,
+    "signals": {
+        "funding_rate_threshold": 0.0005,
+        "oi_delta_threshold": 5.0,
+        "liquidation_proximity": 1.5,
+        "min_confidence": 0.6,
+    },
+    "execution": {
+        "position_size_pct": 10,
+        "max_positions": 1,
+        "take_profit_pct": 2.0,
+        "stop_loss_pct": 1.0,
+        "timeout_minutes": 30,
+    },
+}
+
+
+def _record(path, cycles: int, start: float = 1_700_000_000.0):
+    virtual = clock.VirtualClock(start)
+    clock.set_clock(virtual)
+    try:
+        recorder = SnapshotRecorder(str(path))
+        positions = {"BTC": [Position(coin="BTC", size=1.0, entry_price=100.0, liquidation_price=90.0,
+                                      leverage=10, margin_used=10.0, unrealized_pnl=0.0)]}
+        for i in range(cycles):
+            price = 100.0 - 0.05 * i
+            # Funding spikes every 20 cycles, otherwise quiet
+            funding = 0.002 if i % 20 == 0 else 0.0001
+            recorder.record_cycle({"BTC": price}, {"BTC": funding}, {"BTC": 1000.0}, positions)
+            virtual.advance(15)
+            recorder.record_tick({"BTC": price - 0.02})
+            virtual.advance(15)
+        recorder.close()
+    finally:
+        clock.set_clock()
+
+
+def test_recorder_round_trip(tmp_path):
+    path = tmp_path / "snaps.jsonl.gz"
+    _record(path, 3)
+    snaps = list(read_snapshots(str(path)))
+
+    assert [s["kind"] for s in snaps] == ["cycle", "tick"] * 3
+    assert snaps[2]["ts"] - snaps[0]["ts"] == 30
+    batch = snaps[0]["positions"]["BTC"]
+    assert batch[0].liquidation_price == 90.0 and batch[0].size == 1.0
+
+
+def test_backtest_matches_paper_state_format(tmp_path):
+    path = tmp_path / "snaps.jsonl"
+    _record(path, 400)
+    result = Backtest(CONFIG, str(tmp_path / "out")).run(read_snapshots(str(path)))
+
+    assert result.cycles == 400 and result.ticks == 400
+    assert result.trades and all(t.direction == "short" for t in result.trades)
+    assert {t.exit_reason for t in result.trades} <= {"take_profit", "stop_loss", "timeout"}
+    # Simulated timestamps, not wall time
+    assert result.trades[0].entry_time >= 1_700_000_000.0
+    assert result.speedup > 100
+
+    state = json.loads((tmp_path / "out" / "paper_state.json").read_text())
+    reloaded = PaperExecutor(state_path=str(tmp_path / "out" / "paper_state.json"))
+    assert set(state) == {"open_trades", "closed_trades", "total_pnl", "updated"}
+    assert len(reloaded.closed_trades) == len(result.trades)
+    assert state["total_pnl"] == pytest.approx(result.total_pnl)
+
+    equity = json.loads((tmp_path / "out" / "equity.json").read_text())["equity"]
+    assert len(equity) == 400
+    if not reloaded.open_trades:
+        assert equity[-1][1] == pytest.approx(1000 + result.total_pnl)
+    assert clock.now() == pytest.approx(time.time(), abs=5)  # wall clock restored
+
+
+def test_backtest_sizes_through_the_correlation_cap(tmp_path):
+    path = tmp_path / "snaps.jsonl"
+    _record(path, 100)
+    config = {**CONFIG, "execution": {**CONFIG["execution"], "max_correlated_exposure_pct": 5}}
+    backtest = Backtest(config)
+    result = backtest.run(read_snapshots(str(path)))
+
+    assert result.trades and {t.entry_capital for t in result.trades} == {50.0}  # 10% wanted, 5% allowed
+    assert len(backtest.correlation) == 1
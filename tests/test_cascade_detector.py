@@ -0,0 +1,87 @@
+import json
+
+from src.data.trades_feed import ReplayStream, TradePrint, read_trades
+from src.execution.paper_executor import PaperExecutor
+from src.models import CascadeEvent, Decision
+from src.signals.cascade_detector import CascadeDetector
+from src.strategies import Strategy, merge_config
+from tests.test_strategies import BASE
+
+
+def _quiet(detector, seconds=600, price=100.0):
+    """One trade a second, alternating sides, price flat."""
+    for i in range(seconds):
+        assert detector.on_trade("BTC", float(i), price, 1.0, i % 2 == 0) is None
+    return float(seconds)
+
+
+def _dump(detector, start, n=60, seconds=5.0, drop_pct=1.0, price=100.0):
+    """``n`` taker sells over ``seconds`` walking price down ``drop_pct``."""
+    events = []
+    for i in range(n):
+        px = price * (1 - drop_pct / 100 * i / (n - 1))
+        event = detector.on_trade("BTC", start + seconds * i / n, px, 5.0, False)
+        if event is not None:
+            events.append(event)
+    return events
+
+
+def test_quiet_tape_then_dump_flags_short_cascade_within_seconds():
+    detector = CascadeDetector(window_seconds=10, min_trades=20, velocity_pct=0.4)
+    start = _quiet(detector)
+    detector.set_clusters("BTC", [99.4, 110.0])
+    events = _dump(detector, start)
+    assert len(events) == 1  # cooldown: one onset per cascade
+    event = events[0]
+    assert event.direction == "short" and event.time - start < 5
+    assert event.imbalance < -0.6 and event.velocity_pct <= -0.4
+    assert event.cluster_hits > 0 and 0 < event.strength <= 1
+    assert detector.drain() == [event] and detector.drain() == []
+
+
+def test_busy_but_balanced_tape_is_not_a_cascade():
+    detector = CascadeDetector()
+    start = _quiet(detector)
+    for i in range(200):  # 10x the rate, price falling, but two-sided flow
+        assert detector.on_trade("BTC", start + i * 0.05, 100 - i * 0.01, 1.0, i % 2 == 0) is None
+
+
+def test_window_memory_is_capped():
+    detector = CascadeDetector(max_trades=50)
+    for i in range(1000):
+        detector.on_trade("BTC", i * 0.001, 100.0, 1.0, True)
+    window = detector._windows["BTC"]
+    assert len(window.trades) == 50 and window.buy == 50 * 100.0
+
+
+def test_replay_file_drives_the_detector(tmp_path):
+    path = tmp_path / "trades.jsonl"
+    with open(path, "w") as fh:
+        for i in range(600):
+            fh.write(json.dumps({"coin": "BTC", "side": "B" if i % 2 else "A", "px": "100", "sz": "1",
+                                 "time": i * 1000}) + "\n")
+        # One line may carry a whole WS ``data`` batch
+        batch = [{"coin": "BTC", "side": "A", "px": str(100 - i * 0.02), "sz": "5", "time": 600_000 + i * 80}
+                 for i in range(60)]
+        fh.write(json.dumps({"channel": "trades", "data": batch}) + "\n")
+    assert next(read_trades(str(path))) == TradePrint("BTC", 0.0, 100.0, 1.0, False)
+
+    detector = CascadeDetector()
+    ReplayStream(str(path), detector.on_trades, speed=0).run()
+    assert [e.direction for e in detector.drain()] == ["short"]
+
+
+def test_strategy_exits_wrong_side_and_joins_cascade(tmp_path):
+    config = merge_config(BASE, {"cascade": {"enter": True, "min_strength": 0.5}})
+    strategy = Strategy("default", config, PaperExecutor(state_path=str(tmp_path / "s.json")))
+    executor = strategy.executor
+    executor.execute_trade(Decision(coin="BTC", direction="long", confidence=0.7, signals={}), 100, {})
+    executor.on_price_tick({"BTC": 100.0})
+
+    event = CascadeEvent(coin="BTC", direction="short", time=0.0, price=99.0, imbalance=-0.9, trade_rate=12.0,
+                         velocity_pct=-1.0, cluster_hits=3, strength=0.8)
+    strategy.on_cascade(event)
+    closed = executor.closed_trades[-1]
+    assert closed.exit_reason == "cascade" and closed.pnl_pct == -1.0
+    assert [(t.coin, t.direction) for t in executor.get_open_positions()] == [("BTC", "short")]
+    assert strategy.on_cascade(event) == []  # already positioned
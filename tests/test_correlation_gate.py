@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from src.execution.correlation_gate import CorrelationGate
+from src.execution.paper_executor import PaperExecutor
+from src.models import CascadeEvent, Decision
+from src.strategies import MarketSnapshot, Strategy, merge_config
+from tests.test_strategies import BASE
+
+
+def _walk(n=400, seed=0):
+    """BTC and a 2x-beta ETH follow one factor; SOL is independent."""
+    rng = np.random.default_rng(seed)
+    factor, noise = rng.normal(0, 0.01, n), rng.normal(0, 0.01, (n, 2))
+    rets = np.column_stack([factor, 2 * factor + 0.2 * noise[:, 0], noise[:, 1]])
+    return np.exp(np.cumsum(rets, axis=0)) * [100_000, 3_000, 150], rets
+
+
+def _gate(halflife=60):
+    prices, rets = _walk()
+    gate = CorrelationGate(halflife_cycles=halflife, min_observations=20, capacity=2)  # forces a grow
+    for row in prices:
+        gate.update(dict(zip(("BTC", "ETH", "SOL"), row)))
+    return gate, rets
+
+
+def test_incremental_update_matches_ewma_over_the_history():
+    gate, rets = _gate()
+    r = rets[1:]  # the first prices only seed the previous price
+    lam = gate.lam
+    w = (1 - lam) * lam ** np.arange(len(r))[::-1]
+    cov = (r * w[:, None]).T @ r / w.sum()
+    sd = np.sqrt(np.diag(cov))
+    assert gate.correlation(["BTC", "ETH", "SOL"]) == pytest.approx(cov / np.outer(sd, sd))
+    assert gate.correlation(["ETH", "BTC"])[0, 1] > 0.95
+
+
+def test_correlated_trades_share_one_limit_and_hedges_go_through():
+    gate, _ = _gate()
+    held = {"BTC": 300.0}
+    assert gate.cap("ETH", "long", 300.0, held, limit_usd=400) < 120  # near-duplicate bet
+    assert gate.cap("SOL", "long", 300.0, held, limit_usd=400) > 250  # sqrt(300^2 + s^2) <= 400
+    assert gate.cap("ETH", "short", 300.0, held, limit_usd=400) == 300.0  # offsets BTC
+    # Already over the limit: adding is blocked, hedging is not
+    assert gate.cap("ETH", "long", 300.0, {"BTC": 500.0}, limit_usd=400) == 0.0
+    assert gate.cap("ETH", "short", 300.0, {"BTC": 500.0}, limit_usd=400) == 300.0
+
+
+def test_coins_without_history_count_as_fully_correlated():
+    gate, _ = _gate()
+    assert gate.correlation(["BTC", "NEW"]).tolist() == [[1.0, 1.0], [1.0, 1.0]]
+    assert gate.cap("NEW", "long", 300.0, {"SOL": 300.0}, limit_usd=400) == pytest.approx(100.0)
+    assert gate.exposure({"BTC": 300.0, "SOL": 300.0}) == pytest.approx(300 * np.sqrt(2), rel=0.1)
+
+
+def test_strategy_downsizes_the_correlated_decision(tmp_path):
+    gate, _ = _gate()
+    config = merge_config(BASE, {"coins": ["BTC", "ETH", "SOL"],
+                                 "execution": {"position_size_pct": 30, "max_correlated_exposure_pct": 40}})
+    strategy = Strategy("default", config, PaperExecutor(state_path=str(tmp_path / "s.json")))
+    executor = strategy.executor
+    executor.execute_trade(Decision(coin="BTC", direction="long", confidence=0.7, signals={}), 300, {})
+    assert strategy.exposure_book() == {"BTC": 300.0}
+
+    market = MarketSnapshot({"BTC": 100_000.0, "ETH": 3_000.0, "SOL": 150.0}, {}, {}, {}, correlation=gate)
+    decisions = [Decision(coin=c, direction="long", confidence=0.7, signals={}) for c in ("ETH", "SOL")]
+    strategy.pipeline.decide = lambda *args, **kwargs: decisions
+    strategy.step(market)
+    sizes = {t.coin: t.entry_capital for t in executor.get_open_positions()}
+    assert sizes["ETH"] < 120 and sizes.get("SOL", 0) < 100  # BTC + ETH nearly fill the limit
+    assert gate.exposure(strategy.exposure_book()) == pytest.approx(400)
+
+
+def test_cascade_entry_goes_through_the_same_caps(tmp_path):
+    gate, _ = _gate()
+    config = merge_config(BASE, {"coins": ["BTC", "ETH"], "cascade": {"enter": True, "min_strength": 0.5},
+                                 "execution": {"position_size_pct": 30, "max_correlated_exposure_pct": 40}})
+    strategy = Strategy("default", config, PaperExecutor(state_path=str(tmp_path / "s.json")))
+    strategy.executor.execute_trade(Decision(coin="BTC", direction="long", confidence=0.7, signals={}), 300, {})
+    strategy.pipeline.decide = lambda *args, **kwargs: []
+    strategy.step(MarketSnapshot({"BTC": 100_000.0, "ETH": 3_000.0}, {}, {}, {}, correlation=gate))
+
+    event = CascadeEvent(coin="ETH", direction="long", time=0.0, price=3_000.0, imbalance=0.9, trade_rate=12.0,
+                         velocity_pct=1.0, cluster_hits=3, strength=0.8)
+    assert strategy.on_cascade(event)
+    sizes = {t.coin: t.entry_capital for t in strategy.executor.get_open_positions()}
+    assert sizes["ETH"] < 120
@@ -0,0 +1,118 @@
+import pytest
+
+import main
+from src.data import degraded as degraded_mod
+from src.data.degraded import SIGNAL_SOURCES, CircuitBreaker, DegradedSources
+from src.data.open_interest import clear_history
+from src.execution.paper_executor import PaperExecutor
+from src.signals.signal_aggregator import WEIGHTS, aggregate_signals
+from src.strategies import Strategy
+from tests.test_strategies import BASE, CountingClient
+
+
+@pytest.fixture
+def now(monkeypatch):
+    t = [1000.0]
+    monkeypatch.setattr(degraded_mod.time, "monotonic", lambda: t[0])
+    return t
+
+
+def test_circuit_breaker_opens_and_half_opens(now):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.failure()
+    assert breaker.state == "closed"
+    breaker.failure()
+    assert breaker.state == "open" and not breaker.allow()
+    now[0] += 30
+    assert breaker.state == "half_open" and breaker.allow()
+    breaker.failure()  # failed trial re-opens
+    assert breaker.state == "open"
+    now[0] += 30
+    breaker.success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+
+def test_source_serves_last_good_with_age_then_refuses(now):
+    sources = DegradedSources({"failure_threshold": 2, "reset_seconds": 60, "max_age_seconds": 100,
+                               "half_life_seconds": 20})
+    calls = []
+
+    def flaky(ok):
+        calls.append(ok)
+        if not ok:
+            raise ConnectionError("down")
+        return {"BTC": 1}
+
+    assert sources.fetch("funding", flaky, True) == ({"BTC": 1}, 0.0)
+    assert sources.staleness() == {}
+    now[0] += 20
+    assert sources.fetch("funding", flaky, False) == ({"BTC": 1}, 20.0)
+    assert sources.staleness()["funding"] == pytest.approx(0.5)
+    now[0] += 20
+    sources.fetch("funding", flaky, False)  # second failure opens the breaker
+    now[0] += 20
+    assert sources.fetch("funding", flaky, True) == ({"BTC": 1}, 60.0)  # open: not even tried
+    assert calls == [True, False, False]
+    now[0] += 50
+    assert sources.fetch("funding", flaky, False) == (None, None)  # 110s old > max age
+    assert sources.staleness() == {}
+
+
+def test_staleness_scales_signal_strength():
+    funding = {"BTC": {"direction": "short", "strength": 1.0}}
+    oi = {"BTC": {"direction": "short", "strength": 1.0}}
+    fresh = aggregate_signals(funding, oi, {}, 0.0)
+    stale = aggregate_signals(funding, oi, {}, 0.0, staleness={"funding": 0.5})
+    wf, wo = WEIGHTS["funding"], WEIGHTS["oi_divergence"]
+    assert fresh[0].confidence == 1.0
+    assert stale[0].confidence == pytest.approx((0.5 * wf + wo) / (wf + wo), abs=1e-3)
+
+
+class FlakyClient(CountingClient):
+    def __init__(self):
+        super().__init__()
+        self.down: set[str] = set()
+
+    def get_all_mids(self):
+        if "allMids" in self.down:
+            raise ConnectionError("allMids down")
+        return super().get_all_mids()
+
+    def get_meta_and_contexts(self):
+        if "metaAndAssetCtxs" in self.down:
+            raise ConnectionError("metaAndAssetCtxs down")
+        return super().get_meta_and_contexts()
+
+
+def test_stale_prices_weaken_every_signal(now):
+    sources = DegradedSources({"max_age_seconds": 60, "half_life_seconds": 20})
+    sources.fetch("prices", lambda: {"BTC": 1.0})
+    now[0] += 20
+    sources.fetch("prices", lambda: 1 / 0)
+    assert sources.staleness() == {signal: pytest.approx(0.5) for signal in SIGNAL_SOURCES}
+
+
+def test_run_cycle_keeps_deciding_on_last_good_data(now, tmp_path):
+    clear_history()
+    client = FlakyClient()
+    sources = DegradedSources({"max_age_seconds": 300, "half_life_seconds": 60})
+    strategy = Strategy("default", BASE, PaperExecutor(state_path=str(tmp_path / "s.json")))
+
+    def cycle(elapsed: float, down: set[str]) -> list[str]:
+        now[0] += elapsed
+        client.down = down
+        strategy.executor.open_trades.clear()
+        main.run_cycle(client, BASE, [strategy], degraded=sources)
+        return [t.coin for t in strategy.executor.get_open_positions()]
+
+    assert cycle(0, set()) == ["BTC"]  # funding strength 1.0
+    # Funding/OI API down: last good funding, 10s old, still clears min_confidence (0.6)
+    assert cycle(10, {"metaAndAssetCtxs"}) == ["BTC"]
+    assert sources.staleness() == {"funding": pytest.approx(0.5 ** (10 / 60)),
+                                   "oi_divergence": pytest.approx(0.5 ** (10 / 60))}
+    # ...but at 70s old it is down to ~0.45 and no longer trades on its own
+    assert cycle(60, {"metaAndAssetCtxs"}) == []
+    # Prices down with nothing recent enough: the cycle stops before fetching anything else
+    calls = len(client.calls)
+    assert cycle(400, {"allMids", "metaAndAssetCtxs"}) == []
+    assert client.calls[calls:] == []
@@ -0,0 +1,58 @@
+from src.execution.exit_engine import STOP_LOSS, TAKE_PROFIT, ExitEngine
+from src.execution.paper_executor import PaperExecutor
+from src.models import Decision
+
+
+def test_long_and_short_triggers_fire_once():
+    engine = ExitEngine()
+    engine.add("L", "BTC", "long", 100.0, 2.0, 1.0, deadline=1e9)
+    engine.add("S", "BTC", "short", 100.0, 2.0, 1.0, deadline=1e9)
+
+    assert engine.on_tick("BTC", 100.5) == []
+    assert engine.on_tick("BTC", 101.0) == [("S", STOP_LOSS)]
+    assert engine.on_tick("BTC", 102.5) == [("L", TAKE_PROFIT)]
+    assert engine.on_tick("BTC", 90.0) == []
+    assert len(engine) == 0
+
+
+def test_only_crossed_levels_fire():
+    engine = ExitEngine()
+    for i in range(100):
+        engine.add(f"t{i}", "ETH", "long", 100.0 + i, 1.0, 1.0, deadline=1e9)
+    fired = engine.on_tick("ETH", 101.5)  # TP of entries <= ~100.49 and SL of entries >= ~102.53
+    assert ("t0", TAKE_PROFIT) in fired
+    assert all(r == STOP_LOSS for t, r in fired if t != "t0")
+    assert len(engine) == 100 - len(fired)
+    assert engine.on_tick("SOL", 1.0) == []
+
+
+def test_timeouts_use_heap_and_skip_removed():
+    engine = ExitEngine()
+    engine.add("a", "BTC", "long", 100.0, 2.0, 1.0, deadline=10.0)
+    engine.add("b", "ETH", "long", 100.0, 2.0, 1.0, deadline=5.0)
+    engine.add("c", "BTC", "long", 100.0, 2.0, 1.0, deadline=20.0)
+    engine.remove("b")
+    assert engine.next_deadline() == 10.0
+    assert engine.expired(15.0, coins={"ETH"}) == []  # no price for BTC yet
+    assert engine.expired(15.0) == ["a"]
+    assert engine.expired(25.0) == ["c"]
+
+
+def test_paper_executor_exits_on_tick(tmp_path):
+    executor = PaperExecutor(state_path=str(tmp_path / "state.json"))
+    executor.execute_trade(Decision(coin="BTC", direction="long", confidence=0.7), 100.0,
+                           {"take_profit_pct": 2.0, "stop_loss_pct": 1.0, "timeout_minutes": 30})
+    executor.execute_trade(Decision(coin="ETH", direction="short", confidence=0.7), 100.0,
+                           {"take_profit_pct": 2.0, "stop_loss_pct": 1.0, "timeout_minutes": 0})
+
+    assert executor.on_price_tick({"BTC": 50_000.0}) == []  # sets BTC entry
+    closed = executor.on_price_tick({"BTC": 51_100.0})
+    assert [(t.coin, t.exit_reason, t.exit_price) for t in closed] == [("BTC", "take_profit", 51_100.0)]
+
+    executor.check_open_trades({"ETH": 3_000.0})  # sets ETH entry
+    closed = executor.check_open_trades({"ETH": 3_001.0})
+    assert [(t.coin, t.exit_reason) for t in closed] == [("ETH", "timeout")]
+    assert executor.get_open_positions() == []
+
+    reloaded = PaperExecutor(state_path=str(tmp_path / "state.json"))
+    assert len(reloaded.closed_trades) == 2
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from src.data.orderbook import BookDepth
+from src.execution.fill_model import FillSimulator
+from src.execution.paper_executor import PaperExecutor
+from src.models import Decision
+
+BOOK = {
+    "bids": [(99.9, 1.0), (99.8, 2.0), (99.5, 5.0)],
+    "asks": [(100.1, 1.0), (100.2, 2.0), (100.5, 5.0)],
+}
+
+
+def _walk(levels, size):
+    """Reference level-by-level walk."""
+    left, notional = size, 0.0
+    for px, sz in levels:
+        take = min(left, sz)
+        notional += take * px
+        left -= take
+        if left <= 0:
+            break
+    return notional / (size - left), size - left
+
+
+@pytest.mark.parametrize("size", [0.5, 1.0, 2.5, 8.0, 20.0])
+def test_book_walk_matches_reference(size):
+    depth = BookDepth.from_book("X", BOOK, ts=0)
+    assert depth.fill_size(True, size) == pytest.approx(_walk(BOOK["asks"], size))
+    assert depth.fill_size(False, size) == pytest.approx(_walk(BOOK["bids"], size))
+
+
+def test_fill_notional_inverts_fill_size():
+    depth = BookDepth.from_book("X", BOOK, ts=0)
+    avg, size = depth.fill_notional(True, 250.0)
+    assert avg * size == pytest.approx(250.0)
+    assert depth.fill_size(True, size)[0] == pytest.approx(avg)
+
+
+@pytest.mark.parametrize("budget_bps", [10, 12, 20, 30])
+def test_max_notional_fills_exactly_at_the_budget(budget_bps):
+    depth = BookDepth.from_book("X", BOOK, ts=0)
+    for is_buy, sign in ((True, 1), (False, -1)):
+        notional = depth.max_notional(is_buy, budget_bps)
+        avg, _ = depth.fill_notional(is_buy, notional)
+        assert sign * (avg / 100.0 - 1) * 10_000 == pytest.approx(budget_bps)
+
+
+def test_max_notional_edges():
+    depth = BookDepth.from_book("X", BOOK, ts=0)
+    assert depth.max_notional(True, 5) == 0.0  # the best ask alone is 10 bps from mid
+    assert depth.max_notional(True, 10) == pytest.approx(100.1)  # exactly the first level
+    assert depth.max_notional(True, 1_000) == pytest.approx(depth.ask_cum_notional[-1])  # visible depth
+    assert BookDepth.from_book("X", {"bids": [], "asks": []}, ts=0).max_notional(True, 50) == 0.0
+
+
+def test_simulator_slippage_fees_and_overflow():
+    sim = FillSimulator(taker_fee_bps=5)
+    sim.update_book("X", BOOK, ts=100.0)
+
+    fill = sim.fill("X", True, 100.0, size=2.0, now=100.0)
+    assert fill.price == pytest.approx((100.1 + 100.2) / 2)
+    assert fill.fee_usd == pytest.approx(fill.price * 2 * 0.0005)
+    assert fill.slippage_bps == pytest.approx(15.0)
+
+    # Beyond visible depth the rest is priced at the worst level
+    deep = sim.fill("X", False, 100.0, size=10.0, now=100.0)
+    assert deep.price == pytest.approx((99.9 + 2 * 99.8 + 7 * 99.5) / 10)
+
+    # Stale book and no source -> mid
+    assert sim.fill("X", True, 100.0, size=1.0, now=200.0).price == 100.0
+
+
+def test_paper_executor_fills_through_the_book(tmp_path):
+    sim = FillSimulator(book_source=lambda coin: BOOK, latency_ms=0, taker_fee_bps=5)
+    executor = PaperExecutor(state_path=str(tmp_path / "state.json"), fill_model=sim)
+    decision = Decision(coin="X", direction="long", confidence=0.7, signals={}, target_price=None)
+    trade = executor.execute_trade(decision, 100.1, {"take_profit_pct": 1.0, "stop_loss_pct": 1.0})
+
+    executor.check_open_trades({"X": 100.0})
+    assert trade.entry_price == pytest.approx(100.1)  # one ask level, not mid
+
+    closed = executor.on_price_tick({"X": 101.2})
+    assert closed == [trade] and trade.exit_reason == "take_profit"
+    # Exit sells into the (older) book's bids: its 10 bps of slippage, applied to the 101.2 mark
+    tp_price = 100.1 * 1.01
+    assert trade.exit_price == pytest.approx(101.2 * 0.999)
+    assert abs(trade.exit_price - tp_price) / tp_price < 0.002
+    # Fees on both legs come out of PnL
+    gross = (trade.exit_price - 100.1) / 100.1 * 100
+    assert trade.fees_usd == pytest.approx((100.1 + trade.exit_price) * 0.0005)
+    assert trade.pnl_pct == pytest.approx(gross - trade.fees_usd / 100.1 * 100) and trade.pnl_pct > 0
+
+
+def test_book_slippage_follows_the_mark():
+    sim = FillSimulator(taker_fee_bps=0)
+    sim.update_book("X", BOOK, ts=100.0)  # mid 100
+    fill = sim.fill("X", True, 110.0, size=2.0, now=101.0)
+    assert fill.price == pytest.approx(110.0 * (100.1 + 100.2) / 2 / 100)
+    assert fill.slippage_bps == pytest.approx(15.0)
+    by_notional = sim.fill("X", True, 110.0, notional=fill.price * 2.0, now=101.0)
+    assert by_notional.price == pytest.approx(fill.price) and by_notional.size == pytest.approx(2.0)
+
+
+def test_entry_waits_for_latency(tmp_path):
+    sim = FillSimulator(latency_ms=60_000)
+    executor = PaperExecutor(state_path=str(tmp_path / "state.json"), fill_model=sim)
+    decision = Decision(coin="X", direction="short", confidence=0.7, signals={}, target_price=None)
+    trade = executor.execute_trade(decision, 100.0, {})
+
+    executor.check_open_trades({"X": 100.0})
+    assert trade.entry_price is None
+    trade.entry_time = time.time() - 61
+    executor.check_open_trades({"X": 100.0})
+    assert trade.entry_price == 100.0  # no book -> mid
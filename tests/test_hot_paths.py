@@ -0,0 +1,16 @@
+from benchmarks.hot_paths import BENCHMARKS, compare, run
+
+
+def test_suite_runs_at_small_scale():
+    results = run(scale=0.01, retries=0, min_batch_seconds=0.001)
+    assert set(results) == set(BENCHMARKS)
+    assert all(r["ops_per_sec"] > 0 and r["peak_kb"] >= 0 for r in results.values())
+
+
+def test_compare_flags_throughput_and_memory_regressions():
+    baseline = {"a": {"ops_per_sec": 100.0, "peak_kb": 1000.0}, "b": {"ops_per_sec": 100.0, "peak_kb": 10.0}}
+    ok = {"a": {"ops_per_sec": 80.0, "peak_kb": 1200.0}, "b": {"ops_per_sec": 500.0, "peak_kb": 20.0}}
+    assert compare(ok, baseline) == []
+    bad = {"a": {"ops_per_sec": 70.0, "peak_kb": 1300.0}, "new": {"ops_per_sec": 1.0, "peak_kb": 1e9}}
+    failures = compare(bad, baseline)
+    assert len(failures) == 2 and failures[0].startswith("a: 70 ops/s") and "peak 1300KB" in failures[1]
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from src.data.hyperliquid_client import DeadlineExceeded, HyperliquidClient
+from src.data.position_diff import PositionDiffEngine
+from src.data.whale_tracker import scan_whale_wallets
+from tests.fixture_server import FixtureServer
+
+
+class Script:
+    """/info route answering from a list of (delay, status) steps, then (0, 200) forever."""
+
+    def __init__(self, steps=()):
+        self.steps = list(steps)
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query, body):
+        with self._lock:
+            self.calls += 1
+            delay, status = self.steps.pop(0) if self.steps else (0, 200)
+        time.sleep(delay)
+        if status != 200:
+            return status, {"error": "scripted"}
+        if body["type"] == "clearinghouseState":
+            return 200, {"assetPositions": [{"position": {
+                "coin": "BTC", "szi": "1", "entryPx": "100000", "liquidationPx": "90000",
+                "leverage": {"value": 10}, "marginUsed": "10000"}}]}
+        return 200, {"BTC": "100000"}
+
+
+def _warm(client, n=30):
+    for _ in range(n):
+        client.get_all_mids()
+
+
+def test_slow_request_is_hedged():
+    script = Script()
+    with FixtureServer({"/info": script}) as server:
+        client = HyperliquidClient(server.url + "/info")
+        _warm(client)
+        assert client.timeout_for("allMids") == client.min_timeout  # 4 x p99 of ~1ms, clamped
+        script.steps = [(1.5, 200)]
+        started = time.perf_counter()
+        assert client.get_all_mids() == {"BTC": "100000"}
+        assert time.perf_counter() - started < 0.5
+        assert client.hedges == 1 and script.calls == 32
+        client.close()
+
+
+def test_timeouts_widen_the_learned_timeout_until_a_slowed_endpoint_answers():
+    script = Script()
+    with FixtureServer({"/info": script}) as server:
+        client = HyperliquidClient(server.url + "/info", hedge=False, max_retries=0, min_timeout=0.2)
+        _warm(client)
+        assert client.timeout_for("allMids") == 0.2
+        script.steps = [(0.3, 200)] * 2  # now slower than the learned timeout
+        with pytest.raises(requests.Timeout):
+            client.get_all_mids()
+        assert client.timeout_for("allMids") == pytest.approx(0.8)  # 4 x the censored 0.2s sample
+        assert client.get_all_mids() == {"BTC": "100000"}
+        client.close()
+
+
+def test_retries_transient_failures_but_not_client_errors():
+    script = Script([(0, 500), (0, 429)])
+    with FixtureServer({"/info": script}) as server:
+        client = HyperliquidClient(server.url + "/info", backoff_seconds=0.01)
+        assert client.get_all_mids() == {"BTC": "100000"}
+        assert client.retries == 2 and script.calls == 3
+
+        script.steps = [(0, 400)]
+        with pytest.raises(requests.HTTPError):
+            client.get_all_mids()
+        assert client.retries == 2 and script.calls == 4
+
+        script.steps = [(0, 503)] * 3
+        with pytest.raises(requests.HTTPError):
+            client.get_all_mids()
+        assert script.calls == 7
+
+
+def test_cycle_deadline_bounds_requests_and_yields_partial_scan():
+    script = Script([(0.05, 200)] * 20)
+    with FixtureServer({"/info": script}) as server:
+        client = HyperliquidClient(server.url + "/info", hedge=False)
+        wallets = [f"0x{i:040x}" for i in range(20)]
+        tracker = PositionDiffEngine()
+        started = time.perf_counter()
+        with client.cycle_deadline(0.18):
+            result = scan_whale_wallets(client, wallets, ["BTC"], diff_engine=tracker)
+            with pytest.raises(DeadlineExceeded):
+                client.get_all_mids()
+        assert time.perf_counter() - started < 0.4
+        assert 1 <= len(result["BTC"]) < 20
+        assert len(tracker.table) == len(result["BTC"])
+        assert client.deadline is None
+        assert client.get_all_mids() == {"BTC": "100000"}  # no deadline outside the cycle
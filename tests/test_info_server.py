@@ -0,0 +1,80 @@
+import time
+
+import pytest
+import requests
+
+from src.data.hyperliquid_client import HyperliquidClient
+from src.data.info_server import Faults, InfoServer
+from src.data.positions import fetch_positions
+from src.data.synthetic import SyntheticMarket
+
+
+@pytest.fixture
+def market():
+    return SyntheticMarket(n_wallets=50, seed=1)
+
+
+def test_serves_every_info_type(market):
+    with InfoServer(market) as server:
+        client = HyperliquidClient(server.url)
+        wallet = market.wallet(3)
+        assert client.get_all_mids() == market.all_mids()
+        assert client.get_meta_and_contexts()[0]["universe"][0]["name"] == "BTC"
+        assert len(client.get_l2_book("ETH")["levels"][0]) == market.book_levels
+        assert fetch_positions(client, wallet)
+        assert client.get_open_orders(wallet) == market.open_orders(wallet)
+        assert client.get_user_funding(wallet, 0) == []
+        now = int(market.now * 1000)
+        candles = client._post({"type": "candleSnapshot",
+                                "req": {"coin": "BTC", "interval": "1h", "startTime": now - 5 * 3600_000, "endTime": now}})
+        assert len(candles) == 5
+        with pytest.raises(requests.HTTPError):
+            client._post({"type": "nope"})
+    assert server.stats[("allMids", "ok")] == 1
+
+
+def test_latency_distribution(market):
+    faults = {"latency": {"default": {"dist": "fixed", "ms": 0},
+                          "l2Book": {"dist": "lognormal", "median_ms": 40, "sigma": 0.3}}}
+    with InfoServer(market, faults) as server:
+        client = HyperliquidClient(server.url)
+        client.get_all_mids()  # connect
+        started = time.perf_counter()
+        client.get_all_mids()
+        fast = time.perf_counter() - started
+        started = time.perf_counter()
+        for _ in range(5):
+            client.get_l2_book("BTC")
+        slow = (time.perf_counter() - started) / 5
+    assert fast < 0.02 and 0.02 < slow < 0.2
+
+
+def test_rate_limit_returns_429(market):
+    faults = {"rate_limit": {"weight_per_minute": 10}}  # five allMids (weight 2) per burst
+    with InfoServer(market, faults) as server:
+        client = HyperliquidClient(server.url, max_retries=0)
+        for _ in range(5):
+            client.get_all_mids()
+        with pytest.raises(requests.HTTPError) as err:
+            client.get_all_mids()
+        assert err.value.response.status_code == 429
+    assert server.stats[("allMids", "rate_limited")] == 1
+
+
+def test_errors_malformed_and_timeouts(market):
+    with InfoServer(market, {"error_prob": 1.0}) as server:
+        with pytest.raises(requests.HTTPError):
+            HyperliquidClient(server.url).get_all_mids()
+    with InfoServer(market, {"malformed_prob": 1.0}) as server:
+        with pytest.raises(ValueError):
+            HyperliquidClient(server.url).get_meta_and_contexts()
+    with InfoServer(market, {"timeout_prob": 1.0, "hang_seconds": 5}) as server:
+        started = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            requests.post(server.url, json={"type": "allMids"}, timeout=0.2)
+        assert time.perf_counter() - started < 1
+
+
+def test_fault_draws_are_seeded():
+    a, b = Faults({"seed": 3, "error_prob": 0.3}), Faults({"seed": 3, "error_prob": 0.3})
+    assert [a.draw("allMids")[1] for _ in range(50)] == [b.draw("allMids")[1] for _ in range(50)]
@@ -0,0 +1,160 @@
+import time
+
+import pytest
+
+from src.execution.live_executor import LiveExecutor, float_to_wire, round_price, round_size
+from src.execution.signing import NonceManager
+from src.models import Decision
+from tests.mock_exchange import MockExchange
+
+KEY = "0x" + "11" * 32
+EXE_CFG = {"take_profit_pct": 2.0, "stop_loss_pct": 1.0, "timeout_minutes": 30}
+
+
+class StubSigner:
+    address = "0x000000000000000000000000000000000000dead"
+
+    def sign(self, action, nonce):
+        return {"r": "0x0", "s": "0x0", "v": 27}
+
+
+@pytest.fixture(autouse=True)
+def _state_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # data/live_state.json lands in a scratch directory
+
+
+def _decision(coin="ETH", direction="long"):
+    return Decision(coin=coin, direction=direction, confidence=0.8, signals={}, target_price=None)
+
+
+def test_wire_and_rounding():
+    assert float_to_wire(3015.0) == "3015"
+    assert float_to_wire(0.0123) == "0.0123"
+    assert round_price(3015.678, 4) == 3015.7      # 5 significant figures
+    assert round_price(1.234567, 2) == 1.2346      # max 6 - szDecimals decimals
+    assert round_size(0.123456, 4) == 0.1234
+
+
+def test_nonces_strictly_increase():
+    nonces = NonceManager()
+    seen = [nonces.next() for _ in range(1000)]
+    assert all(b > a for a, b in zip(seen, seen[1:]))
+    assert abs(seen[0] - time.time() * 1000) < 5_000
+
+
+def test_entry_and_tpsl_go_out_in_one_action():
+    with MockExchange({"ETH": 3000.0}) as ex:
+        executor = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        executor.update_prices({"ETH": 3000.0})
+        trade = executor.execute_trade(_decision(), 300.0, EXE_CFG)
+        executor.shutdown()
+
+    assert len(ex.actions) == 1
+    action = ex.actions[0]["action"]
+    assert action["grouping"] == "normalTpsl"
+    entry, tp, sl = action["orders"]
+    assert (entry["b"], entry["r"], entry["t"]) == (True, False, {"limit": {"tif": "Ioc"}})
+    assert entry["s"] == "0.1" and entry["p"] == "3015"
+    assert (tp["b"], tp["r"], tp["t"]["trigger"]["tpsl"], tp["t"]["trigger"]["triggerPx"]) == (False, True, "tp", "3060")
+    assert (sl["b"], sl["r"], sl["t"]["trigger"]["tpsl"], sl["t"]["trigger"]["triggerPx"]) == (False, True, "sl", "2970")
+
+    assert trade.entry_price == 3015.0
+    assert len(trade.order_ids) == 2
+    assert executor.get_open_positions() == [trade]
+
+
+def test_rejected_action_returns_none():
+    with MockExchange({"BTC": 100_000.0}) as ex:
+        ex.reject = "Insufficient margin"
+        executor = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        trade = executor.execute_trade(_decision("BTC", "short"), 100.0, EXE_CFG)
+        executor.shutdown()
+
+    assert trade is None
+    assert executor.get_open_positions() == []
+
+
+def test_trade_closed_when_exchange_position_disappears():
+    with MockExchange({"SOL": 150.0}) as ex:
+        executor = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        trade = executor.execute_trade(_decision("SOL", "short"), 150.0, EXE_CFG)
+        executor.tracker.poll()
+        assert executor.check_open_trades({"SOL": 149.0}) == []
+
+        ex.fill("SOL", -ex.positions["SOL"], 147.5)  # TP hit on the exchange
+        executor.tracker.poll()
+        closed = executor.check_open_trades({"SOL": 147.0})
+        executor.shutdown()
+
+    assert closed == [trade]
+    assert trade.exit_reason == "exchange"
+    assert trade.exit_price == 147.5  # the account's closing fill, not the cycle mid
+    assert trade.pnl_pct > 0
+
+
+def test_restart_reconciles_persisted_trades_with_the_exchange():
+    with MockExchange({"ETH": 3000.0, "SOL": 150.0, "BTC": 100_000.0}) as ex:
+        first = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        eth = first.execute_trade(_decision("ETH"), 300.0, EXE_CFG)
+        first.execute_trade(_decision("SOL", "short"), 150.0, EXE_CFG)
+        first.shutdown()
+
+        ex.fill("SOL", -ex.positions["SOL"], 148.0)  # SOL's TP filled while the bot was down
+        ex.fill("BTC", 0.001, 100_000.0)  # a position the state file never saw
+        second = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        closed = second.reconcile(dict(EXE_CFG, timeout_minutes=45))
+        second.shutdown()
+
+    assert [(t.coin, t.exit_reason, t.exit_price) for t in closed] == [("SOL", "exchange", 148.0)]
+    by_coin = {t.coin: t for t in second.get_open_positions()}
+    assert set(by_coin) == {"ETH", "BTC"}
+    assert by_coin["ETH"].id == eth.id and by_coin["ETH"].order_ids == eth.order_ids
+    assert by_coin["ETH"].entry_time == eth.entry_time  # timeout still runs from the original entry
+    btc = by_coin["BTC"]
+    assert (btc.direction, btc.timeout_minutes, btc.entry_capital) == ("long", 45, 100.0)
+    # Persisted again: a third start sees the same book
+    third = LiveExecutor(base_url=ex.url)
+    assert {t.coin for t in third.open_trades} == {"ETH", "BTC"}
+    third.shutdown()
+
+
+def test_timeout_flattens_and_cancels_triggers():
+    with MockExchange({"ETH": 3000.0}) as ex:
+        executor = LiveExecutor(base_url=ex.url, signer=StubSigner(), position_poll_seconds=60)
+        trade = executor.execute_trade(_decision(), 300.0, dict(EXE_CFG, timeout_minutes=0))
+        executor.tracker.poll()
+        closed = executor.check_open_trades({"ETH": 3000.0})
+        executor.shutdown()
+
+    assert [t.exit_reason for t in closed] == ["timeout"]
+    close_order = ex.actions[1]["action"]["orders"][0]
+    assert (close_order["b"], close_order["r"]) == (False, True)
+    assert ex.actions[2]["action"] == {"type": "cancel", "cancels": [{"a": 1, "o": oid} for oid in trade.order_ids]}
+    assert ex.positions["ETH"] == 0
+
+
+def test_signature_recovers_to_signer():
+    pytest.importorskip("eth_account")
+    from eth_account import Account
+    from eth_account.messages import encode_typed_data
+
+    from src.execution.signing import EXCHANGE_DOMAIN, Signer, action_hash
+
+    signer = Signer(KEY)
+    action = {"type": "order", "orders": [], "grouping": "na"}
+    sig = signer.sign(action, 1234)
+
+    message = encode_typed_data(full_message={
+        "domain": EXCHANGE_DOMAIN,
+        "types": {
+            "EIP712Domain": [
+                {"name": "name", "type": "string"}, {"name": "version", "type": "string"},
+                {"name": "chainId", "type": "uint256"}, {"name": "verifyingContract", "type": "address"},
+            ],
+            "Agent": [{"name": "source", "type": "string"}, {"name": "connectionId", "type": "bytes32"}],
+        },
+        "primaryType": "Agent",
+        "message": {"source": "a", "connectionId": action_hash(action, 1234)},
+    })
+    recovered = Account.recover_message(message, vrs=(sig["v"], int(sig["r"], 16), int(sig["s"], 16)))
+    assert recovered == signer.address
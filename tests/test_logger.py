@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+import threading
+
+from src.utils.logger import JsonFormatter, RateLimitFilter, configure_logging, flush_logging, setup_logger
+
+
+def _record(name="signal.test", level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_json_formatter_includes_extra_fields():
+    record = _record()
+    record.coin = "BTC"
+    line = json.loads(JsonFormatter().format(record))
+    assert line["msg"] == "hello world"
+    assert line["level"] == "INFO"
+    assert line["logger"] == "signal.test"
+    assert line["coin"] == "BTC"
+
+
+def test_rate_limit_suppresses_and_reports_count():
+    f = RateLimitFilter(rates={"signal.test": 2})
+    results = [f.filter(_record()) for _ in range(5)]
+    assert results[:2] == [True, True]
+    assert not any(results[2:])
+    assert f.filter(_record(level=logging.WARNING))
+    assert f.filter(_record(name="other"))
+
+    f._buckets["signal.test"][0] = 1  # refill one token
+    passed = _record()
+    assert f.filter(passed)
+    assert passed.suppressed == 3
+
+
+def test_sampling_zero_drops_everything():
+    f = RateLimitFilter(samples={"signal.test": 0.0})
+    assert not f.filter(_record())
+
+
+def test_messages_are_formatted_at_the_call_and_written_on_the_writer_thread():
+    formatted = []
+
+    class Probe:
+        def __str__(self):
+            formatted.append(threading.current_thread())
+            return "probe"
+
+    out = io.StringIO()
+    configure_logging(level="INFO", fmt="json", stream=out)
+    try:
+        log = setup_logger("test.pipeline")
+        log.propagate = False  # keep pytest's root capture handler out of the measurement
+        log.debug("skipped %s", Probe())
+        log.info("value=%s", Probe())
+        trade = {"status": "open"}
+        log.info("trade=%s", trade)
+        trade["status"] = "closed"  # after the call: must not show up
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            log.error("failed", exc_info=True)
+        flush_logging()
+    finally:
+        configure_logging(level="INFO", fmt="text", stream=__import__("sys").stdout)
+
+    assert formatted == [threading.current_thread()]  # suppressed DEBUG never formatted
+    lines = [json.loads(line) for line in out.getvalue().strip().splitlines()[-3:]]
+    assert [line["msg"] for line in lines] == ["value=probe", "trade={'status': 'open'}", "failed"]
+    assert "ZeroDivisionError" in lines[-1]["exc"]
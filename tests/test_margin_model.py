@@ -0,0 +1,84 @@
+import pytest
+
+from src.data.margin_model import MarginModel
+from src.data.position_diff import LIQ_MOVED, PositionDiffEngine
+from src.signals.liquidation_map import LiquidationHeatmap
+
+# max leverage 50 -> maintenance margin rate 1%; account margin available 20k at BTC 100k / ETH 3k
+BTC_LIQ = 100_000 - 20_000 / 0.99
+ETH_LIQ = 3_000 + 20_000 / 10.1
+
+
+def _pos(coin, size, mark, liq, mode="cross", margin_used=5_000.0):
+    return {"coin": coin, "size": size, "entry_price": mark, "liquidation_price": liq, "leverage": 10.0,
+            "margin_used": margin_used, "unrealized_pnl": 0.0, "margin_mode": mode, "max_leverage": 50.0}
+
+
+def _setup(*positions):
+    engine = PositionDiffEngine()
+    heatmap = LiquidationHeatmap()
+    engine.subscribe(heatmap.on_events)
+    engine.apply("0xa", list(positions))
+    model = MarginModel(engine)
+    return engine, heatmap, model
+
+
+def _liq(engine, coin, wallet="0xa"):
+    return engine.table.get(wallet, coin).liquidation_price
+
+
+def test_cross_liq_moves_with_the_other_positions_marks():
+    engine, heatmap, model = _setup(_pos("BTC", 1.0, 100_000, BTC_LIQ), _pos("ETH", -10.0, 3_000, ETH_LIQ))
+    assert model.update({"BTC": "100000", "ETH": "3000"}) == []  # calibration reproduces the API
+
+    heatmap.build("ETH", engine.table.batch_for_coin("ETH"), 3_000)
+    events = model.update({"BTC": "90000", "ETH": "3000"})
+    # BTC's own loss eats 9.9k of margin available; ETH's short now liquidates at 4000
+    assert [(e.kind, e.coin) for e in events] == [(LIQ_MOVED, "ETH")]
+    assert _liq(engine, "ETH") == pytest.approx(4_000)
+    assert _liq(engine, "BTC") == pytest.approx(BTC_LIQ)  # own mark move leaves it in place
+    assert heatmap.cached("ETH", 3_000) is None  # rebuilt on the next cycle
+
+
+def test_isolated_positions_stay_put_and_rescan_recalibrates():
+    engine, _, model = _setup(_pos("BTC", 1.0, 100_000, 92_000, mode="isolated"),
+                              _pos("ETH", -10.0, 3_000, ETH_LIQ))
+    model.update({"BTC": "80000", "ETH": "3000"})
+    assert _liq(engine, "BTC") == 92_000
+    assert _liq(engine, "ETH") == pytest.approx(ETH_LIQ)  # alone in its cross group
+
+    # A fresh scan replaces the local estimate with the API's number
+    engine.apply("0xa", [_pos("ETH", -10.0, 3_000, 5_000.0)])
+    assert model.update({"ETH": "3000"}) == []
+    assert _liq(engine, "ETH") == 5_000.0
+    assert engine.table.get("0xa", "BTC") is None
+
+
+def test_missing_liquidation_prices_are_estimated():
+    engine, _, model = _setup(
+        _pos("BTC", 1.0, 100_000, BTC_LIQ), _pos("ETH", -10.0, 3_000, None),  # cross: from account margin
+        _pos("SOL", 100.0, 150.0, None, mode="isolated", margin_used=1_500.0),  # 10x isolated
+    )
+    events = model.update({"BTC": "100000", "ETH": "3000", "SOL": "150"})
+    assert {e.coin for e in events} == {"ETH", "SOL"}
+    assert _liq(engine, "ETH") == pytest.approx(ETH_LIQ)
+    assert _liq(engine, "SOL") == pytest.approx(150 - (1_500 - 150) / 99)
+
+
+def test_updates_vectorize_across_wallets():
+    engine = PositionDiffEngine()
+    for i in range(50):
+        engine.apply(f"0x{i}", [_pos("BTC", 1.0, 100_000, BTC_LIQ), _pos("ETH", -10.0, 3_000, ETH_LIQ)])
+    model = MarginModel(engine)
+    model.update({"BTC": "100000", "ETH": "3000"})
+    events = model.update({"BTC": "90000", "ETH": "3000"})
+    assert len(events) == 50
+    assert all(e.liquidation_price == pytest.approx(4_000) for e in events)
+
+
+def test_pruned_wallets_release_their_groups():
+    engine, _, model = _setup(_pos("BTC", 1.0, 100_000, BTC_LIQ), _pos("ETH", -10.0, 3_000, ETH_LIQ))
+    model.update({"BTC": "100000", "ETH": "3000"})
+    engine.prune([])
+    assert model.update({"BTC": "90000", "ETH": "3000"}) == []
+    assert model._groups == {} and model._free_groups == [0]
@@ -0,0 +1,68 @@
+import urllib.request
+
+import pytest
+
+import main
+from src.utils import metrics
+from tests.test_strategies import BASE, CountingClient
+
+
+@pytest.fixture
+def enabled():
+    metrics.registry.clear()
+    metrics.enable()
+    yield metrics.registry
+    metrics.enable(False)
+    metrics.registry.clear()
+    metrics.stop_server()
+
+
+def test_disabled_is_a_no_op():
+    metrics.registry.clear()
+    with metrics.stage("prices"):
+        pass
+    metrics.inc("cycle_overruns_total")
+    metrics.observe_request("hyperliquid", "allMids", 0.01, 100)
+    metrics.cache_result("heatmap", True)
+    assert metrics.registry.render() == "\n"
+    assert metrics.stage("x") is metrics.stage("y")  # shared no-op, nothing allocated
+
+
+def test_histogram_quantile_and_render(enabled):
+    for v in (0.002, 0.002, 0.02, 3.0):
+        metrics.observe("stage_seconds", v, stage="whale_scan")
+    metrics.observe_request("binance", "/fapi/v1/premiumIndex", 0.05, 1234, ok=False)
+    metrics.cache_result("heatmap", True)
+    metrics.cache_result("heatmap", True)
+    metrics.cache_result("heatmap", False)
+
+    hist = next(iter(enabled.histograms.values()))
+    assert hist.quantile(0.5) == 0.0025 and hist.quantile(1.0) == 5.0
+
+    text = enabled.render()
+    assert "# TYPE liqhunter_stage_seconds histogram" in text
+    assert 'liqhunter_stage_seconds_bucket{stage="whale_scan",le="0.0025"} 2' in text
+    assert 'liqhunter_stage_seconds_bucket{stage="whale_scan",le="+Inf"} 4' in text
+    assert 'liqhunter_stage_seconds_count{stage="whale_scan"} 4' in text
+    assert ('liqhunter_requests_total{endpoint="/fapi/v1/premiumIndex",outcome="error",venue="binance"} 1'
+            in text)
+    assert 'liqhunter_response_bytes_total{endpoint="/fapi/v1/premiumIndex",venue="binance"} 1234' in text
+
+    summary = enabled.summary()
+    assert "whale_scan n=4" in summary and "heatmap_hit_rate=67%" in summary and "overruns=0" in summary
+
+
+def test_run_cycle_stages_and_scrape(enabled):
+    from src.execution.paper_executor import PaperExecutor
+    from src.strategies import Strategy
+
+    main.run_cycle(CountingClient(), BASE, [Strategy("default", BASE, PaperExecutor(state_path=None))])
+    stages = {dict(labels)["stage"] for name, labels in enabled.histograms if name == "stage_seconds"}
+    assert {"prices", "exits", "funding", "open_interest", "signals"} <= stages
+
+    server = metrics.serve(0)
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+        body = resp.read().decode()
+    assert resp.headers["Content-Type"].startswith("text/plain")
+    assert 'liqhunter_stage_seconds_count{stage="prices"} 1' in body
@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.execution.paper_executor import PaperExecutor
+from src.models import Decision, FundingSignal, Position, PositionBatch, Trade
+from src.signals.liquidation_map import build_liquidation_clusters
+
+
+def test_record_supports_dict_access():
+    sig = FundingSignal(strength=0.5, direction="short", rate=0.001)
+    assert sig["direction"] == "short"
+    assert sig.get("missing", 1) == 1
+    assert "rate" in sig
+    assert sig == {"strength": 0.5, "direction": "short", "rate": 0.001}
+    assert sig.to_dict() == {"strength": 0.5, "direction": "short", "rate": 0.001}
+
+
+def test_none_fields_behave_like_dict_keys():
+    decision = Decision(coin="BTC", confidence=0.5, target_price=None)
+    plain = {"coin": "BTC", "confidence": 0.5, "target_price": None}
+    for key in ("target_price", "direction"):
+        assert (key in decision) == (key in plain)
+        assert decision.get(key, "x") == plain.get(key, "x")
+    assert decision == plain and decision.keys() == list(plain)
+    assert decision.direction is None
+    with pytest.raises(KeyError):
+        decision["direction"]
+
+
+def test_record_rejects_unknown_fields():
+    pos = Position(coin="BTC", size=1.0)
+    with pytest.raises(AttributeError):
+        pos.sise = 2.0
+    with pytest.raises(KeyError):
+        pos["sise"] = 2.0
+    with pytest.raises(TypeError):
+        Position(coin="BTC", sise=1.0)
+
+
+def test_trade_round_trips_state_format():
+    trade = Trade(coin="ETH", direction="long", confidence=0.7, entry_capital=75.0, entry_time=1.0,
+                  take_profit_pct=2.0, stop_loss_pct=1.0, timeout_minutes=30, entry_price=None, status="open")
+    data = trade.to_dict()
+    assert data["entry_price"] is None
+    assert "exit_price" not in data
+    assert Trade.from_dict(json.loads(json.dumps(data))) == trade
+
+
+def test_batch_clusters_match_list_clusters():
+    positions = [
+        Position(coin="BTC", size=1.0, liquidation_price=95_000.0, margin_used=10_000.0),
+        Position(coin="BTC", size=2.0, liquidation_price=95_100.0, margin_used=0.0),
+        Position(coin="BTC", size=1.0, liquidation_price=None, margin_used=5_000.0),
+        Position(coin="BTC", size=-3.0, liquidation_price=104_000.0, margin_used=20_000.0),
+    ]
+    batch = PositionBatch.from_records("BTC", positions)
+    assert len(batch) == 4
+    assert batch[2]["liquidation_price"] is None
+    assert build_liquidation_clusters(batch, 100_000) == build_liquidation_clusters(positions, 100_000)
+
+
+def test_paper_executor_persists_trade_records(tmp_path):
+    path = tmp_path / "state.json"
+    executor = PaperExecutor(state_path=str(path))
+    decision = Decision(coin="BTC", direction="short", confidence=0.8, signals={}, target_price=None)
+    executor.execute_trade(decision, 100.0, {"take_profit_pct": 2.0, "stop_loss_pct": 1.0})
+    executor.check_open_trades({"BTC": 100_000.0})
+    closed = executor.check_open_trades({"BTC": 97_000.0})
+
+    assert closed[0].exit_reason == "take_profit"
+    reloaded = PaperExecutor(state_path=str(path))
+    assert reloaded.closed_trades[0]["pnl_usd"] == pytest.approx(3.0)
+    assert reloaded.total_pnl == pytest.approx(3.0)
@@ -0,0 +1,93 @@
+from src.data.position_diff import (
+    CLOSE, INCREASE, LEVERAGE, LIQ_MOVED, OPEN, REDUCE, PositionDiffEngine,
+)
+from src.signals.liquidation_map import LiquidationHeatmap
+
+
+def _pos(coin, size, liq, leverage=10.0):
+    return {"coin": coin, "size": size, "entry_price": 100.0, "liquidation_price": liq,
+            "leverage": leverage, "margin_used": 1_000.0, "unrealized_pnl": 0.0}
+
+
+def _kinds(events):
+    return [(e.kind, e.coin) for e in events]
+
+
+def test_first_scan_emits_opens():
+    engine = PositionDiffEngine()
+    events = engine.apply("0xa", [_pos("BTC", 1.0, 90.0), _pos("ETH", -2.0, 110.0)])
+    assert _kinds(events) == [(OPEN, "BTC"), (OPEN, "ETH")]
+    assert len(engine.table) == 2
+
+
+def test_unchanged_positions_emit_nothing():
+    engine = PositionDiffEngine()
+    engine.apply("0xa", [_pos("BTC", 1.0, 90.0)])
+    assert engine.apply("0xa", [_pos("BTC", 1.0, 90.0)]) == []
+
+
+def test_increase_reduce_leverage_and_liq_moves():
+    engine = PositionDiffEngine()
+    engine.apply("0xa", [_pos("BTC", 1.0, 90.0), _pos("ETH", 5.0, 80.0)])
+    events = engine.apply("0xa", [_pos("BTC", 2.0, 95.0, leverage=20.0), _pos("ETH", 3.0, 80.0)])
+    assert _kinds(events) == [(INCREASE, "BTC"), (LEVERAGE, "BTC"), (LIQ_MOVED, "BTC"), (REDUCE, "ETH")]
+    assert events[2].prev_liquidation_price == 90.0
+    assert events[2].liquidation_price == 95.0
+
+
+def test_missing_coin_closes_and_flip_is_close_then_open():
+    engine = PositionDiffEngine()
+    engine.apply("0xa", [_pos("BTC", 1.0, 90.0), _pos("ETH", 1.0, 80.0)])
+    events = engine.apply("0xa", [_pos("BTC", -1.0, 110.0)])
+    assert _kinds(events) == [(CLOSE, "BTC"), (OPEN, "BTC"), (CLOSE, "ETH")]
+    assert engine.table.get("0xa", "ETH") is None
+    assert engine.table.get("0xa", "BTC")["size"] == -1.0
+
+
+def test_table_reuses_rows_and_groups_by_coin():
+    engine = PositionDiffEngine()
+    engine.apply("0xa", [_pos("BTC", 1.0, 90.0)])
+    engine.apply("0xb", [_pos("BTC", 2.0, None)])
+    engine.apply("0xa", [])
+    engine.apply("0xc", [_pos("SOL", 3.0, 70.0)])
+    assert len(engine.table.wallets) == 2  # row freed by 0xa was reused
+
+    view = engine.table.positions_by_coin(["BTC", "SOL", "ETH"])
+    assert [p["wallet"] for p in view["BTC"]] == ["0xb"]
+    assert view["BTC"][0]["liquidation_price"] is None
+    assert len(view.get("ETH")) == 0
+
+
+def test_prune_closes_untracked_wallets():
+    engine = PositionDiffEngine()
+    engine.apply("0xa", [_pos("BTC", 1.0, 90.0)])
+    engine.apply("0xb", [_pos("ETH", 1.0, 90.0)])
+    events = engine.prune(["0xb"])
+    assert _kinds(events) == [(CLOSE, "BTC")]
+    assert engine.table.tracked_wallets() == ["0xb"]
+
+
+def test_heatmap_rebuilds_only_changed_coins():
+    engine = PositionDiffEngine()
+    heatmap = LiquidationHeatmap()
+    engine.subscribe(heatmap.on_events)
+
+    engine.apply("0xa", [_pos("BTC", 1.0, 99.0), _pos("ETH", 1.0, 98.0)])
+    for coin in ("BTC", "ETH"):
+        assert heatmap.cached(coin, 100.0) is None
+        heatmap.build(coin, engine.table.positions_for_coin(coin), 100.0)
+
+    engine.apply("0xa", [_pos("BTC", 2.0, 99.0), _pos("ETH", 1.0, 98.0)])
+    assert heatmap.cached("BTC", 100.0) is None
+    assert heatmap.cached("ETH", 100.1) is not None
+    assert heatmap.cached("ETH", 101.0) is None  # drifted more than half a bin
+
+
+def test_heatmap_rebuilds_when_price_crosses_a_liquidation_price():
+    heatmap = LiquidationHeatmap()
+    (cluster,) = heatmap.build("BTC", [_pos("BTC", -1.0, 100.1)], 100.0)
+    assert cluster["direction"] == "short"
+    assert heatmap.cached("BTC", 100.05) is not None
+    assert heatmap.cached("BTC", 100.2) is None  # within half a bin, but the shorts' side flipped
+    (cluster,) = heatmap.build("BTC", [_pos("BTC", -1.0, 100.1)], 100.2)
+    assert cluster["direction"] == "long"
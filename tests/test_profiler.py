@@ -0,0 +1,56 @@
+import os
+import signal
+
+import pytest
+
+import main
+from src.execution.paper_executor import PaperExecutor
+from src.strategies import Strategy
+from src.utils import metrics
+from src.utils.profiler import CycleProfiler
+from tests.test_strategies import BASE, CountingClient
+
+
+def _cycle():
+    main.run_cycle(CountingClient(), BASE, [Strategy("default", BASE, PaperExecutor(state_path=None))])
+
+
+def test_trigger_file_profiles_n_cycles_then_stops(tmp_path):
+    trigger = tmp_path / "profile.trigger"
+    profiler = CycleProfiler(str(tmp_path / "profiles"), cycles=5, trigger_file=str(trigger))
+
+    with profiler.cycle(1):
+        _cycle()
+    assert not profiler.active and not (tmp_path / "profiles").exists()
+
+    trigger.write_text("2")
+    for n in (2, 3, 4):
+        with profiler.cycle(n):
+            _cycle()
+    assert not trigger.exists() and not profiler.active and not metrics.enabled()
+
+    (run,) = (tmp_path / "profiles").iterdir()
+    assert (run / "cpu.prof").stat().st_size > 0
+    report = (run / "report.txt").read_text()
+    assert "Profiled 2 cycle(s)" in report
+    assert "cycle 2:" in report and "cycle 3:" in report and "cycle 4:" not in report
+    assert "prices" in report and "signals" in report
+    assert "run_cycle" in report
+    assert "== Allocations" in report
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="no SIGUSR1 on this platform")
+def test_sigusr1_arms_default_cycles(tmp_path):
+    previous = signal.getsignal(signal.SIGUSR1)
+    profiler = CycleProfiler(str(tmp_path), cycles=1)
+    try:
+        assert profiler.install_signal()
+        os.kill(os.getpid(), signal.SIGUSR1)
+        with profiler.cycle(7):
+            assert profiler.active
+            _cycle()
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+    assert not profiler.active
+    (run,) = tmp_path.iterdir()
+    assert "cycle 7:" in (run / "report.txt").read_text()
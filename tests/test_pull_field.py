@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from src.signals import pull_field
+from src.signals.pull_field import convolve_rows, decay_kernels, pull_signals
+from src.signals.signal_aggregator import aggregate_signals
+
+
+def _cluster(price, volume):
+    return {"price": price, "volume": volume, "count": 1, "direction": "short", "distance_pct": 0.0}
+
+
+def test_fft_and_direct_convolution_agree(monkeypatch):
+    rng = np.random.default_rng(0)
+    mass = rng.random((5, 201))
+    kernel, _ = decay_kernels(0.1, 10.0, 1.5)
+    fft = convolve_rows(mass, kernel)
+    monkeypatch.setattr(pull_field, "FFT_MIN_KERNEL", 10**9)
+    direct = convolve_rows(mass, kernel)
+    expected = np.array([np.convolve(row, kernel, mode="same") for row in mass])
+    assert np.allclose(fft, expected) and np.allclose(direct, expected)
+
+
+def test_net_pull_points_at_the_heavier_nearer_side():
+    clusters = {
+        # 100k of shorts 1% above vs 150k of longs 4% below: the nearer cluster wins
+        "BTC": [_cluster(101.0, 100_000), _cluster(96.0, 150_000)],
+        "ETH": [_cluster(99.0, 100_000)],
+        "SOL": [_cluster(150.0, 1e9)],  # outside the grid
+    }
+    signals = pull_signals(clusters, {"BTC": 100.0, "ETH": 100.0, "SOL": 100.0}, volume_baseline=50_000)
+    btc, eth = signals["BTC"], signals["ETH"]
+    k = np.exp(-1 / 1.5)
+    assert btc.direction == "long" and btc.net_pull == pytest.approx(100_000 * k - 150_000 * np.exp(-4 / 1.5))
+    assert btc.target_price == pytest.approx(101.0) and btc.distance_pct == pytest.approx(1.0)
+    assert eth.direction == "short" and eth.target_price == pytest.approx(99.0)
+    assert eth.strength == pytest.approx(min(100_000 * k / 50_000, 1.0))
+    assert "SOL" not in signals
+
+
+def test_pull_joins_the_aggregate_when_weighted_and_supplies_a_target():
+    pull = {"BTC": {"strength": 1.0, "direction": "long", "net_pull": 1e6, "target_price": 101.0,
+                    "distance_pct": 1.0}}
+    assert aggregate_signals({}, {}, {}, 0.5, pull_signals=pull) == []  # opt-in: weight 0 by default
+    weights = {"pull": 0.2}
+    decisions = aggregate_signals({}, {}, {}, 0.5, weights, pull_signals=pull)
+    assert decisions[0].direction == "long" and decisions[0].target_price == 101.0
+    assert aggregate_signals({}, {}, {}, 0.5, weights, staleness={"pull": 0.25}, pull_signals=pull) == []
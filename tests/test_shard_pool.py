@@ -0,0 +1,85 @@
+from src.signals.coin_evaluator import evaluate_coins
+from src.signals.signal_aggregator import merge_decisions
+from src.workers.shard_pool import ShardPool, shard_indices
+from src.workers.shared_snapshot import SharedSnapshot
+
+SIG_CFG = {
+    "funding_rate_threshold": 0.0005,
+    "oi_delta_threshold": 5.0,
+    "liquidation_proximity": 1.5,
+    "min_confidence": 0.3,
+    "volume_baseline_usd": 25_000,
+}
+
+
+def _inputs():
+    coins = ["BTC", "ETH", "SOL", "DOGE"]
+    prices = {"BTC": 100_000.0, "ETH": 3_000.0, "SOL": 150.0}
+    funding = {"BTC": 0.001, "ETH": -0.0008, "SOL": 0.0001}
+    fund_thr = {c: 0.0005 for c in coins}
+    oi_deltas = {"BTC": 10.0, "ETH": None, "SOL": 2.0, "DOGE": None}
+    price_deltas = {"BTC": 0.5, "ETH": 1.0, "SOL": None, "DOGE": None}
+    oi_thr = {c: 5.0 for c in coins}
+    positions = {
+        "BTC": [
+            {"coin": "BTC", "size": 1.0, "liquidation_price": 99_500.0, "margin_used": 10_000},
+            {"coin": "BTC", "size": -2.0, "liquidation_price": None, "margin_used": 5_000},
+        ],
+        "SOL": [{"coin": "SOL", "size": 100.0, "liquidation_price": 149.0, "margin_used": 30_000}],
+    }
+    return coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions
+
+
+def test_shard_indices_cover_all_items_once():
+    shards = shard_indices(10, 3)
+    assert len(shards) == 3
+    assert sorted(i for s in shards for i in s) == list(range(10))
+    assert shard_indices(2, 8) == [[0], [1]]
+    assert shard_indices(0, 4) == []
+
+
+def test_shared_snapshot_round_trip():
+    coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions = _inputs()
+    snap = SharedSnapshot.create(coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions)
+    try:
+        reader = SharedSnapshot.attach(snap.name, snap.coins, snap.n_positions)
+        data = reader.read_coins(range(len(coins)))
+        reader.close()
+    finally:
+        snap.close()
+
+    assert data["prices"] == prices
+    assert data["funding_rates"] == funding
+    assert data["oi_deltas"] == oi_deltas
+    assert data["price_deltas"] == price_deltas
+    assert len(data["positions_by_coin"]["BTC"]) == 2
+    assert data["positions_by_coin"]["BTC"][0]["margin_used"] == 10_000
+    assert data["positions_by_coin"]["BTC"][1]["liquidation_price"] is None
+    assert "DOGE" not in data["positions_by_coin"]
+
+
+def test_sharded_pool_matches_single_process():
+    coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions = _inputs()
+    single = evaluate_coins(coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions, SIG_CFG)
+    expected = merge_decisions([single], [], 10)
+
+    pool = ShardPool(2)
+    try:
+        sharded = pool.evaluate(
+            coins, prices, funding, fund_thr, oi_deltas, price_deltas, oi_thr, positions, SIG_CFG, [], 10
+        )
+    finally:
+        pool.shutdown()
+
+    assert [(d["coin"], d["direction"], d["confidence"]) for d in sharded] == \
+        [(d["coin"], d["direction"], d["confidence"]) for d in expected]
+
+
+def test_merge_respects_global_limits():
+    batches = [
+        [{"coin": "BTC", "confidence": 0.9}, {"coin": "SOL", "confidence": 0.5}],
+        [{"coin": "ETH", "confidence": 0.7}],
+    ]
+    merged = merge_decisions(batches, [{"coin": "BTC"}], max_positions=2)
+    assert [d["coin"] for d in merged] == ["ETH"]
+    assert merge_decisions(batches, [{"coin": "X"}, {"coin": "Y"}], max_positions=2) == []
@@ -0,0 +1,98 @@
+import pytest
+
+import main
+from src.data.open_interest import clear_history
+from src.execution.paper_executor import PaperExecutor
+from src.strategies import Strategy, merge_config, strategy_configs
+
+BASE = {
+    "mode": "paper",
+    "coins": ["BTC", "ETH"],
+    "total_capital_usd": 1000,
+    "whale_wallets": [],
+    "signals": {
+        "funding_rate_threshold": 0.0005,
+        "oi_delta_threshold": 5.0,
+        "liquidation_proximity": 1.5,
+        "min_confidence": 0.6,
+    },
+    "execution": {"position_size_pct": 10, "max_positions": 2},
+}
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def get_all_mids(self):
+        self.calls.append("allMids")
+        return {"BTC": "100000", "ETH": "3000"}
+
+    def get_meta_and_contexts(self):
+        self.calls.append("metaAndAssetCtxs")
+        return [
+            {"universe": [{"name": "BTC"}, {"name": "ETH"}]},
+            [{"funding": "0.002", "openInterest": "10"}, {"funding": "0.0001", "openInterest": "100"}],
+        ]
+
+
+def test_strategy_configs_merge_and_state_paths():
+    config = dict(BASE, strategies=[
+        {"name": "tight", "execution": {"take_profit_pct": 1.0}},
+        {"name": "eth", "coins": ["ETH"]},
+    ])
+    (n1, c1), (n2, c2) = strategy_configs(config)
+    assert (n1, n2) == ("tight", "eth")
+    assert c1["execution"] == {"position_size_pct": 10, "max_positions": 2, "take_profit_pct": 1.0,
+                               "state_path": "data/paper_state_tight.json"}
+    assert c2["coins"] == ["ETH"] and c2["signals"] == BASE["signals"]
+    assert "strategies" not in c1
+    assert strategy_configs(BASE) == [("default", BASE)]
+    assert merge_config({"a": {"b": 1, "c": 2}}, {"a": {"c": 3}}) == {"a": {"b": 1, "c": 3}}
+
+
+def test_one_fetch_fans_out_to_every_strategy(tmp_path):
+    clear_history()
+    strict = merge_config(BASE, {"signals": {"min_confidence": 1.01}})
+    eth_only = merge_config(BASE, {"coins": ["ETH"]})
+    strategies = [
+        Strategy(name, cfg, PaperExecutor(state_path=str(tmp_path / f"{name}.json")))
+        for name, cfg in (("loose", BASE), ("strict", strict), ("eth", eth_only))
+    ]
+    client = CountingClient()
+    main.run_cycle(client, BASE, strategies)
+
+    # Same API calls as a single strategy: mids once, funding + OI contexts once each
+    assert client.calls == ["allMids", "metaAndAssetCtxs", "metaAndAssetCtxs"]
+    loose, strict_s, eth = (s.executor.get_open_positions() for s in strategies)
+    assert [(t.coin, t.direction) for t in loose] == [("BTC", "short")]
+    assert strict_s == [] and eth == []
+    # Separate state files
+    assert len(PaperExecutor(state_path=str(tmp_path / "loose.json")).open_trades) == 1
+    assert PaperExecutor(state_path=str(tmp_path / "strict.json")).open_trades == []
+
+
+class BookClient(CountingClient):
+    def get_l2_book(self, coin):
+        self.calls.append(f"l2Book:{coin}")
+        return {"levels": [
+            [{"px": "99990", "sz": "0.0005"}, {"px": "99900", "sz": "0.01"}],  # $50, then a $999 wall
+            [{"px": "100010", "sz": "0.5"}],
+        ]}
+
+
+def test_size_capped_by_slippage_budget_and_walls_checked_before_trading(tmp_path):
+    clear_history()
+    config = merge_config(BASE, {
+        "signals": {"min_wall_notional": 500},
+        "execution": {"slippage_budget_bps": 5, "min_trade_usd": 10},
+    })
+    strategy = Strategy("default", config, PaperExecutor(state_path=str(tmp_path / "s.json")))
+    client = BookClient()
+    main.run_cycle(client, config, [strategy])
+
+    assert client.calls.count("l2Book:BTC") == 1  # one fetch serves the wall filter and the sizing
+    (trade,) = strategy.executor.get_open_positions()
+    assert (trade.coin, trade.direction) == ("BTC", "short")
+    # $100 wanted; the first level plus 0.0004 of the second averages exactly 5 bps under the 100000 mid
+    assert trade.entry_capital == pytest.approx(0.0005 * 99990 + 0.0004 * 99900)
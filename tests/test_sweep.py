@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from src.backtest.dataset import SharedDataset
+from src.backtest.engine import Backtest
+from src.backtest.recorder import read_snapshots
+from src.backtest.sweep import apply_overrides, expand_grid, run_sweep, sample_random, summarize
+from tests.test_backtest import CONFIG, _record
+
+
+@pytest.fixture(scope="module")
+def snapshots(tmp_path_factory):
+    path = tmp_path_factory.mktemp("sweep") / "snaps.jsonl"
+    _record(path, 300)
+    return list(read_snapshots(str(path)))
+
+
+def test_shared_dataset_round_trip(snapshots):
+    dataset = SharedDataset.create(snapshots, CONFIG["coins"])
+    try:
+        attached = SharedDataset.attach(dataset.name, dataset.layout)
+        restored = attached.to_snapshots()
+        attached.close()
+    finally:
+        dataset.close()
+
+    assert len(restored) == len(snapshots)
+    for a, b in zip(snapshots, restored):
+        assert (a["kind"], a["ts"], a["prices"]) == (b["kind"], b["ts"], b["prices"])
+        if a["kind"] == "cycle":
+            assert a["funding"] == b["funding"] and a["oi"] == b["oi"]
+            np.testing.assert_array_equal(a["positions"]["BTC"].data, b["positions"]["BTC"].data)
+
+
+def test_param_spaces():
+    grid = expand_grid({"a": [1, 2], "b.c": [3, 4, 5]})
+    assert len(grid) == 6 and {"a": 2, "b.c": 5} in grid
+    points = sample_random({"x": {"min": 0.0, "max": 1.0}, "y": ["p", "q"]}, 50, seed=1)
+    assert len(points) == 50 and all(0 <= p["x"] <= 1 and p["y"] in "pq" for p in points)
+    assert points == sample_random({"x": {"min": 0.0, "max": 1.0}, "y": ["p", "q"]}, 50, seed=1)
+
+    cfg = apply_overrides(CONFIG, {"signals.weights.funding": 0.5, "execution.take_profit_pct": 3.0})
+    assert cfg["signals"]["weights"] == {"funding": 0.5}
+    assert cfg["execution"]["take_profit_pct"] == 3.0 and CONFIG["execution"]["take_profit_pct"] == 2.0
+
+
+def test_sweep_ranks_and_matches_plain_backtest(snapshots):
+    configs = expand_grid({
+        "execution.take_profit_pct": [1.0, 2.0, 4.0],
+        "signals.min_confidence": [0.6, 0.99],
+    })
+    rows = run_sweep(snapshots, CONFIG, configs, workers=2)
+
+    assert [r["rank"] for r in rows] == list(range(1, 7))
+    assert [r["total_pnl"] for r in rows] == sorted((r["total_pnl"] for r in rows), reverse=True)
+
+    # The cached-stage path gives the same answer as a plain replay
+    base = next(r for r in rows if r["execution.take_profit_pct"] == 2.0 and r["signals.min_confidence"] == 0.6)
+    plain = summarize(Backtest(CONFIG).run(snapshots), CONFIG["total_capital_usd"])
+    assert base["trades"] == plain["trades"] > 0
+    assert base["total_pnl"] == pytest.approx(plain["total_pnl"])
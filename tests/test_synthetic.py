@@ -0,0 +1,82 @@
+import main
+from src.data.funding import fetch_funding_rates
+from src.data.open_interest import clear_history, fetch_open_interest
+from src.data.orderbook import fetch_orderbook
+from src.data.positions import fetch_positions
+from src.data.synthetic import SyntheticClient, SyntheticMarket, _px
+from src.data.whale_tracker import scan_whale_orders
+from src.execution.paper_executor import PaperExecutor
+from src.strategies import Strategy
+
+
+def test_seeded_and_lazy():
+    a, b = SyntheticMarket(n_wallets=200, seed=3), SyntheticMarket(n_wallets=200, seed=3)
+    assert list(a.wallets()) == list(b.wallets())
+    assert a.clearinghouse_state(a.wallet(7)) == b.clearinghouse_state(b.wallet(7))
+    assert a.clearinghouse_state(a.wallet(7)) != SyntheticMarket(n_wallets=200, seed=4).clearinghouse_state(a.wallet(7))
+    # Unknown / out-of-range addresses look like empty accounts
+    assert a.clearinghouse_state("0x" + "0" * 40)["assetPositions"] == []
+    assert a.clearinghouse_state(a.wallet(500))["assetPositions"] == []
+
+    streamed = a.iter_positions()
+    assert next(streamed)[0] == a.wallet(0)  # generator, nothing materialized up front
+    assert sum(1 for _ in a.iter_positions()) == sum(len(a.positions(i)) for i in range(200))
+    assert _px(100_000.4) == "100000" and _px(3012.345) == "3012.3" and _px(0.152345) == "0.15235"
+
+
+def test_responses_parse_through_the_real_client_paths():
+    market = SyntheticMarket(n_wallets=100, seed=1)
+    client = SyntheticClient(market)
+    coins = ["BTC", "ETH"]
+
+    assert set(fetch_funding_rates(client, coins)) == set(coins)
+    assert all(v > 0 for v in fetch_open_interest(client, coins).values())
+    book = fetch_orderbook(client, "BTC")
+    mid = float(client.get_all_mids()["BTC"])
+    assert len(book["bids"]) == market.book_levels and book["bids"][0][0] < mid < book["asks"][0][0]
+
+    wallet = next(w for w in market.wallets() if market.clearinghouse_state(w)["assetPositions"])
+    positions = fetch_positions(client, wallet)
+    for p in positions:
+        below = p.liquidation_price < p.entry_price
+        assert below == (p.size > 0) and p.margin_used > 0 and p.wallet == wallet
+
+    orders = scan_whale_orders(client, list(market.wallets()), market.names)
+    triggers = [o for os_ in orders.values() for o in os_]
+    assert triggers and {o.order_type for o in triggers} == {"Stop Market", "Take Profit Market"}
+    candles = client._post({"type": "candleSnapshot", "req": {"coin": "ETH", "interval": "1h",
+                                                              "startTime": 0, "endTime": int(market.now * 1000)}})
+    assert candles == [] or float(candles[-1]["c"]) == float(client.get_all_mids()["ETH"])
+
+
+def test_cascade_liquidates_longs_and_flushes_oi():
+    market = SyntheticMarket(n_wallets=2000, seed=2)
+    longs_before = sum(1 for _, p in market.iter_positions("ETH") if float(p["position"]["szi"]) > 0)
+    oi_before = market.open_interest[market.names.index("ETH")]
+
+    market.inject_cascade("ETH", drop_pct=10, duration_seconds=300)
+    market.advance(300, step=5)
+
+    eth = market.names.index("ETH")
+    assert market.price[eth] < 3000 * 0.93
+    longs_after = sum(1 for _, p in market.iter_positions("ETH") if float(p["position"]["szi"]) > 0)
+    assert longs_after < longs_before * 0.9
+    assert market.open_interest[eth] < oi_before * 0.85
+    assert market.funding[eth] < 0
+
+
+def test_run_cycle_on_synthetic_client(tmp_path):
+    clear_history()
+    market = SyntheticMarket(n_wallets=300, seed=5)
+    config = {
+        "mode": "paper", "coins": ["BTC", "ETH", "SOL"], "total_capital_usd": 1000,
+        "whale_wallets": list(market.wallets()),
+        "signals": {"funding_rate_threshold": 0.0005, "oi_delta_threshold": 5.0,
+                    "liquidation_proximity": 1.5, "min_confidence": 0.6},
+        "execution": {"position_size_pct": 10, "max_positions": 2},
+    }
+    strategy = Strategy("default", config, PaperExecutor(state_path=str(tmp_path / "state.json")))
+    client = SyntheticClient(market)
+    for _ in range(3):
+        main.run_cycle(client, config, [strategy])
+        market.advance(60, step=5)
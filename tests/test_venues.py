@@ -0,0 +1,95 @@
+import pytest
+
+from src.data.hyperliquid_client import HyperliquidClient
+from src.data.venues.aggregator import VenueAggregator, aggregate_funding, aggregate_open_interest
+from src.data.venues.base import VenueSnapshot
+from src.data.venues.binance import BinanceAdapter
+from src.data.venues.dydx import DydxAdapter
+from src.data.venues.hyperliquid import HyperliquidAdapter
+from tests.fixture_server import FixtureServer
+
+BINANCE_ROUTES = {
+    "/fapi/v1/premiumIndex": [
+        {"symbol": "BTCUSDT", "markPrice": "100000", "lastFundingRate": "0.0008"},
+        {"symbol": "ETHUSDT", "markPrice": "3000", "lastFundingRate": "-0.0004"},
+    ],
+    "/fapi/v1/fundingInfo": [{"symbol": "ETHUSDT", "fundingIntervalHours": 4}],
+    "/fapi/v1/openInterest": lambda q, b: (200, {"symbol": q["symbol"], "openInterest": "10"}),
+    "/fapi/v1/depth": {"bids": [["99990", "1.5"]], "asks": [["100010", "2"]]},
+}
+
+DYDX_ROUTES = {
+    "/v4/perpetualMarkets": {"markets": {
+        "BTC-USD": {"oraclePrice": "100100", "nextFundingRate": "0.00002", "openInterest": "50"},
+    }},
+    "/v4/trades/perpetualMarket/BTC-USD": {"trades": [
+        {"type": "LIQUIDATED", "side": "SELL", "price": "99000", "size": "0.5", "createdAt": "t1"},
+        {"type": "LIMIT", "side": "BUY", "price": "99100", "size": "1", "createdAt": "t2"},
+    ]},
+}
+
+HL_META = [
+    {"universe": [{"name": "BTC"}, {"name": "ETH"}]},
+    [
+        {"funding": "0.0000125", "openInterest": "20", "markPx": "100050"},
+        {"funding": "0.00001", "openInterest": "1000", "markPx": "3001"},
+    ],
+]
+
+
+def test_binance_normalizes_funding_and_oi():
+    with FixtureServer(BINANCE_ROUTES) as srv:
+        snap = BinanceAdapter(base_url=srv.url).snapshot(["BTC", "ETH", "DOGE"], now=1.0)
+        book = BinanceAdapter(base_url=srv.url).get_book("BTC")
+
+    assert snap.funding["BTC"] == pytest.approx(0.0001)   # 8h default
+    assert snap.funding["ETH"] == pytest.approx(-0.0001)  # 4h interval
+    assert snap.open_interest_usd["BTC"] == pytest.approx(1_000_000)
+    assert "DOGE" not in snap.mids
+    assert book == {"bids": [(99990.0, 1.5)], "asks": [(100010.0, 2.0)]}
+
+
+def test_dydx_snapshot_and_liquidations():
+    with FixtureServer(DYDX_ROUTES) as srv:
+        adapter = DydxAdapter(base_url=srv.url)
+        snap = adapter.snapshot(["BTC", "ETH"], now=1.0)
+        liqs = adapter.get_liquidations(["BTC"])
+
+    assert snap.funding == {"BTC": 0.00002}
+    assert snap.open_interest_usd["BTC"] == pytest.approx(5_005_000)
+    assert len(liqs) == 1
+    assert liqs[0]["side"] == "sell"
+    assert liqs[0]["notional_usd"] == pytest.approx(49_500)
+
+
+def test_hyperliquid_snapshot_uses_single_request():
+    with FixtureServer({"/info": HL_META}) as srv:
+        snap = HyperliquidAdapter(HyperliquidClient(url=f"{srv.url}/info")).snapshot(["BTC"], now=1.0)
+        assert len(srv.requests) == 1
+
+    assert snap.funding == {"BTC": 0.0000125}
+    assert snap.open_interest_usd["BTC"] == pytest.approx(2_001_000)
+
+
+def test_aggregator_fetches_all_venues_and_skips_failures():
+    with FixtureServer(BINANCE_ROUTES) as binance, FixtureServer({"/info": HL_META}) as hl:
+        aggregator = VenueAggregator([
+            BinanceAdapter(base_url=binance.url),
+            HyperliquidAdapter(HyperliquidClient(url=f"{hl.url}/info")),
+            DydxAdapter(base_url=binance.url),  # 404s -> dropped
+        ])
+        snapshots = aggregator.fetch(["BTC", "ETH"])
+        aggregator.shutdown()
+
+    assert set(snapshots) == {"binance", "hyperliquid"}
+
+
+def test_funding_is_oi_weighted_and_oi_summed():
+    snaps = {
+        "a": VenueSnapshot("a", {}, {"BTC": 0.0001, "ETH": 0.0002}, {"BTC": 3_000_000}, 0),
+        "b": VenueSnapshot("b", {}, {"BTC": 0.0005, "ETH": 0.0004}, {"BTC": 1_000_000}, 0),
+    }
+    funding = aggregate_funding(snaps)
+    assert funding["BTC"] == pytest.approx(0.0002)
+    assert funding["ETH"] == pytest.approx(0.0003)  # no OI anywhere -> plain mean
+    assert aggregate_open_interest(snaps) == {"BTC": 4_000_000}
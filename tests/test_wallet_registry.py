@@ -0,0 +1,56 @@
+import os
+
+from src.data.wallet_registry import NEW_WALLET_SCORE, WalletRegistry
+
+
+def _pos(coin, size, entry, leverage, margin):
+    return {"coin": coin, "size": size, "entry_price": entry, "leverage": leverage,
+            "margin_used": margin, "unrealized_pnl": 0.0}
+
+
+def test_merges_and_dedupes_sources(tmp_path):
+    f = tmp_path / "whales.txt"
+    f.write_text("0xaaa\n0xbbb\n\n# comment\n0xaaa\n")
+    reg = WalletRegistry(static_wallets=["0xbbb", "0xccc"], file_path=str(f))
+    assert reg.reload()
+    assert reg.get_wallets() == ["0xbbb", "0xccc", "0xaaa"]
+
+
+def test_file_reload_skipped_when_mtime_unchanged(tmp_path):
+    f = tmp_path / "whales.txt"
+    f.write_text("0xaaa\n")
+    reg = WalletRegistry(file_path=str(f))
+    assert reg.reload()
+    assert not reg.reload()
+
+    f.write_text("0xaaa\n0xbbb\n")
+    os.utime(f, (1, 1))
+    assert reg.reload()
+    assert reg.get_wallets() == ["0xaaa", "0xbbb"]
+
+
+def test_missing_file_is_ignored(tmp_path):
+    reg = WalletRegistry(static_wallets=["0xaaa"], file_path=str(tmp_path / "missing.txt"))
+    reg.reload()
+    assert reg.get_wallets() == ["0xaaa"]
+
+
+def test_ranking_by_score_and_size_cap():
+    reg = WalletRegistry(static_wallets=["0xsmall", "0xbig", "0xnew"], max_wallets=2)
+    now = 1_000_000.0
+    reg.observe("0xsmall", [_pos("BTC", 0.01, 100_000, 2, 500)], now=now - 7 * 86400)
+    reg.observe("0xbig", [_pos("BTC", 50, 100_000, 20, 5_000_000)], now=now)
+
+    assert reg.score("0xnew") == NEW_WALLET_SCORE
+    assert reg.score("0xbig", now) > reg.score("0xsmall", now)
+    assert reg.get_wallets(now) == ["0xbig", "0xnew"]
+
+
+def test_activity_only_refreshes_on_position_change():
+    reg = WalletRegistry(static_wallets=["0xaaa"])
+    positions = [_pos("ETH", 10, 3_000, 5, 6_000)]
+    reg.observe("0xaaa", positions, now=100.0)
+    reg.observe("0xaaa", positions, now=200.0)
+    assert reg._stats["0xaaa"].last_active == 100.0
+    reg.observe("0xaaa", [_pos("ETH", 12, 3_000, 5, 7_000)], now=300.0)
+    assert reg._stats["0xaaa"].last_active == 300.0
@@ -0,0 +1,95 @@
+import time
+
+from src.data.synthetic import SyntheticClient, SyntheticMarket
+from src.data.whale_activity import CLOSES, FILL, FUNDING, OPENS, ActivityIngestor, EventStore
+
+NOW = int(time.time() * 1000)
+
+
+def _fill(t, tid, direction="Open Long", coin="BTC"):
+    return {"coin": coin, "px": "100000", "sz": "0.5", "side": "B" if direction == "Open Long" else "A",
+            "time": t, "dir": direction, "closedPnl": "0.0", "fee": "1.0", "tid": tid}
+
+
+def _funding(t, coin="BTC"):
+    return {"time": t, "hash": "0x0", "delta": {"type": "funding", "coin": coin, "usdc": "-2.5", "szi": "0.5",
+                                                "fundingRate": "0.0000125"}}
+
+
+class FakeClient:
+    """Serves fixed histories from ``startTime`` (inclusive), a page at a time; logs each request."""
+
+    def __init__(self, fills, funding, fill_page=2000, funding_page=500):
+        self.fills, self.funding = fills, funding
+        self.fill_page, self.funding_page = fill_page, funding_page
+        self.calls = []
+
+    def get_user_fills_by_time(self, user, start_time):
+        self.calls.append(("fills", user, start_time))
+        return [f for f in self.fills.get(user, []) if f["time"] >= start_time][:self.fill_page]
+
+    def get_user_funding(self, user, start_time):
+        self.calls.append(("funding", user, start_time))
+        return [f for f in self.funding.get(user, []) if f["time"] >= start_time][:self.funding_page]
+
+
+def test_second_pass_only_asks_for_events_after_the_cursor(tmp_path):
+    fills = {"0xa": [_fill(NOW - 5000, 1), _fill(NOW - 4000, 2, "Close Long")]}
+    funding = {"0xa": [_funding(NOW - 3600_000)]}
+    client = FakeClient(fills, funding)
+    ingestor = ActivityIngestor(client, EventStore(str(tmp_path)), weight_per_cycle=0)
+
+    new = ingestor.ingest(["0xa"])["0xa"]
+    assert list(new["dir"]) == [OPENS[0], CLOSES[0]] and list(new["size"]) == [0.5, -0.5]
+
+    client.calls.clear()
+    fills["0xa"].append(_fill(NOW - 1000, 3))
+    new = ingestor.ingest(["0xa"])["0xa"]
+    assert list(new["tid"]) == [3]  # the fill at the cursor itself is not stored twice
+    assert client.calls == [("fills", "0xa", NOW - 4000), ("funding", "0xa", NOW - 3600_000)]
+    assert ingestor.ingest(["0xa"]) == {}
+
+
+def test_full_pages_are_followed_and_cursors_survive_restart(tmp_path):
+    fills = {"0xa": [_fill(NOW - 10_000 + i, i + 1) for i in range(5)]}
+    funding = {"0xa": [_funding(NOW - 3600_000 * (3 - i)) for i in range(3)]}
+    client = FakeClient(fills, funding, fill_page=2, funding_page=2)
+    ingestor = ActivityIngestor(client, EventStore(str(tmp_path)), weight_per_cycle=0)
+    ingestor.pages = {FILL: 2, FUNDING: 2}
+    ingestor.ingest(["0xa"])
+    ingestor.store.close()
+
+    store = EventStore(str(tmp_path))
+    events = store.read()
+    assert list(events[events["kind"] == FILL]["tid"]) == [1, 2, 3, 4, 5]
+    assert (events["kind"] == FUNDING).sum() == 3
+    assert store.cursor("0xa", FILL) == NOW - 10_000 + 4
+    assert store.cursor("0xa", FUNDING) == NOW - 3600_000
+    assert store.append("0xa", FILL, [(NOW - 10_000 + 4, "BTC", 1, 1.0, 1.0, 0.0, 0.0, 5)]).size == 0
+
+
+def test_round_robin_within_the_weight_budget(tmp_path):
+    client = FakeClient({}, {})
+    ingestor = ActivityIngestor(client, EventStore(str(tmp_path)), weight_per_cycle=80)
+    for _ in range(2):
+        ingestor.ingest(["0xa", "0xb", "0xc"])
+    assert [user for kind, user, _ in client.calls if kind == "fills"] == ["0xa", "0xb", "0xc", "0xa"]
+
+
+
+def test_pages_past_the_budget_wait_for_the_next_visit(tmp_path):
+    fills = {"0xa": [_fill(NOW - 10_000 + i, i + 1) for i in range(5)]}
+    client = FakeClient(fills, {}, fill_page=2)
+    ingestor = ActivityIngestor(client, EventStore(str(tmp_path)), weight_per_cycle=40)
+    ingestor.pages = {FILL: 2, FUNDING: 500}
+    # Two fill pages fit in 40 weight; each page after the first repeats the fill at the cursor
+    assert list(ingestor.ingest(["0xa"])["0xa"]["tid"]) == [1, 2, 3]
+    assert list(ingestor.ingest(["0xa"])["0xa"]["tid"]) == [4, 5]
+
+
+def test_synthetic_market_serves_fills(tmp_path):
+    market = SyntheticMarket(coins=3, n_wallets=5, seed=1)
+    ingestor = ActivityIngestor(SyntheticClient(market), EventStore(str(tmp_path)), weight_per_cycle=0)
+    wallets = list(market.wallets())
+    new = ingestor.ingest(wallets, now_ms=int(market.now * 1000))
+    assert sum(len(v) for v in new.values()) == sum(len(market._raw_positions(i)) for i in range(5))